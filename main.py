@@ -7,11 +7,6 @@
 import os
 
 import pygame
-from pygame.locals import (
-    QUIT,
-    KEYDOWN,
-    K_ESCAPE,
-)
 
 from src.common.constants import (
     Game,
@@ -24,6 +19,7 @@ from src.common.constants import (
 from src.common.game_view_config import game_view_config
 from src.common.config import ConfigPath
 from src.views import view_menu, view_option
+from src.controller.frame_loop import FrameLoop
 from src.controller.game_controller import GameController
 from src.views.image_loaders.cardsloader import CardsLoader
 from src.views.image_loaders.tokensloader import TokensLoader
@@ -100,29 +96,21 @@ class Main:
 
     def game_loop(self):
         """
-        The loop of the game which communicate with controller
+        The loop of the game which communicate with controller: a single
+        frame paced loop feeding the events one by one to the controller
         """
-        state = Game.play
         print("GameLoop")
 
         # First Create Player
         self.ctrl.initiate_players()
 
-        while state == Game.play:
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    state = Game.menu
-                elif event.type == KEYDOWN and event.key == K_ESCAPE:
-                    state = Game.menu
-                elif event.type:
-                    keep_playing = self.ctrl.first_round()
-                    if keep_playing:
-                        keep_playing = self.ctrl.play_one_round()
-                    if not keep_playing:
-                        # Player want to quit
-                        state = Game.menu
+        # the time of the humans is checked every frame
+        loop = FrameLoop(self.ctrl.handle_event, on_frame=self.ctrl.tick)
+        loop.run()
+        print(loop.stats.report())
         print("gameLoop")
-        return state
+        # the players left the game
+        return Game.menu
 
 
 if __name__ == '__main__':
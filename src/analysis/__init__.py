@@ -0,0 +1,3 @@
+from .dealer_probabilities import DealerProbabilities
+from .ev_solver import EVSolver
+from .infinite_deck import InfiniteDeckStrategy
@@ -0,0 +1,167 @@
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from src.cards.deck import Deck
+
+# Index of the dealer's final results in the distributions: final totals 17
+# to 21, then bust and natural (black jack)
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, "bust", "natural")
+BUST = 5
+NATURAL = 6
+
+# Compositions are tuples of 10 counts: number of cards left of value 1
+# (aces) to 10
+Composition = Tuple[int, ...]
+
+
+def composition_from_deck(deck: Deck) -> Composition:
+    """
+    Cards left in the deck by value, as tracked by the deck's counter
+    :param Deck deck: the shoe
+    :return: composition of the cards left
+    """
+    return deck.counter.composition()
+
+
+def full_shoe(decks: int = 6) -> Composition:
+    """
+    :return: composition of a new shoe of the given number of decks
+    """
+    return (4 * decks,) * 9 + (16 * decks,)
+
+
+class DealerProbabilities:
+    """
+    Computes the exact distribution of the dealer's final result.
+
+    The dealer's play is enumerated recursively over the cards left in the
+    shoe. Intermediate results are memoized by (hard total, ace in hand,
+    composition, mode) and the memo is kept between calls, so querying again
+    after a few cards were dealt mostly reuses earlier work.
+
+    :param int max_cache_size: number of memoized states above which the
+        memo is emptied
+    """
+
+    def __init__(self, max_cache_size: int = 2000000):
+        self.max_cache_size = max_cache_size
+        self._cache: Dict[tuple, Tuple[float, ...]] = {}
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def distribution(
+        self,
+        upcard: int,
+        composition: Sequence[int],
+        mode: int = 0,
+        peeked: bool = False,
+    ) -> np.ndarray:
+        """
+        Probability of every dealer's final result
+        :param int upcard: value of the dealer's upcard, 1 for an ace
+        :param composition: cards left in the shoe (upcard excluded), see
+            Composition
+        :param int mode: 0 if the dealer stands on all 17s, 1 if he hits
+            soft 17, as in Dealer.choose_action
+        :param bool peeked: condition on the dealer not having a natural,
+            as when he checked his hole card
+        :return: array of probabilities indexed like DEALER_OUTCOMES
+        """
+        if mode not in (0, 1):
+            raise ValueError("'mode' should be 0 or 1")
+        if not 1 <= upcard <= 10:
+            raise ValueError("'upcard' should be a value between 1 and 10")
+        if len(self._cache) > self.max_cache_size:
+            self._cache.clear()
+
+        composition = tuple(composition)
+        total = sum(composition)
+        result = np.zeros(len(DEALER_OUTCOMES))
+        for value in range(1, 11):
+            count = composition[value - 1]
+            if not count:
+                continue
+            probability = count / total
+            if {upcard, value} == {1, 10}:
+                result[NATURAL] += probability
+                continue
+            left = _remove(composition, value)
+            result[:NATURAL] += probability * np.array(self._play(
+                upcard + value, upcard == 1 or value == 1, left, mode
+            ))
+
+        if peeked:
+            result[NATURAL] = 0.
+            result /= result.sum()
+        return result
+
+    def _play(
+        self, hard: int, ace: bool, composition: Composition, mode: int
+    ) -> Tuple[float, ...]:
+        """
+        Distribution of the final totals (17 to 21 and bust) of the dealer
+        holding the given hand
+        """
+        if hard > 21:
+            return _BUST_RESULT
+        soft = ace and hard <= 11
+        value = hard + 10 if soft else hard
+        if value >= 17 and not (mode == 1 and value == 17 and soft):
+            return _STAND_RESULTS[value]
+
+        key = (hard, ace, composition, mode)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        total = sum(composition)
+        if not total:
+            raise ValueError("The shoe ran out of cards")
+        result = [0.] * NATURAL
+        for card_value in range(1, 11):
+            count = composition[card_value - 1]
+            if not count:
+                continue
+            probability = count / total
+            new_hard = hard + card_value
+            new_ace = ace or card_value == 1
+
+            # final hands are accounted for without recursing
+            if new_hard > 21:
+                result[BUST] += probability
+                continue
+            new_soft = new_ace and new_hard <= 11
+            new_value = new_hard + 10 if new_soft else new_hard
+            if new_value >= 17 and not (
+                mode == 1 and new_value == 17 and new_soft
+            ):
+                result[new_value - 17] += probability
+                continue
+
+            sub_result = self._play(
+                new_hard, new_ace, _remove(composition, card_value), mode
+            )
+            for index in range(NATURAL):
+                result[index] += probability * sub_result[index]
+
+        result = tuple(result)
+        self._cache[key] = result
+        return result
+
+
+def _remove(composition: Composition, value: int) -> Composition:
+    index = value - 1
+    return (
+        composition[:index]
+        + (composition[index] - 1,)
+        + composition[index + 1:]
+    )
+
+
+_BUST_RESULT = (0.,) * BUST + (1.,)
+_STAND_RESULTS = {
+    value: tuple(float(value == total) for total in DEALER_OUTCOMES[:NATURAL])
+    for value in range(17, 22)
+}
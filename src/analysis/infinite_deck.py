@@ -0,0 +1,249 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.analysis.dealer_probabilities import BUST, DEALER_OUTCOMES, NATURAL
+from src.common.constants import Decision
+
+# Probability of drawing each card value (index 1 for aces to 10) from an
+# infinite deck
+CARD_PROBABILITIES = np.array([0.] + [1 / 13] * 9 + [4 / 13])
+
+# Hands are indexed by (value, soft flag), value 22 standing for burnt hands
+BURNT = 22
+_VALUES = BURNT + 1
+
+
+def _next_state(value: int, soft: int, card: int):
+    """
+    State of a hand of the given value after drawing a card, as computed
+    by Hand: one ace counts as 11 as long as the value stays under 22
+    :return: (value, soft flag as 0 or 1) of the new hand
+    """
+    hard = value - 10 if soft else value
+    hard += card
+    if hard > 21:
+        return BURNT, 0
+    if (soft or card == 1) and hard <= 11:
+        return hard + 10, 1
+    return hard, 0
+
+
+def _transitions():
+    """
+    :return: arrays of the next value and soft flag, indexed by
+        [value, soft, card value]
+    """
+    next_values = np.full((_VALUES, 2, 11), BURNT, dtype=np.intp)
+    next_softs = np.zeros((_VALUES, 2, 11), dtype=np.intp)
+    for value in range(BURNT):
+        for soft in (0, 1):
+            for card in range(1, 11):
+                next_values[value, soft, card], next_softs[
+                    value, soft, card
+                ] = _next_state(value, soft, card)
+    return next_values, next_softs
+
+
+_NEXT_VALUES, _NEXT_SOFTS = _transitions()
+
+# Order in which the hands' values are computed so that every hand comes
+# after the hands it can lead to: hard hands from 11 only lead to higher
+# hard hands, soft hands to higher soft hands or to hard hands from 12, and
+# hard hands up to 10 to higher hard hands or to soft hands
+_STATE_ORDER = (
+    [(value, 0) for value in range(21, 10, -1)]
+    + [(value, 1) for value in range(21, 11, -1)]
+    + [(value, 0) for value in range(10, 1, -1)]
+)
+
+
+def _single_card_state(card: int):
+    return _next_state(0, 0, card)
+
+
+def _expectation(table: np.ndarray, value: int, soft: int) -> np.ndarray:
+    """
+    Expectation over the next card of table[next value, next soft]
+    """
+    cards = slice(1, 11)
+    next_tables = table[
+        _NEXT_VALUES[value, soft, cards], _NEXT_SOFTS[value, soft, cards]
+    ]
+    return np.tensordot(CARD_PROBABILITIES[cards], next_tables, axes=1)
+
+
+def dealer_final_distribution(mode: int = 0) -> np.ndarray:
+    """
+    Distribution of the dealer's final result for every upcard, with an
+    infinite deck and no peek
+    :param int mode: 0 if the dealer stands on all 17s, 1 if he hits soft 17
+    :return: array indexed by [upcard value, outcome], outcomes being
+        indexed like DEALER_OUTCOMES
+    """
+    if mode not in (0, 1):
+        raise ValueError("'mode' should be 0 or 1")
+    outcomes = len(DEALER_OUTCOMES)
+    final = np.zeros((_VALUES, 2, outcomes))
+    final[BURNT, :, BUST] = 1
+    for value, soft in _STATE_ORDER:
+        if value >= 17 and not (mode == 1 and value == 17 and soft):
+            final[value, soft, value - 17] = 1
+        else:
+            final[value, soft] = _expectation(final, value, soft)
+
+    distribution = np.zeros((11, outcomes))
+    for upcard in range(1, 11):
+        value, soft = _single_card_state(upcard)
+        for card in range(1, 11):
+            probability = CARD_PROBABILITIES[card]
+            if {upcard, card} == {1, 10}:
+                distribution[upcard, NATURAL] += probability
+            else:
+                distribution[upcard] += probability * final[
+                    _NEXT_VALUES[value, soft, card],
+                    _NEXT_SOFTS[value, soft, card],
+                ]
+    return distribution
+
+
+@dataclass
+class InfiniteDeckStrategy:
+    """
+    Solution of the game with an infinite deck.
+
+    The EV and decision arrays are indexed by [hand value, soft flag,
+    dealer upcard value] (the layout of simulate.batch strategy tables, with
+    aces as upcard 1), pair arrays by [pair card value, upcard value].
+    """
+    stand: np.ndarray
+    hit: np.ndarray
+    double: np.ndarray
+    split: np.ndarray
+    # best decision of a two cards hand, splits excluded
+    decisions: np.ndarray
+    # best decision once doubling is no longer possible
+    hit_stand: np.ndarray
+    # True where a pair should be split
+    pair_splits: np.ndarray
+    # expected value of a round, in bet units
+    ev: float
+
+
+def solve(
+    mode: int = 0,
+    allow_double: bool = True,
+    allow_split: bool = True,
+    double_after_split: bool = True,
+    resplit: bool = True,
+) -> InfiniteDeckStrategy:
+    """
+    Computes the basic strategy and the EV of the game with an infinite
+    deck, by dynamic programming over all the (hand value, soft flag) states
+    for the 10 upcards at once.
+    The rules are those of RoundEngine: no peek, black jack pays 3:2,
+    doubling is only possible on two cards and splitting on two cards of the
+    same value (like Player.check_split_is_possible); the player's wallet is
+    assumed to allow every double and split.
+    :param int mode: dealer's mode, as in Dealer.choose_action
+    :param bool allow_double: the player can double
+    :param bool allow_split: the player can split pairs
+    :param bool double_after_split: the player can double a split hand
+    :param bool resplit: the player can split a split hand again
+    :return: the strategy tables and the game's EV
+    """
+    dealer = dealer_final_distribution(mode)
+    upcards = slice(1, 11)
+    shape = (_VALUES, 2, 11)
+
+    # Standing: win on dealer's bust and lower totals, lose to higher totals
+    # and to naturals (a black jack is handled separately)
+    stand = np.zeros(shape)
+    stand[BURNT] = -1
+    for value in range(BURNT):
+        win = dealer[upcards, BUST] + dealer[upcards, :5][
+            :, np.arange(17, 22) < value
+        ].sum(axis=1)
+        lose = dealer[upcards, NATURAL] + dealer[upcards, :5][
+            :, np.arange(17, 22) > value
+        ].sum(axis=1)
+        stand[value, :, upcards] = (win - lose)[np.newaxis, :]
+
+    # Hitting: best of standing and hitting again after the card
+    hit = np.full(shape, -1.)
+    best = stand.copy()
+    for value, soft in _STATE_ORDER:
+        if value < 21:
+            hit[value, soft] = _expectation(best, value, soft)
+            best[value, soft] = np.maximum(stand[value, soft],
+                                           hit[value, soft])
+
+    double = np.full(shape, -np.inf)
+    if allow_double:
+        for value, soft in _STATE_ORDER:
+            double[value, soft] = 2 * _expectation(stand, value, soft)
+
+    two_cards = np.maximum(best, double)
+
+    # Splitting: each split hand receives a card and is played on its own
+    split = np.full((11, 11), -np.inf)
+    if allow_split:
+        split_hand = np.maximum(best, double) if double_after_split else best
+        for pair in range(1, 11):
+            value, soft = _single_card_state(pair)
+            other_cards = np.zeros(11)
+            for card in range(1, 11):
+                if card != pair:
+                    other_cards += CARD_PROBABILITIES[card] * split_hand[
+                        _NEXT_VALUES[value, soft, card],
+                        _NEXT_SOFTS[value, soft, card],
+                    ]
+            pair_value, pair_soft = _next_state(value, soft, pair)
+            same_card = split_hand[pair_value, pair_soft]
+            probability = CARD_PROBABILITIES[pair]
+            per_hand = other_cards + probability * same_card
+            if resplit:
+                # resplitting makes two hands: fixed point of
+                # x = others + p * max(same_card, 2 * x)
+                per_hand = np.maximum(per_hand,
+                                      other_cards / (1 - 2 * probability))
+            split[pair] = 2 * per_hand
+            split[pair, 0] = -np.inf
+
+    decisions = np.where(stand >= hit, Decision.stand.value,
+                         Decision.hit.value).astype(np.int8)
+    hit_stand = decisions.copy()
+    decisions[double > np.maximum(stand, hit)] = Decision.double.value
+
+    pair_splits = np.zeros((11, 11), dtype=bool)
+    for pair in range(1, 11):
+        value, soft = _next_state(*_single_card_state(pair), pair)
+        pair_splits[pair] = split[pair] > two_cards[value, soft]
+
+    # EV of the game: every two cards start against every upcard
+    ev = 0.
+    upcard_probabilities = CARD_PROBABILITIES[upcards]
+    for first in range(1, 11):
+        for second in range(1, 11):
+            probability = CARD_PROBABILITIES[first] * CARD_PROBABILITIES[
+                second
+            ]
+            if {first, second} == {1, 10}:
+                hand_ev = 1.5 * (1 - dealer[upcards, NATURAL])
+            else:
+                value, soft = _next_state(*_single_card_state(first), second)
+                hand_ev = two_cards[value, soft, upcards]
+                if first == second:
+                    hand_ev = np.maximum(hand_ev, split[first, upcards])
+            ev += probability * float(hand_ev @ upcard_probabilities)
+
+    return InfiniteDeckStrategy(
+        stand=stand[:BURNT],
+        hit=hit[:BURNT],
+        double=double[:BURNT],
+        split=split,
+        decisions=decisions[:BURNT],
+        hit_stand=hit_stand[:BURNT],
+        pair_splits=pair_splits,
+        ev=ev,
+    )
@@ -0,0 +1,59 @@
+import numpy as np
+
+from src.analysis.dealer_probabilities import (
+    BUST,
+    NATURAL,
+    DealerProbabilities,
+    composition_from_deck,
+    full_shoe,
+)
+from src.cards.deck import Deck
+
+
+def only(value, count=20):
+    composition = [0] * 10
+    composition[value - 1] = count
+    return composition
+
+
+def test_deterministic_shoes():
+
+    probabilities = DealerProbabilities()
+
+    # 6 + 10 + 10
+    assert probabilities.distribution(6, only(10))[BUST] == 1
+    assert probabilities.distribution(1, only(10))[NATURAL] == 1
+    # soft 17 with an ace and a six
+    assert probabilities.distribution(1, only(6))[0] == 1
+    # hitting soft 17: ACE + 6 + 6 + 6 = 19
+    assert probabilities.distribution(1, only(6), mode=1)[2] == 1
+
+
+def test_full_shoe_distribution():
+
+    probabilities = DealerProbabilities()
+    composition = list(full_shoe(6))
+    composition[5] -= 1
+    result = probabilities.distribution(6, composition)
+    assert abs(result.sum() - 1) < 1e-12
+    # well known bust probability of a dealer showing a six
+    assert 0.42 < result[BUST] < 0.425
+
+    composition = list(full_shoe(6))
+    composition[9] -= 1
+    result = probabilities.distribution(10, composition, peeked=True)
+    assert result[NATURAL] == 0
+    assert abs(result.sum() - 1) < 1e-12
+
+
+def test_composition_from_deck():
+
+    deck = Deck(decks=2)
+    assert composition_from_deck(deck) == full_shoe(2)
+    card = deck.getCard()
+    composition = composition_from_deck(deck)
+    assert sum(composition) == 103
+    assert composition[card.value - 1] == full_shoe(2)[card.value - 1] - 1
+    assert isinstance(DealerProbabilities().distribution(
+        deck.getCard().value, composition_from_deck(deck)
+    ), np.ndarray)
@@ -0,0 +1,68 @@
+from src.analysis.dealer_probabilities import full_shoe
+from src.analysis.ev_solver import EVSolver, ZobristComposition
+from src.cards.card import Card
+from src.cards.deck import Deck
+from src.cards.hand import Hand
+from src.common.constants import Decision
+
+
+def composition_without(*values):
+    composition = list(full_shoe(1))
+    for value in values:
+        composition[value - 1] -= 1
+    return composition
+
+
+def test_zobrist_hash():
+
+    shoe = ZobristComposition(full_shoe(1))
+    start = shoe.hash
+    shoe.remove(5)
+    shoe.remove(10)
+    assert shoe.hash == ZobristComposition(composition_without(5, 10)).hash
+    shoe.add(10)
+    shoe.add(5)
+    assert shoe.hash == start
+    assert shoe.total == 52
+
+
+def test_best_decisions():
+
+    solver = EVSolver()
+    hand = Hand([Card(10), Card(13)])
+    assert solver.best_decision(
+        hand, 6, composition_without(10, 10, 6)
+    ) == Decision.stand
+
+    hand = Hand([Card(5), Card(6)])
+    values = solver.evaluate(hand, Card(6), composition_without(5, 6, 6))
+    assert max(values, key=values.get) == Decision.double
+    assert values[Decision.double] > 0
+
+    hand = Hand([Card(9), Card(7)])
+    assert solver.best_decision(
+        hand, 10, composition_without(9, 7, 10), can_double=False
+    ) == Decision.hit
+
+    hand = Hand([Card(8), Card(8, "spades")])
+    values = solver.evaluate(hand, 6, composition_without(8, 8, 6))
+    assert Decision.split in values
+    assert max(values, key=values.get) == Decision.split
+
+
+def test_black_jack_value():
+
+    solver = EVSolver()
+    hand = Hand([Card(1), Card(13)])
+    values = solver.evaluate(hand, 6, composition_without(1, 10, 6))
+    assert values == {Decision.stand: 1.5}
+
+
+def test_evaluate_deck():
+
+    deck = Deck(decks=1)
+    hand = Hand([deck.getCard(), deck.getCard()])
+    upcard = deck.getCard()
+    values = EVSolver().evaluate(hand, upcard, deck)
+    assert Decision.stand in values
+    assert all(-2 <= value <= 2 for value in values.values())
@@ -0,0 +1,126 @@
+from functools import lru_cache
+
+import numpy as np
+
+from src.analysis.dealer_probabilities import BUST, NATURAL
+from src.analysis.infinite_deck import dealer_final_distribution, solve
+from src.common.constants import Decision
+
+
+def test_dealer_final_distribution():
+
+    for mode in (0, 1):
+        distribution = dealer_final_distribution(mode)
+        assert np.allclose(distribution[1:].sum(axis=1), 1)
+    distribution = dealer_final_distribution()
+    assert abs(distribution[6, BUST] - 0.4232) < 1e-4
+    assert abs(distribution[1, NATURAL] - 4 / 13) < 1e-12
+    # hitting soft 17 makes the dealer bust more often
+    assert dealer_final_distribution(1)[6, BUST] > distribution[6, BUST]
+
+
+def test_basic_strategy():
+
+    strategy = solve()
+    assert strategy.decisions[11, 0, 6] == Decision.double.value
+    assert strategy.decisions[16, 0, 10] == Decision.hit.value
+    assert strategy.decisions[13, 0, 2] == Decision.stand.value
+    assert strategy.decisions[18, 1, 4] == Decision.double.value
+    assert strategy.hit_stand[18, 1, 4] == Decision.stand.value
+    assert strategy.decisions[20, 0, 1] == Decision.stand.value
+    assert strategy.pair_splits[1, 10]
+    assert strategy.pair_splits[8, 6]
+    assert not strategy.pair_splits[10, 6]
+    assert not strategy.pair_splits[5, 6]
+
+
+def test_rules_change_ev():
+
+    ev = solve().ev
+    assert -0.01 < ev < 0
+    assert solve(allow_split=False).ev < ev
+    assert solve(allow_double=False).ev < ev
+    assert solve(double_after_split=False).ev < ev
+    assert solve(mode=1).ev < ev
+
+
+def brute_force_split(pair: int, upcard: int, resplits: int) -> float:
+    """
+    EV of splitting a pair, by a plain recursion over the cards drawn by
+    the split hands, doubling after split allowed
+    """
+    dealer = dealer_final_distribution()[upcard]
+    probabilities = [0.] + [1 / 13] * 9 + [4 / 13]
+
+    def total(hard, ace):
+        return hard + 10 if ace and hard <= 11 else hard
+
+    def stand(hard, ace):
+        value = total(hard, ace)
+        if value > 21:
+            return -1.
+        win = dealer[BUST] + sum(dealer[final - 17] for final
+                                 in range(17, 22) if final < value)
+        lose = dealer[NATURAL] + sum(dealer[final - 17] for final
+                                     in range(17, 22) if final > value)
+        return win - lose
+
+    @lru_cache(maxsize=None)
+    def best(hard, ace):
+        if total(hard, ace) >= 21:
+            return stand(hard, ace)
+        hit = sum(probabilities[card] * best(hard + card, ace or card == 1)
+                  for card in range(1, 11))
+        return max(stand(hard, ace), hit)
+
+    def two_cards(first, second):
+        hard, ace = first + second, 1 in (first, second)
+        double = 2 * sum(
+            probabilities[card] * stand(hard + card, ace or card == 1)
+            for card in range(1, 11)
+        )
+        return max(best(hard, ace), double)
+
+    @lru_cache(maxsize=None)
+    def split_hand(depth):
+        ev = 0.
+        for card in range(1, 11):
+            if card == pair and depth > 0:
+                ev += probabilities[card] * max(two_cards(pair, pair),
+                                                2 * split_hand(depth - 1))
+            else:
+                ev += probabilities[card] * two_cards(pair, card)
+        return ev
+
+    return 2 * split_hand(resplits)
+
+
+def test_split_against_brute_force():
+
+    strategy = solve()
+    no_resplit = solve(resplit=False)
+    for pair, upcard in ((1, 10), (8, 10), (7, 8), (9, 7), (3, 8), (2, 4)):
+        assert abs(no_resplit.split[pair, upcard]
+                   - brute_force_split(pair, upcard, 0)) < 1e-9
+        # the resplits converge geometrically
+        assert abs(strategy.split[pair, upcard]
+                   - brute_force_split(pair, upcard, 60)) < 1e-9
+    # basic strategy hits these pairs
+    assert not strategy.pair_splits[3, 8]
+    assert not strategy.pair_splits[7, 8]
+    assert not strategy.pair_splits[8, 10]
+
+
+def test_resplit_ev():
+
+    # values checked against brute_force_split, pinned to catch any change
+    # of the split EVs
+    strategy = solve()
+    no_resplit = solve(resplit=False)
+    assert abs(strategy.split[8, 6] - 0.4126665634242863) < 1e-12
+    assert abs(no_resplit.split[8, 6] - 0.3255333973851646) < 1e-12
+    assert abs(strategy.split[1, 10] - 0.41991804848229053) < 1e-12
+    assert abs(no_resplit.split[1, 10] - 0.3335397834105112) < 1e-12
+    # 8,8 against a 10 is not worth resplitting
+    assert strategy.split[8, 10] == no_resplit.split[8, 10]
+    assert abs(strategy.split[8, 10] + 0.6142309179446326) < 1e-12
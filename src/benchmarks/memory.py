@@ -0,0 +1,98 @@
+# ============================================================================
+# = Memory used by the model objects of seated players and active tables
+# =
+# = Usage: python -m src.benchmarks.memory --tables 1000 --seats 5
+# ============================================================================
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, List
+
+from src.cards.deck import Deck
+from src.controller.round_engine import RoundEngine
+from src.humans.dealer import Dealer
+from src.humans.player import Player
+
+
+def allocated_bytes(build: Callable[[], List]) -> int:
+    """
+    :param build: callable creating the objects to measure
+    :return: bytes allocated by build and still alive, the objects being
+        kept until the measure is done
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return after - before
+
+
+def seated_players(count: int) -> List[Player]:
+    """
+    Players with a bet and a dealt two cards hand
+    """
+    deck = Deck(decks=8)
+    players = []
+    for index in range(count):
+        player = Player(f"Player {index}", 1000)
+        player.bet(10, 0)
+        player.add_card(deck.getCard(), 0)
+        player.add_card(deck.getCard(), 0)
+        players.append(player)
+        if deck.needs_shuffling:
+            deck.shuffle()
+    return players
+
+
+def active_tables(count: int, seats: int) -> List[RoundEngine]:
+    """
+    Tables waiting for the first decision of a dealt round
+    """
+    tables = []
+    for _ in range(count):
+        players = [Player(f"Player {index}", 1000) for index in range(seats)]
+        engine = RoundEngine(Deck(), Dealer(), players)
+        engine.start_round()
+        engine.collect_bets()
+        engine.deal()
+        tables.append(engine)
+    return tables
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmarks.memory",
+        description="Measures the memory of seated players and tables",
+    )
+    parser.add_argument("--tables", type=int, default=1000,
+                        help="number of tables created")
+    parser.add_argument("--seats", type=int, default=5,
+                        help="number of players at each table")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    players = args.tables * args.seats
+
+    per_player = allocated_bytes(lambda: seated_players(players)) / players
+    per_table = allocated_bytes(
+        lambda: active_tables(args.tables, args.seats)
+    ) / args.tables
+    empty_table = allocated_bytes(
+        lambda: active_tables(args.tables, 0)
+    ) / args.tables
+
+    print(f"Tables:              {args.tables} x {args.seats} seats")
+    print(f"Per seated player:   {per_player:.0f} bytes")
+    print(f"Per active table:    {per_table:.0f} bytes")
+    print(f"  without players:   {empty_table:.0f} bytes")
+
+
+if __name__ == '__main__':
+    main()
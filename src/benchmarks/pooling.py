@@ -0,0 +1,60 @@
+# ============================================================================
+# = Hands recycled by a HandPool over simulated rounds
+# =
+# = Usage: python -m src.benchmarks.pooling --rounds 200000 --seats 5
+# ============================================================================
+
+import argparse
+import time
+
+from src.cards.deck import Deck
+from src.controller.round_engine import RoundEngine
+from src.humans.hand_pool import HandPool
+from src.humans.player import Player
+
+
+def play_rounds(rounds: int, seats: int, pool: HandPool = None,
+                seed: int = 0) -> float:
+    """
+    Plays rounds at one table
+    :return: duration in seconds
+    """
+    players = [Player(f"Player {index}", float("inf"))
+               for index in range(seats)]
+    engine = RoundEngine(Deck(rng=seed), players=players, minimum_bet=1,
+                         pool=pool)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        engine.play_round()
+    return time.perf_counter() - start
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmarks.pooling",
+        description="Counts the allocations avoided by pooling the hands",
+    )
+    parser.add_argument("--rounds", type=int, default=200000,
+                        help="number of rounds played")
+    parser.add_argument("--seats", type=int, default=5,
+                        help="number of players at the table")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pool = HandPool()
+    pooled = play_rounds(args.rounds, args.seats, pool)
+    allocated = play_rounds(args.rounds, args.seats)
+    per_million = 1e6 / args.rounds
+
+    print(f"Rounds:                 {args.rounds} x {args.seats} seats")
+    print(f"Objects created:        {pool.created}")
+    print(f"Allocations avoided:    {pool.allocations_avoided} "
+          f"({pool.allocations_avoided * per_million:.0f} per 1M rounds)")
+    print(f"Time without pool:      {allocated:.2f} s")
+    print(f"Time with pool:         {pooled:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
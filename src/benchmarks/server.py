@@ -0,0 +1,150 @@
+# ============================================================================
+# = Actions per second of the table server
+# =
+# = Usage: python -m src.benchmarks.server --tables 20 --seats 5 --rounds 50
+# =
+# = Bots play on localhost against a server running in another process, whose
+# = CPU time gives the actions per second of one core.
+# ============================================================================
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from multiprocessing.connection import Connection
+from typing import Optional
+
+from src.server.client import TableClient
+from src.server.protocol import Message
+from src.server.server import TableServer
+
+
+def bot_action(state: Message, player_id: str) -> Optional[Message]:
+    """
+    Action of a bot betting the minimum and hitting below 17
+    :param state: state message of the bot's table
+    :param str player_id: id of the bot
+    :return: the message of the action, None if the bot has nothing to do
+    """
+    if state["phase"] == "betting":
+        for player in state["players"]:
+            if player["id"] == player_id and not player["ready"]:
+                return {"type": "bet", "amount": 5}
+    current = state["current"]
+    if current is not None and current["player"] == player_id:
+        for player in state["players"]:
+            if player["id"] == player_id:
+                hand = player["hands"][current["hand"]]
+                return {"type": "hit" if hand["value"] < 17 else "stand"}
+    return None
+
+
+async def run_bot(port: int, table_id: str, name: str, rounds: int,
+                  host: str = "127.0.0.1") -> int:
+    """
+    Plays rounds at a table, then leaves it
+    :return: number of actions accepted by the table
+    """
+    async with await TableClient.connect(host, port) as client:
+        await client.send("join", table=table_id, name=name, wallet=10 ** 9)
+        joined = await client.receive_until(
+            lambda message: message["type"] in ("joined", "error")
+        )
+        if joined["type"] == "error":
+            raise RuntimeError(joined["message"])
+        player_id = joined["player"]
+
+        actions = 0
+        while True:
+            message = await client.receive()
+            if message["type"] == "error":
+                # action answering a state that changed in the meantime
+                actions -= 1
+            if message["type"] != "state":
+                continue
+            if message["round"] > rounds:
+                break
+            action = bot_action(message, player_id)
+            if action is not None:
+                kind = action.pop("type")
+                await client.send(kind, version=message["version"], **action)
+                actions += 1
+        await client.send("leave")
+        return actions
+
+
+def serve(connection: Connection):
+    """
+    Child process running the server until the parent sends a message, then
+    sending back the CPU time it used
+    """
+    async def run():
+        async with TableServer() as server:
+            connection.send(server.port)
+            # the loop keeps serving while a thread waits for the parent
+            await asyncio.get_running_loop().run_in_executor(
+                None, connection.recv
+            )
+
+    cpu_start = time.process_time()
+    asyncio.run(run())
+    connection.send(time.process_time() - cpu_start)
+
+
+async def play(port: int, tables: int, seats: int, rounds: int) -> int:
+    actions = await asyncio.gather(*(
+        run_bot(port, f"table {table}", f"bot {seat}", rounds)
+        for table in range(tables)
+        for seat in range(seats)
+    ))
+    return sum(actions)
+
+
+def measure(tables: int, seats: int, rounds: int) -> dict:
+    """
+    Plays the rounds against a server running in another process
+    :return: number of actions, wall time, and CPU time of the server
+    """
+    connection, child_connection = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve, args=(child_connection,))
+    process.start()
+    try:
+        port = connection.recv()
+        start = time.perf_counter()
+        actions = asyncio.run(play(port, tables, seats, rounds))
+        wall_time = time.perf_counter() - start
+        connection.send("stop")
+        cpu_time = connection.recv()
+    finally:
+        process.join()
+    return {"actions": actions, "wall_time": wall_time, "cpu_time": cpu_time}
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmarks.server",
+        description="Measures the actions per second of the table server",
+    )
+    parser.add_argument("--tables", type=int, default=20,
+                        help="number of tables played at the same time")
+    parser.add_argument("--seats", type=int, default=5,
+                        help="number of bots at each table")
+    parser.add_argument("--rounds", type=int, default=50,
+                        help="number of rounds played at each table")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = measure(args.tables, args.seats, args.rounds)
+    actions = result["actions"]
+    print(f"Tables:                {args.tables} x {args.seats} bots, "
+          f"{args.rounds} rounds")
+    print(f"Actions:               {actions}")
+    print(f"Actions per second:    {actions / result['wall_time']:.0f}")
+    print(f"Actions per core:      {actions / result['cpu_time']:.0f} "
+          f"per second of server CPU")
+
+
+if __name__ == '__main__':
+    main()
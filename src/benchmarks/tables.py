@@ -0,0 +1,159 @@
+# ============================================================================
+# = Memory and action latency of many tables in one event loop
+# =
+# = Usage: python -m src.benchmarks.tables --tables 1000 10000 50000 --seed 0
+# =
+# = Every table of a TableScheduler seats bots and one listener standing for
+# = a client connection. Actions are then submitted to random tables at a
+# = steady rate, and the scheduler measures the time between the
+# = submission of an action and the end of its handling.
+# ============================================================================
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from typing import List
+
+import numpy as np
+
+from src.common.constants import Phase
+from src.common.rng import make_rng
+from src.controller.time_bank import DecisionClock
+from src.server.exceptions import TableError
+from src.server.scheduler import TableScheduler
+from src.server.table import Table
+
+
+def build_tables(scheduler: TableScheduler, tables: int,
+                 seats: int) -> List[Table]:
+    built = []
+    for index in range(tables):
+        table = scheduler.table(f"table {index}")
+        received = []
+        # stands for a connection, keeping only the last message
+        table.subscribe(lambda line, received=received: received[:1].clear()
+                        or received.append(line))
+        for seat in range(seats):
+            table.seat(f"bot {seat}", 10 ** 9)
+        built.append(table)
+    return built
+
+
+def play_action(table: Table):
+    """
+    Next action of the bots of the table: betting the minimum, then
+    hitting below 17
+    """
+    engine = table.engine
+    try:
+        if table.phase == Phase.betting:
+            for player in table.players:
+                if player.uuid not in table.ready:
+                    table.act(player, "bet", engine.minimum_bet)
+                    return
+        elif table.phase == Phase.player_actions:
+            action = "hit" if engine.current_hand.hand.value < 17 else "stand"
+            table.act(engine.current_player, action)
+    except TableError:
+        pass
+
+
+async def load(scheduler: TableScheduler, tables: List[Table],
+               rate: int, duration: float, rng: np.random.Generator) -> float:
+    """
+    Submits rate actions per second to random tables
+    :param rng: generator choosing the tables
+    :return: CPU time used per second once the load stopped
+    """
+    scheduler.start()
+    credit = 0.
+    start = last = time.perf_counter()
+    while last - start < duration:
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        # actions due since the last submissions
+        credit += rate * (now - last)
+        last = now
+        for index in rng.integers(len(tables), size=int(credit)):
+            scheduler.submit(play_action, tables[index])
+        credit -= int(credit)
+
+    # the idle tables should not use any CPU
+    await asyncio.sleep(0.1)
+    cpu_start = time.process_time()
+    await asyncio.sleep(1)
+    idle_cpu = time.process_time() - cpu_start
+    await scheduler.close()
+    return idle_cpu
+
+
+def measure(tables: int, seats: int, rate: int, duration: float,
+            seed: int = 0) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # the shoes and the choice of the tables draw from streams of their own
+    deal, choose = np.random.SeedSequence(seed).spawn(2)
+    scheduler = TableScheduler(rng=deal)
+    built = build_tables(scheduler, tables, seats)
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    scheduler.latencies.clear()
+    idle_cpu = asyncio.run(
+        load(scheduler, built, rate, duration, make_rng(choose))
+    )
+    return {
+        "memory_per_table": memory / tables,
+        "operations": scheduler.operations,
+        "batches": scheduler.batches,
+        "p50": scheduler.latency(50),
+        "p99": scheduler.latency(99),
+        "idle_cpu": idle_cpu,
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmarks.tables",
+        description="Measures tables multiplexed in one event loop",
+    )
+    parser.add_argument("--tables", type=int, nargs="+",
+                        default=[1000, 10000, 50000],
+                        help="numbers of tables measured")
+    parser.add_argument("--seats", type=int, default=3,
+                        help="number of bots at each table")
+    parser.add_argument("--rate", type=int, default=5000,
+                        help="actions submitted per second")
+    parser.add_argument("--duration", type=float, default=5,
+                        help="seconds of load")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the shoes and of the tables chosen")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"{args.seats} bots per table, {args.rate} actions per second "
+          f"for {args.duration} s")
+    rules = TableScheduler()
+    clock = DecisionClock(rules.decision_time, rules.time_bank, rules.refill)
+    print(f"A round waits at most {clock.round_bound(args.seats):.0f} s for "
+          f"the bots ({clock.decision_time:.0f} s per decision, "
+          f"{clock.time_bank:.0f} s of time bank)")
+    print(f"{'tables':>8} {'bytes/table':>12} {'actions':>8} "
+          f"{'p50 (ms)':>9} {'p99 (ms)':>9} {'idle CPU':>9}")
+    for tables in args.tables:
+        result = measure(tables, args.seats, args.rate, args.duration,
+                         args.seed)
+        print(f"{tables:>8} {result['memory_per_table']:>12.0f} "
+              f"{result['operations']:>8} "
+              f"{result['p50'] * 1000:>9.3f} {result['p99'] * 1000:>9.3f} "
+              f"{result['idle_cpu']:>8.1%}")
+
+
+if __name__ == '__main__':
+    main()
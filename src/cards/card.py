@@ -1,5 +1,4 @@
-import re
-from typing import Union, Pattern
+from typing import Dict, Tuple, Union
 
 card_names_and_values = {
     ("ACE", 1),
@@ -24,63 +23,127 @@ value_to_card_dict = {key: value for (value, key) in card_names_and_values}
 
 colors = {"HEARTS", "SPADES", "CLUBS", "DIAMONDS"}
 
+# Ordered variants of the above, used to give every card a stable position
+# in the registry
+card_names = tuple(value_to_card_dict[rank] for rank in range(1, 14))
+color_names = ("HEARTS", "DIAMONDS", "CLUBS", "SPADES")
+
+
+def _build_name_lookup() -> Dict[Union[str, int], str]:
+    """
+    Builds the table of every accepted spelling of a card name: the name
+    itself in upper, lower and capitalized case, and its rank (1 to 13)
+    :return: dict mapping a spelling to the card name
+    """
+    lookup = {}
+    for rank, name in enumerate(card_names, start=1):
+        lookup[rank] = name
+        for spelling in (name, name.lower(), name.capitalize()):
+            lookup[spelling] = name
+    return lookup
+
+
+def _build_color_lookup() -> Dict[str, str]:
+    """
+    Builds the table of every accepted spelling of a color: its first
+    letter, its singular and its plural form, in upper, lower and
+    capitalized case. For example "H", "HEART" and "hearts" for "HEARTS"
+    :return: dict mapping a spelling to the color name
+    """
+    lookup = {}
+    for color in color_names:
+        for spelling in (color[0], color[:-1], color):
+            for case in (spelling, spelling.lower(), spelling.capitalize()):
+                lookup[case] = color
+    return lookup
+
+
+_name_lookup = _build_name_lookup()
+_color_lookup = _build_color_lookup()
+
 
 class Card:
-    def __init__(self, value: Union[int, str], color: str = "hearts"):
-        self._value = None
-        self._color = None
-        self.name = None
+    """
+    Immutable playing card.
+
+    Cards are interned: the 52 possible cards are built once when the module
+    is imported and ``Card(value, color)`` only looks the shared instance up,
+    so two cards with the same name and color are the same object.
+
+    :param value: card name ("ACE", "king", ...) or rank between 1 and 13
+    :param str color: "HEARTS", "DIAMONDS", "CLUBS", "SPADES", their
+        singular variant or their first letter. Case is not relevant
+    """
+
+    __slots__ = ("name", "_value", "_color", "rank", "code")
 
-        # Calls color.setter
-        self.color = color
+    _registry: Dict[Tuple[str, str], 'Card'] = {}
 
-        # Calls value.setter
-        self.value = value
+    def __new__(cls, value: Union[int, str], color: str = "hearts"):
+        return cls._registry[(cls._parse_name(value), cls._parse_color(color))]
+
+    @staticmethod
+    def _parse_name(value: Union[int, str]) -> str:
         try:
-            self.value = value
-        except KeyError:
-            raise ValueError(
-                "First argument 'value' should be a card name "
-                "or integer between 1 and 13"
-            )
+            return _name_lookup[value]
+        except (KeyError, TypeError):
+            pass
+        if isinstance(value, str) and value.upper() in _name_lookup:
+            return _name_lookup[value.upper()]
+        raise ValueError(
+            "First argument 'value' should be a card name "
+            "or integer between 1 and 13"
+        )
+
+    @staticmethod
+    def _parse_color(color: str) -> str:
+        try:
+            return _color_lookup[color]
+        except (KeyError, TypeError):
+            pass
+        if isinstance(color, str) and color.upper() in _color_lookup:
+            return _color_lookup[color.upper()]
+        raise ValueError(
+            'Invalid value for Card object\'s "color" member.\n'
+            'Value should be either "HEARTS", "DIAMONDS", "CLUBS", '
+            '"SPADES", their singular variant, or their first letter.\n'
+            "Case is not relevant."
+        )
+
+    @classmethod
+    def _create(cls, name: str, color: str) -> 'Card':
+        """
+        Builds a registry instance, bypassing the lookup done by __new__
+        """
+        card = object.__new__(cls)
+        object.__setattr__(card, "name", name)
+        object.__setattr__(card, "_value", card_to_value_dict[name])
+        object.__setattr__(card, "_color", color)
+        object.__setattr__(card, "rank", card_names.index(name) + 1)
+        # compact code between 0 and 51, used by array-backed shoes
+        object.__setattr__(
+            card, "code", (card.rank - 1) * 4 + color_names.index(color)
+        )
+        return card
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __reduce__(self):
+        # Unpickling and copying go through the registry as well
+        return type(self), (self.name, self._color)
 
     @property
     def color(self) -> str:
         return self._color
 
-    @color.setter
-    def color(self, color: str = "HEARTS"):
-        color = color.upper()
-        for c in colors:
-            regexp = self.cardColorToRegexp(c).match(color)
-            if regexp is None:
-                # regexp.match returns None if nothing is matched,
-                # which will raise a error if end method is used on the
-                # matching result
-                continue
-            if regexp.end() == len(color):
-                self._color = c
-                break
-        else:
-            raise ValueError(
-                'Invalid value for Card object\'s "color" member.\n'
-                'Value should be either "HEARTS", "DIAMONDS", "CLUBS", '
-                '"SPADES", their singular variant, or their first letter.\n'
-                "Case is not relevant."
-            )
-
     @property
     def value(self) -> int:
         return self._value
 
-    @value.setter
-    def value(self, arg: Union[str, int]):
-        if isinstance(arg, str):
-            self.name = arg.upper()
-        elif isinstance(arg, int):
-            self.name = value_to_card_dict[arg]
-        self._value = card_to_value_dict[self.name]
-
     def __radd__(self, other: Union['Card', int]) -> int:
         if self.name == "ACE":
             if self._value + other <= 11:
@@ -106,15 +169,14 @@ class Card:
     def __str__(self) -> str:
         return "%s of %s" % (self.name, self.color)
 
-    @staticmethod
-    def cardColorToRegexp(string: str) -> Pattern[str]:
-        """
-        Creates a regular expression to match user inputs for color parameter
-        For example, replace "HEARTS" by "H(EART(S)?)?"
-        Allows matching "H",  "HEART" and "HEARTS"
-        :param str string: String to be changed to regular expression
-        :return: a regular expression
-        :rtype: Pattern[str]
-        """
-        string = string[0] + "(" + string[1:-1] + "(" + string[-1] + ")?)?"
-        return re.compile(string)
+
+Card._registry.update(
+    ((name, color), Card._create(name, color))
+    for name in card_names
+    for color in color_names
+)
+
+# The 52 cards indexed by their code
+cards_by_code: Tuple[Card, ...] = tuple(
+    sorted(Card._registry.values(), key=lambda card: card.code)
+)
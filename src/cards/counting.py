@@ -0,0 +1,176 @@
+import copy
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from src.cards.card import cards_by_code
+
+
+class CountingSystem(NamedTuple):
+    """
+    Card counting system: a tag added to the running count for every card
+    dealt, depending on the card's value.
+
+    Unbalanced systems (whose tags of a full deck do not sum to 0) start
+    their running count below 0, so that it ends at the sum of the tags of
+    one deck once the whole shoe was dealt.
+    """
+    name: str
+    # tags of the card values, index 1 for aces to 10
+    tags: Tuple[int, ...]
+
+    @property
+    def deck_sum(self) -> int:
+        """
+        Sum of the tags of a 52 cards deck
+        """
+        return 4 * sum(self.tags[1:10]) + 16 * self.tags[10]
+
+    @property
+    def balanced(self) -> bool:
+        return self.deck_sum == 0
+
+    def initial_count(self, decks: int) -> int:
+        """
+        Running count of a new shoe of the given number of decks
+        """
+        return -self.deck_sum * (decks - 1)
+
+
+#                                  A   2  3  4  5  6  7  8   9  10
+HI_LO = CountingSystem("hi_lo", (0, -1, 1, 1, 1, 1, 1, 0, 0, 0, -1))
+KO = CountingSystem("ko", (0, -1, 1, 1, 1, 1, 1, 1, 0, 0, -1))
+OMEGA_II = CountingSystem("omega_ii", (0, 0, 1, 1, 2, 2, 2, 1, 0, -1, -2))
+ZEN = CountingSystem("zen", (0, -1, 1, 1, 2, 2, 2, 1, 0, 0, -2))
+
+COUNTING_SYSTEMS: Dict[str, CountingSystem] = {
+    system.name: system for system in (HI_LO, KO, OMEGA_II, ZEN)
+}
+
+# rank and value of every card code
+_code_ranks = [card.rank for card in cards_by_code]
+_code_values = [card.value for card in cards_by_code]
+_code_ranks_array = np.array(_code_ranks)
+
+
+class CardCounter:
+    """
+    Keeps track of the cards dealt from a shoe.
+
+    The number of cards left of every rank and the running counts of the
+    counting systems are updated in O(1) for every card seen, so reading
+    them never requires scanning the shoe. Each system tracked adds one
+    addition to the cost of a card.
+
+    :param int decks: number of decks in the shoe
+    :param systems: counting systems, or their names in COUNTING_SYSTEMS
+    """
+
+    def __init__(
+        self,
+        decks: int = 6,
+        systems: Iterable[Union[str, CountingSystem]] = (),
+    ):
+        self.decks = decks
+        self.systems: List[CountingSystem] = [
+            COUNTING_SYSTEMS[system] if isinstance(system, str) else system
+            for system in systems
+        ]
+        self._index = {system.name: i for i, system in enumerate(self.systems)}
+        # tags of every system, indexed by card code
+        self._code_tags = [
+            [system.tags[value] for value in _code_values]
+            for system in self.systems
+        ]
+        self._code_tags_array = np.array(self._code_tags, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets every card seen, as after a shuffle
+        """
+        # cards left of every rank, index 0 unused
+        self._ranks = [0] + [4 * self.decks] * 13
+        self.cards_left = 52 * self.decks
+        self.running_counts = [
+            system.initial_count(self.decks) for system in self.systems
+        ]
+        self._composition = None
+
+    def fork(self) -> 'CardCounter':
+        counter = copy.copy(self)
+        counter._ranks = list(self._ranks)
+        counter.running_counts = list(self.running_counts)
+        return counter
+
+    def see(self, code: int):
+        """
+        Counts one card dealt
+        :param int code: code of the card, see Card.code
+        """
+        self._ranks[_code_ranks[code]] -= 1
+        self.cards_left -= 1
+        self._composition = None
+        if self._code_tags:
+            counts = self.running_counts
+            for i, tags in enumerate(self._code_tags):
+                counts[i] += tags[code]
+
+    def see_codes(self, codes: np.ndarray):
+        """
+        Counts several cards dealt at once
+        :param np.ndarray codes: codes of the cards
+        """
+        ranks = np.bincount(_code_ranks_array[codes], minlength=14)
+        for rank in range(1, 14):
+            self._ranks[rank] -= int(ranks[rank])
+        self.cards_left -= len(codes)
+        self._composition = None
+        if self._code_tags:
+            sums = self._code_tags_array[:, codes].sum(axis=1)
+            for i, total in enumerate(sums):
+                self.running_counts[i] += int(total)
+
+    # =========================================================================
+    # = Counts
+    # =========================================================================
+
+    @property
+    def cards_seen(self) -> int:
+        return 52 * self.decks - self.cards_left
+
+    def running_count(self, system: str = "hi_lo") -> int:
+        return self.running_counts[self._index[system]]
+
+    def true_count(self, system: str = "hi_lo") -> float:
+        """
+        Running count per deck left in the shoe
+        """
+        if not self.cards_left:
+            return 0.
+        return self.running_count(system) * 52 / self.cards_left
+
+    def remaining(self, rank: int) -> int:
+        """
+        :param int rank: rank of the cards, 1 for aces to 13 for kings
+        :return: number of cards of this rank left in the shoe
+        """
+        return self._ranks[rank]
+
+    def rank_counts(self) -> Tuple[int, ...]:
+        """
+        :return: number of cards left of every rank, aces to kings
+        """
+        return tuple(self._ranks[1:])
+
+    def composition(self) -> Tuple[int, ...]:
+        """
+        Read-only snapshot of the cards left by value, as used by
+        analysis.dealer_probabilities. It is only rebuilt after a card was
+        seen.
+        :return: number of cards left of value 1 (aces) to 10
+        """
+        if self._composition is None:
+            ranks = self._ranks
+            self._composition = tuple(ranks[1:10]) + (sum(ranks[10:]),)
+        return self._composition
@@ -1,21 +1,66 @@
-import itertools
-import random
+import copy
+from typing import TYPE_CHECKING, Iterable, Union
 
-from src.cards.card import Card, card_to_value_dict, colors
+import numpy as np
+
+from src.cards.card import Card, cards_by_code
+from src.cards.counting import CardCounter, CountingSystem
+from src.common.rng import RandomSource, RandomStream, make_rng, restore_rng
+
+if TYPE_CHECKING:
+    from src.cards.shoe_pool import ShoePool
 
 
 class Deck:
-    def __init__(self, SHUFFLE: bool = True):
+    """
+    A shoe made of several 52 cards decks.
+
+    The shoe is stored as a numpy array of card codes (see Card.code) and
+    shuffled with a numpy Generator.
+
+    :param bool SHUFFLE: shuffle the shoe at creation
+    :param int decks: number of 52 cards decks in the shoe
+    :param float penetration: part of the shoe dealt before the red card
+    :param rng: random generator used for shuffling and placing the red
+        card, or its seed (see common.rng.make_rng), unseeded by default
+    :param counting: counting systems tracked by self.counter, or their
+        names in counting.COUNTING_SYSTEMS
+    :param ShoePool pool: pool of shoes shuffled in advance. When given,
+        shuffling swaps in the next shoe of the pool, and the number of decks
+        and the penetration are those of the pool
+    """
+
+    def __init__(
+        self,
+        SHUFFLE: bool = True,
+        decks: int = 6,
+        penetration: float = 0.75,
+        rng: RandomSource = None,
+        counting: Iterable[Union[str, CountingSystem]] = (),
+        pool: 'ShoePool' = None,
+    ):
+        if pool is not None:
+            decks = pool.decks
+            penetration = pool.penetration
+        if decks < 1:
+            raise ValueError("A shoe needs at least one deck")
+        if not 0 < penetration <= 1:
+            raise ValueError("'penetration' should be in ]0, 1]")
+        self.decks = decks
+        self.penetration = penetration
+        self.rng = make_rng(rng)
+        self.pool = pool
+        # cards left and running counts, updated as the cards are dealt
+        self.counter = CardCounter(decks, counting)
+
         # boolean flag to tell the controller if the deck needs to be shuffled
         # should be checked at the end of every turn by the controller
         self.needs_shuffling = False
 
-        self.cards = (
-            list(itertools.product(card_to_value_dict.keys(), colors)) * 6
-        )
-
-        if SHUFFLE:
-            self.shuffle()
+        self.cards = np.tile(np.arange(52, dtype=np.uint8), decks)
+        # the cards are shared with forks of the deck, and copied before
+        # being shuffled in place
+        self._shared = False
 
         # index of the card on the top of the deck
         self.top_card_index = 0
@@ -23,34 +68,236 @@ class Deck:
         # index of the red card, when the dealer finds this card, he shuffles
         # the deck. Usually placed around 3/4 of the deck
         # self.needs_shuffling is set to True when this index is reached
-        self.red_card_index = self.computeRedCardIndex(len(self.cards))
+        self.red_card_index = self.computeRedCardIndex(
+            len(self.cards), self.penetration, self.rng
+        )
+
+        if SHUFFLE:
+            self.shuffle()
+
+    @property
+    def cards_left(self) -> int:
+        return len(self.cards) - self.top_card_index
+
+    @property
+    def rng(self) -> np.random.Generator:
+        if self._rng is None:
+            # forked deck: its generator is only rebuilt when it is needed
+            self._rng = restore_rng(self._rng_state)
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng: np.random.Generator):
+        self._rng = rng
+
+    def fork(self) -> 'Deck':
+        """
+        Copy of the deck that deals the same cards as this one from now on,
+        sharing the shoe until one of them shuffles (copy-on-write). The
+        fork's random generator starts in the state of this one, and it
+        does not take shoes from the pool.
+        """
+        deck = copy.copy(self)
+        deck._rng = None
+        deck._rng_state = self.rng.bit_generator.state
+        deck.counter = self.counter.fork()
+        deck.pool = None
+        self._shared = deck._shared = True
+        return deck
 
     def shuffle(self):
-        # shuffle deck
-        random.shuffle(self.cards)
+        if self.pool is not None:
+            # constant time swap with a shoe shuffled in the background
+            self.cards, self.red_card_index = self.pool.get()
+            self._shared = False
+        else:
+            if self._shared:
+                self.cards = self.cards.copy()
+                self._shared = False
+            # shuffle deck in place, views returned by draw see the new order
+            self.rng.shuffle(self.cards)
+            # recalculate red card index, not really necessary but more
+            # realistic
+            self.red_card_index = self.computeRedCardIndex(
+                len(self.cards), self.penetration, self.rng
+            )
         # reset counter
         self.top_card_index = 0
-        # recalculate red card index, not really necessary but more realistic
-        self.red_card_index = self.computeRedCardIndex(len(self.cards))
         # reset shuffling flag to False
         self.needs_shuffling = False
+        self.counter.reset()
 
     def getCard(self) -> Card:
+        if self.top_card_index >= len(self.cards):
+            # Running out of cards, the shoe is shuffled automatically
+            self.shuffle()
+
+        code = self.cards.item(self.top_card_index)
+        self.counter.see(code)
         self.top_card_index += 1
-        if self.top_card_index == self.red_card_index:
+        if self.top_card_index >= self.red_card_index:
             # The deck needs to be shuffled
             self.needs_shuffling = True
 
-        return Card(*self.cards[self.top_card_index])
+        return cards_by_code[code]
+
+    def draw(self, n: int) -> np.ndarray:
+        """
+        Deals the next n cards of the shoe as card codes. The shoe is
+        shuffled first if less than n cards are left.
+        The returned array is a view on the shoe: it is not copied, and is
+        only valid until the next shuffle
+        :param int n: number of cards to deal
+        :return: array of n uint8 card codes
+        """
+        if not 0 <= n <= len(self.cards):
+            raise ValueError(
+                f"Cannot draw {n} cards from a {len(self.cards)} cards shoe"
+            )
+        if self.top_card_index + n > len(self.cards):
+            self.shuffle()
+
+        start = self.top_card_index
+        self.top_card_index += n
+        if self.top_card_index >= self.red_card_index:
+            self.needs_shuffling = True
+
+        codes = self.cards[start:self.top_card_index]
+        self.counter.see_codes(codes)
+        return codes
 
     @staticmethod
-    def computeRedCardIndex(deck_length: int) -> int:
+    def computeRedCardIndex(
+        deck_length: int,
+        penetration: float = 0.75,
+        rng: RandomSource = None,
+    ) -> int:
         """
-        Utility function to choose a random index at 3/4th of the deck's
-        length += 30
+        Utility function to choose a random index at penetration times the
+        deck's length += 30 (less for small shoes)
         :param deck_length:
+        :param penetration: part of the deck dealt before the red card
+        :param rng: random generator or its seed, unseeded by default
         :return: red card index
         """
-        return random.randint(
-            (3 / 4) * deck_length - 30, (3 / 4) * deck_length + 30
-        )
+        rng = make_rng(rng)
+        center = int(penetration * deck_length)
+        spread = min(30, deck_length // 8)
+        low = max(1, center - spread)
+        high = min(deck_length, center + spread)
+        return int(rng.integers(low, high + 1))
+
+
+class ContinuousShuffler(Deck):
+    """
+    A continuous shuffling machine.
+
+    The machine holds a count of every card code instead of an ordered shoe,
+    and every card dealt is a random pick weighted by these counts. The
+    cards dealt during a round go back into the machine when it is shuffled,
+    which RoundEngine.start_round does before every round as
+    needs_shuffling is set as soon as a card was dealt: this only costs the
+    number of cards dealt, the shoe is never rebuilt.
+
+    A pick draws a random slot among the 52 * decks slots of a full shoe and
+    is accepted if this copy of the card is in the machine, so that it
+    takes O(1) tries on average while cards on the table are few. The slots
+    are drawn in blocks by a common.rng.RandomStream.
+
+    The machine has no ordered shoe: cards, top_card_index and
+    red_card_index are None. Every Deck method using them (cards_left, fork,
+    shuffle, getCard and draw) is overridden.
+
+    :param int decks: number of 52 cards decks in the machine
+    :param rng: random generator of the picks or its seed, unseeded by
+        default
+    :param counting: counting systems tracked by self.counter
+    """
+
+    def __init__(
+        self,
+        decks: int = 6,
+        rng: RandomSource = None,
+        counting: Iterable[Union[str, CountingSystem]] = (),
+    ):
+        if decks < 1:
+            raise ValueError("A shoe needs at least one deck")
+        self.decks = decks
+        self.penetration = 1.
+        self.rng = make_rng(rng)
+        self.stream = RandomStream(self.rng)
+        self.pool = None
+        self.counter = CardCounter(decks, counting)
+        self.needs_shuffling = False
+
+        # copies of every card code in the machine
+        self.counts = [decks] * 52
+        self.total = 52 * decks
+        # attributes of the ordered shoe of a Deck, unused by the machine
+        self.cards = None
+        self.top_card_index = None
+        self.red_card_index = None
+        self._shared = False
+        # codes of the cards dealt since the last shuffle
+        self.discards = []
+
+    @property
+    def cards_left(self) -> int:
+        return self.total
+
+    def fork(self) -> 'ContinuousShuffler':
+        """
+        Copy of the machine drawing the same cards as this one from now on
+        """
+        deck = copy.copy(self)
+        deck.stream = copy.deepcopy(self.stream)
+        deck.rng = deck.stream.rng
+        deck.counter = self.counter.fork()
+        deck.counts = list(self.counts)
+        deck.discards = list(self.discards)
+        return deck
+
+    def shuffle(self):
+        """
+        Puts the cards dealt back into the machine
+        """
+        for code in self.discards:
+            self.counts[code] += 1
+        self.total += len(self.discards)
+        self.discards = []
+        self.needs_shuffling = False
+        self.counter.reset()
+
+    def _pick(self) -> int:
+        """
+        Removes a random card from the machine
+        :return: code of the card
+        """
+        if not self.total:
+            raise IndexError("The machine is empty")
+        counts = self.counts
+        slots = 52 * self.decks
+        while True:
+            copy_index, code = divmod(self.stream.integers(slots), 52)
+            if copy_index < counts[code]:
+                counts[code] -= 1
+                self.total -= 1
+                self.discards.append(code)
+                self.counter.see(code)
+                self.needs_shuffling = True
+                return code
+
+    def getCard(self) -> Card:
+        return cards_by_code[self._pick()]
+
+    def draw(self, n: int) -> np.ndarray:
+        """
+        Deals n cards as card codes
+        :param int n: number of cards to deal
+        :return: array of n uint8 card codes
+        """
+        if not 0 <= n <= self.total:
+            raise ValueError(
+                f"Cannot draw {n} cards from a machine holding {self.total}"
+            )
+        return np.array([self._pick() for _ in range(n)], dtype=np.uint8)
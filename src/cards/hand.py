@@ -2,9 +2,31 @@ from typing import List, Tuple
 
 from src.cards.card import Card
 from src.cards.exceptions import CardsAPIError
+from src.cards.transitions import (
+    EMPTY,
+    next_states,
+    state_aces,
+    state_hards,
+    state_totals,
+)
 
 
 class Hand:
+    """
+    Cards of a player or of the dealer.
+
+    The hand is reduced to a state of transitions.py, updated by one table
+    lookup when a card is added, so value, is_soft, is_burnt and
+    is_black_jack are plain attributes. Cards should therefore only be added
+    with "hand += card" or "hand + card", not by modifying card_list
+    directly.
+    """
+
+    __slots__ = (
+        "card_list", "is_split", "is_dealer_hand", "state",
+        "value", "is_soft", "is_burnt", "is_black_jack",
+    )
+
     def __init__(
         self,
         card_list: List[Card] = None,
@@ -15,33 +37,50 @@ class Hand:
         self.is_split = isSplit
         self.is_dealer_hand = is_dealer_hand
 
-    @property
-    def value(self) -> int:
-        # without this sort, aces are always counted as 11
-        sorted_card_list = sorted(
-            self.card_list, key=lambda x: x.value, reverse=True
-        )
-        return sum(sorted_card_list)
+        self.state = EMPTY
+        for card in self.card_list:
+            self.state = next_states[self.state][card.value]
+        self._update_totals()
+
+    def _update_totals(self):
+        """
+        Reads the attributes of the hand's state
+        """
+        self.value, self.is_soft, self.is_burnt, two_cards_21 = state_totals[
+            self.state
+        ]
+        self.is_black_jack = two_cards_21 and not self.is_split
+
+    def reset(self, is_dealer_hand: bool = None, is_split: bool = False):
+        """
+        Empties the hand in place, keeping its card list, so that it can be
+        reused for another round (see humans.hand_pool.HandPool)
+        :param bool is_dealer_hand: new owner of the hand, unchanged if None
+        :param bool is_split: the hand comes from a split
+        """
+        self.card_list.clear()
+        if is_dealer_hand is not None:
+            self.is_dealer_hand = is_dealer_hand
+        self.is_split = is_split
+        self.state = EMPTY
+        self._update_totals()
+
+    def _add_card(self, card: Card):
+        self.card_list.append(card)
+        self.state = next_states[self.state][card.value]
+        self._update_totals()
 
     @property
-    def is_black_jack(self) -> bool:
-        hand_sum = sum(self.card_list)
-        if hand_sum == 21 and len(self.card_list) == 2 and not self.is_split:
-            return True
-        else:
-            return False
+    def hard_value(self) -> int:
+        """
+        Sum of the cards with aces counted as 1, capped at
+        transitions.MAX_HARD
+        """
+        return state_hards[self.state]
 
     @property
-    def is_burnt(self) -> bool:
-        # without this sort, aces are always counted as 11
-        sorted_card_list = sorted(
-            self.card_list, key=lambda x: x.value, reverse=True
-        )
-        hand_sum = sum(sorted_card_list)
-        if hand_sum > 21:
-            return True
-        else:
-            return False
+    def has_ace(self) -> bool:
+        return state_aces[self.state]
 
     def checkSplitIsPossible(self) -> bool:
         """
@@ -64,11 +103,16 @@ class Hand:
         :return: The two resulting hands in a tuple
         :raise: AssertionError
         """
+        first, second = self.split_cards()
+        return Hand([first], isSplit=True), Hand([second], isSplit=True)
+
+    def split_cards(self) -> Tuple[Card, Card]:
+        """
+        :return: the two cards of a hand that can be split
+        :raise: CardsAPIError if the hand cannot be split
+        """
         if self.checkSplitIsPossible():
-            return (
-                Hand([self.card_list[0]], isSplit=True),
-                Hand([self.card_list[1]], isSplit=True),
-            )
+            return self.card_list[0], self.card_list[1]
         raise CardsAPIError(f"{self!r} cannot be split")
 
     """
@@ -142,12 +186,13 @@ class Hand:
         """
         if not isinstance(card, Card):
             return NotImplemented
-        new_card_list = self.card_list + [card]
-        return Hand(
-            card_list=new_card_list,
-            is_dealer_hand=self.is_dealer_hand,
-            isSplit=self.is_split,
+        new_hand = Hand(
+            is_dealer_hand=self.is_dealer_hand, isSplit=self.is_split
         )
+        new_hand.card_list = self.card_list.copy()
+        new_hand.state = self.state
+        new_hand._add_card(card)
+        return new_hand
 
     def __iadd__(self, card) -> 'Hand':
         """
@@ -157,7 +202,7 @@ class Hand:
         """
         if not isinstance(card, Card):
             return NotImplemented
-        self.card_list += [card]
+        self._add_card(card)
         return self
 
     def __repr__(self) -> str:
@@ -172,3 +217,127 @@ class Hand:
         else:
             owner = "Player"
         return f"{owner} Hand : {self.card_list}"
+
+
+class PersistentHand(Hand):
+    """
+    Immutable Hand sharing its cards with the hands it was built from.
+
+    A hand is a node holding its last card and the hand it was built from,
+    so "hand + card" creates one node in O(1) without copying the cards,
+    and the branches of a game tree share their common prefix. The state
+    and the totals are computed once when the node is created.
+    "hand += card" rebinds the name to a new hand, like for tuples.
+
+    card_list is rebuilt (and cached) when it is read, as a tuple.
+    """
+
+    __slots__ = ("card", "parent", "length", "_cards")
+
+    def __init__(
+        self,
+        card_list: List[Card] = None,
+        is_dealer_hand: bool = False,
+        isSplit: bool = False,
+    ):
+        cards = list(card_list or [])
+        self.is_dealer_hand = is_dealer_hand
+        self.is_split = isSplit
+        # last card, and hand without it
+        self.card = None
+        self.parent = None
+        self.length = 0
+        self.state = EMPTY
+        if cards:
+            parent = self._root(is_dealer_hand, isSplit)
+            for card in cards[:-1]:
+                parent = parent._extend(card)
+            self.card = cards[-1]
+            self.parent = parent
+            self.length = len(cards)
+            self.state = next_states[parent.state][self.card.value]
+        self._cards = tuple(cards)
+        self._update_totals()
+
+    @classmethod
+    def _root(cls, is_dealer_hand: bool, is_split: bool) -> 'PersistentHand':
+        """
+        Hand without cards, the first node of every chain
+        """
+        hand = object.__new__(cls)
+        hand.is_dealer_hand = is_dealer_hand
+        hand.is_split = is_split
+        hand.card = None
+        hand.parent = None
+        hand.length = 0
+        hand.state = EMPTY
+        hand._cards = ()
+        hand._update_totals()
+        return hand
+
+    @classmethod
+    def from_hand(cls, hand: Hand) -> 'PersistentHand':
+        return cls(hand.card_list, hand.is_dealer_hand, hand.is_split)
+
+    def to_hand(self) -> Hand:
+        """
+        :return: a mutable Hand holding the same cards
+        """
+        return Hand(list(self.card_list), self.is_dealer_hand, self.is_split)
+
+    def _extend(self, card: Card) -> 'PersistentHand':
+        hand = object.__new__(type(self))
+        hand.is_dealer_hand = self.is_dealer_hand
+        hand.is_split = self.is_split
+        hand.card = card
+        hand.parent = self
+        hand.length = self.length + 1
+        hand.state = next_states[self.state][card.value]
+        hand._cards = None
+        hand._update_totals()
+        return hand
+
+    @property
+    def card_list(self) -> Tuple[Card, ...]:
+        if self._cards is None:
+            cards = []
+            node = self
+            while node.length:
+                cards.append(node.card)
+                node = node.parent
+            self._cards = tuple(reversed(cards))
+        return self._cards
+
+    def _add_card(self, card: Card):
+        raise CardsAPIError(f"{self!r} is immutable")
+
+    def reset(self, is_dealer_hand: bool = None, is_split: bool = False):
+        raise CardsAPIError(f"{self!r} is immutable")
+
+    def __reduce__(self):
+        return (
+            type(self),
+            (list(self.card_list), self.is_dealer_hand, self.is_split),
+        )
+
+    def split(self) -> Tuple['PersistentHand', 'PersistentHand']:
+        if self.checkSplitIsPossible():
+            first, second = self.card_list
+            return (
+                PersistentHand([first], isSplit=True),
+                PersistentHand([second], isSplit=True),
+            )
+        raise CardsAPIError(f"{self!r} cannot be split")
+
+    def __add__(self, card: Card) -> 'PersistentHand':
+        if not isinstance(card, Card):
+            return NotImplemented
+        return self._extend(card)
+
+    __iadd__ = __add__
+
+    def __repr__(self) -> str:
+        return (
+            f"PersistentHand(card_list={list(self.card_list)!r}, "
+            f"is_dealer_hand={self.is_dealer_hand!r})"
+        )
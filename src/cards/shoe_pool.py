@@ -0,0 +1,111 @@
+import queue
+import threading
+from typing import Tuple
+
+import numpy as np
+
+from src.cards.deck import Deck
+from src.common.rng import make_rng
+
+# A shuffled shoe: card codes and red card index
+Shoe = Tuple[np.ndarray, int]
+
+
+class ShoePool:
+    """
+    Bounded pool of shoes shuffled in advance by a background thread.
+
+    A Deck created with a pool takes its next shoe from the pool when it
+    shuffles, so swapping shoes at the red card only replaces the Deck's
+    array of cards. Every shoe is shuffled, and its red card placed, by its
+    own random generator spawned from the pool's seed: the shoes come out in
+    the same order for the same seed, whichever tables take them.
+    The pool can be shared by the decks of several tables.
+
+    :param int decks: number of decks in each shoe
+    :param float penetration: penetration of the shoes
+    :param int size: number of shoes kept ready
+    :param seed: seed of the shoes, random if None
+    """
+
+    def __init__(
+        self,
+        decks: int = 6,
+        penetration: float = 0.75,
+        size: int = 4,
+        seed: int = None,
+    ):
+        if size < 1:
+            raise ValueError("A pool holds at least one shoe")
+        self.decks = decks
+        self.penetration = penetration
+        self.size = size
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._queue: "queue.Queue[Shoe]" = queue.Queue(maxsize=size)
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        # number of shoes shuffled, and number of times a deck had to wait
+        # for the background thread
+        self.shoes_made = 0
+        self.waits = 0
+
+        self._thread = threading.Thread(
+            target=self._fill, name="ShoePool", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> 'ShoePool':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _make_shoe(self) -> Shoe:
+        with self._lock:
+            seed_sequence = self._seed_sequence.spawn(1)[0]
+            self.shoes_made += 1
+        rng = make_rng(seed_sequence)
+        cards = np.tile(np.arange(52, dtype=np.uint8), self.decks)
+        rng.shuffle(cards)
+        red_card_index = Deck.computeRedCardIndex(
+            len(cards), self.penetration, rng
+        )
+        return cards, red_card_index
+
+    def _fill(self):
+        """
+        Background thread: keeps the pool full until it is closed
+        """
+        while not self._closed.is_set():
+            shoe = self._make_shoe()
+            while not self._closed.is_set():
+                try:
+                    self._queue.put(shoe, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    def get(self) -> Shoe:
+        """
+        Takes the next shuffled shoe, waiting for the background thread if
+        the pool is empty
+        :return: card codes and red card index of the shoe
+        """
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            self.waits += 1
+        while True:
+            if self._closed.is_set():
+                return self._make_shoe()
+            try:
+                return self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    def close(self):
+        """
+        Stops the background thread. Shoes are then shuffled on demand.
+        """
+        self._closed.set()
+        self._thread.join()
@@ -47,3 +47,35 @@ def test_add_ace():
     card_3 = Card("ACE", "heaRts")
     assert card_1 + card_2 + card_3 == 20
     # assert card_3 + card_2 + card_1 == 20
+
+
+def test_card_spellings():
+
+    card = Card("ace", "H")
+    assert card is Card(1, "HEART")
+    assert card is Card("Ace", "hearts")
+    assert Card(11, "s").name == "JACK"
+    assert Card("queen", "Diamond").color == "DIAMONDS"
+
+
+def test_card_is_interned_and_immutable():
+
+    assert Card(7, "clubs") is Card("SEVEN", "CLUB")
+    card = Card(7, "clubs")
+    try:
+        card.value = 3
+    except AttributeError:
+        assert True
+    else:
+        assert False
+
+
+def test_invalid_card():
+
+    for value, color in ((14, "hearts"), ("JOKER", "hearts"), (2, "stars")):
+        try:
+            Card(value, color)
+        except ValueError:
+            assert True
+        else:
+            assert False
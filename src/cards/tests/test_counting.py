@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.cards.counting import COUNTING_SYSTEMS, CardCounter
+from src.cards.deck import Deck
+
+
+def test_systems():
+
+    for name in ("hi_lo", "omega_ii", "zen"):
+        assert COUNTING_SYSTEMS[name].balanced
+    assert not COUNTING_SYSTEMS["ko"].balanced
+    assert COUNTING_SYSTEMS["ko"].initial_count(6) == -20
+
+
+def test_counts_follow_the_shoe():
+
+    deck = Deck(decks=2, rng=np.random.default_rng(7),
+                counting=COUNTING_SYSTEMS)
+    counter = deck.counter
+    for _ in range(60):
+        deck.getCard()
+    deck.draw(20)
+
+    # the incremental state matches a scan of the cards left
+    left = deck.cards[deck.top_card_index:]
+    ranks = np.bincount(left // 4 + 1, minlength=14)[1:]
+    assert counter.rank_counts() == tuple(ranks.tolist())
+    assert counter.remaining(1) == ranks[0]
+    assert counter.cards_left == deck.cards_left == 24
+    values = np.minimum(np.arange(1, 14), 10)
+    composition = np.bincount(values, weights=ranks, minlength=11)[1:]
+    assert counter.composition() == tuple(composition.astype(int).tolist())
+
+    dealt = deck.cards[:deck.top_card_index]
+    for system in counter.systems:
+        tags = np.array(system.tags)[np.minimum(dealt // 4 + 1, 10)]
+        expected = system.initial_count(2) + int(tags.sum())
+        assert counter.running_count(system.name) == expected
+    assert counter.true_count("hi_lo") == (
+        counter.running_count("hi_lo") * 52 / 24
+    )
+
+    # a balanced count is back to 0 and KO to the sum of a deck at the end
+    deck.draw(24)
+    assert counter.running_count("hi_lo") == 0
+    assert counter.running_count("ko") == 4
+    deck.shuffle()
+    assert counter.cards_left == 104
+    assert counter.running_count("zen") == 0
+
+
+def test_composition_snapshot():
+
+    counter = CardCounter(1)
+    snapshot = counter.composition()
+    assert snapshot == (4,) * 9 + (16,)
+    assert counter.composition() is snapshot
+    counter.see(0)
+    assert counter.composition()[0] == 3
+    assert snapshot[0] == 4
@@ -1,5 +1,7 @@
-from src.cards.deck import Deck
-from src.cards.card import Card
+import numpy as np
+
+from src.cards.deck import ContinuousShuffler, Deck
+from src.cards.card import Card, cards_by_code
 
 
 def test_init_deck():
@@ -28,14 +30,10 @@ def test_deal_deck():
 def test_shuffle_deck():
 
     deck = Deck()
-    try:
-        for i in range(500):
-            card = deck.getCard()
-    except IndexError:
-        assert True
-    else:
-        # This shouldn't work because the Deck is only 312 cards long
-        assert False
+    # The Deck is only 312 cards long, it is shuffled when running out
+    for i in range(500):
+        card = deck.getCard()
+    assert deck.top_card_index == 500 - 312
 
     deck = Deck()
 
@@ -64,3 +62,55 @@ def test_init_shuffle_deck():
     deck1 = Deck(False)
     deck2 = Deck(False)
     assert deck1.cards[0] == deck2.cards[0]
+
+
+def test_draw_deck():
+
+    deck = Deck(False, decks=1, penetration=0.5)
+    assert len(deck.cards) == 52
+    assert 20 <= deck.red_card_index <= 32
+
+    codes = deck.draw(4)
+    assert deck.top_card_index == 4
+    assert codes.base is deck.cards
+    assert [cards_by_code[code] for code in codes] == [
+        Card("ACE", "hearts"), Card("ACE", "diamonds"),
+        Card("ACE", "clubs"), Card("ACE", "spades"),
+    ]
+
+    deck.draw(40)
+    assert deck.needs_shuffling
+    # Only 8 cards are left, the shoe is shuffled before dealing
+    deck.draw(10)
+    assert deck.top_card_index == 10
+    assert not deck.needs_shuffling
+
+
+def test_continuous_shuffler():
+
+    deck = ContinuousShuffler(decks=1, rng=np.random.default_rng(5))
+    cards = [deck.getCard() for _ in range(52)]
+    # a full machine deals every card once
+    assert sorted(card.code for card in cards) == list(range(52))
+    assert deck.cards_left == 0
+    assert deck.needs_shuffling
+    try:
+        deck.getCard()
+        assert False
+    except IndexError:
+        pass
+
+    deck.shuffle()
+    assert deck.cards_left == 52
+    assert deck.counter.composition() == (4,) * 9 + (16,)
+    codes = deck.draw(10)
+    assert len(set(codes.tolist())) == 10
+    assert deck.counter.cards_left == 42
+
+    # picks are uniform over the cards in the machine
+    deck = ContinuousShuffler(decks=2, rng=np.random.default_rng(6))
+    values = np.zeros(11)
+    for _ in range(13000):
+        values[deck.getCard().value] += 1
+        deck.shuffle()
+    assert abs(values[10] / 13000 - 4 / 13) < 0.02
@@ -1,4 +1,4 @@
-from src.cards.hand import Hand
+from src.cards.hand import Hand, PersistentHand
 from src.cards.card import Card
 
 # To launch test in console :
@@ -67,3 +67,79 @@ def test_split_hand():
         assert True
     else:
         assert False
+
+
+def test_hand_totals():
+
+    hand = Hand([Card("ACE"), Card(6)])
+    assert hand.value == 17
+    assert hand.is_soft
+    assert not hand.is_burnt
+
+    hand += Card(10)
+    assert hand.value == 17
+    assert not hand.is_soft
+
+    hand += Card(5)
+    assert hand.is_burnt
+
+    # only one ace can count as 11
+    hand = Hand([Card(13), Card(1), Card(1)])
+    assert hand.value == 12
+    assert not hand.is_burnt
+
+
+def test_black_jack_hand():
+
+    hand = Hand([Card("KING"), Card("ACE")])
+    assert hand.is_black_jack
+    assert hand > Hand([Card(10), Card(5), Card(6)])
+
+    hand_1, hand_2 = Hand([Card(1), Card(1, "spades")]).split()
+    hand_1 += Card(12)
+    assert hand_1.value == 21
+    assert not hand_1.is_black_jack
+
+
+def test_persistent_hand():
+
+    base = PersistentHand([Card(1), Card(6)])
+    assert base.value == 17 and base.is_soft
+    hit = base + Card(10)
+    other = base + Card(3)
+    # the branches share the base hand
+    assert hit.parent is base and other.parent is base
+    assert base.card_list == (Card(1), Card(6))
+    assert hit.value == 17 and not hit.is_soft
+    assert other.value == 20
+    assert other > hit
+    assert hit == Hand([Card(1), Card(6), Card(10)])
+
+    same = base
+    same += Card(5)
+    assert same is not base
+    assert base.value == 17
+    try:
+        base._add_card(Card(2))
+    except CardsAPIError:
+        pass
+    else:
+        assert False
+
+    assert PersistentHand([Card(10), Card(1)]).is_black_jack
+    first, second = PersistentHand([Card(8), Card(8, "spades")]).split()
+    assert first.is_split and (first + Card(3)).value == 11
+    assert PersistentHand.from_hand(hit.to_hand()).card_list == hit.card_list
+
+
+def test_hands_are_slotted():
+    import copy
+    import pickle
+
+    hand = Hand([Card(10), Card(7)])
+    assert not hasattr(hand, "__dict__")
+    persistent = PersistentHand([Card(10), Card(7)])
+    assert not hasattr(persistent, "__dict__")
+    assert pickle.loads(pickle.dumps(persistent)).card_list == \
+        persistent.card_list
+    assert copy.deepcopy(persistent).value == 17
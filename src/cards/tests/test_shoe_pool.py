@@ -0,0 +1,45 @@
+import numpy as np
+
+from src.cards.deck import Deck
+from src.cards.shoe_pool import ShoePool
+
+
+def test_pool_shoes():
+
+    with ShoePool(decks=2, size=3, seed=11) as pool:
+        shoes = [pool.get() for _ in range(5)]
+    with ShoePool(decks=2, size=3, seed=11) as pool:
+        again = [pool.get() for _ in range(5)]
+
+    for (cards, red_card), (same_cards, same_red_card) in zip(shoes, again):
+        assert len(cards) == 104
+        assert np.array_equal(np.sort(cards), np.repeat(np.arange(52), 2))
+        assert np.array_equal(cards, same_cards)
+        assert red_card == same_red_card
+    # every shoe has its own generator
+    assert not np.array_equal(shoes[0][0], shoes[1][0])
+
+
+def test_deck_with_pool():
+
+    pool = ShoePool(decks=1, penetration=0.5, size=2, seed=3)
+    deck = Deck(pool=pool)
+    assert deck.decks == 1
+    first_shoe = deck.cards
+    for _ in range(deck.red_card_index):
+        deck.getCard()
+    assert deck.needs_shuffling
+
+    deck.shuffle()
+    assert deck.cards is not first_shoe
+    assert deck.top_card_index == 0
+    assert deck.counter.cards_left == 52
+    assert not deck.needs_shuffling
+    assert 20 <= deck.red_card_index <= 32
+
+    # once closed, the pool shuffles the shoes on demand
+    pool.close()
+    made = pool.shoes_made
+    for _ in range(5):
+        deck.shuffle()
+    assert pool.shoes_made > made
@@ -0,0 +1,40 @@
+import itertools
+
+import numpy as np
+
+from src.cards import transitions
+from src.cards.transitions import (
+    DEALER_HITS,
+    EMPTY,
+    NEXT_STATE,
+    STATE_BLACK_JACK,
+    STATE_BURNT,
+    STATE_SOFT,
+    STATE_VALUE,
+)
+
+
+def test_states_match_card_sums():
+
+    for cards in range(1, 5):
+        for values in itertools.product(range(1, 11), repeat=cards):
+            state = EMPTY
+            for value in values:
+                state = NEXT_STATE[state, value]
+            hard = sum(values)
+            soft = 1 in values and hard <= 11
+            total = hard + 10 * soft
+            assert STATE_VALUE[state] == min(total, transitions.MAX_HARD)
+            assert STATE_SOFT[state] == soft
+            assert STATE_BURNT[state] == (hard > 21)
+            assert STATE_BLACK_JACK[state] == (cards == 2 and total == 21)
+
+
+def test_dealer_hits():
+
+    soft_17 = NEXT_STATE[NEXT_STATE[EMPTY, 1], 6]
+    hard_17 = NEXT_STATE[NEXT_STATE[EMPTY, 10], 7]
+    assert not DEALER_HITS[0, soft_17]
+    assert DEALER_HITS[1, soft_17]
+    assert not DEALER_HITS[1, hard_17]
+    assert np.array_equal(DEALER_HITS[0], STATE_VALUE < 17)
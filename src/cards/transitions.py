@@ -0,0 +1,83 @@
+import numpy as np
+
+# ============================================================================
+# = Hand states
+# =
+# = A hand is reduced to a state packing its hard total (aces counted as 1),
+# = whether it holds an ace, and its number of cards up to 3 (enough to tell
+# = black jacks apart). Adding a card is one lookup in NEXT_STATE, and every
+# = attribute of the hand is one lookup in the STATE_* arrays.
+# ============================================================================
+
+# Hard totals are capped: a burnt hand stays burnt, whatever its total
+MAX_HARD = 31
+MAX_CARDS = 3
+STATES = (MAX_HARD + 1) * 2 * (MAX_CARDS + 1)
+
+
+def encode(hard: int, ace: bool, cards: int) -> int:
+    """
+    :param int hard: hard total of the hand
+    :param bool ace: the hand holds an ace
+    :param int cards: number of cards of the hand
+    :return: state of the hand
+    """
+    return (
+        (min(cards, MAX_CARDS) * 2 + int(ace)) * (MAX_HARD + 1)
+        + min(hard, MAX_HARD)
+    )
+
+
+# State of a hand without cards
+EMPTY = encode(0, False, 0)
+
+STATE_HARD = np.zeros(STATES, dtype=np.int8)
+STATE_ACE = np.zeros(STATES, dtype=bool)
+STATE_CARDS = np.zeros(STATES, dtype=np.int8)
+for _cards in range(MAX_CARDS + 1):
+    for _ace in (False, True):
+        for _hard in range(MAX_HARD + 1):
+            _state = encode(_hard, _ace, _cards)
+            STATE_HARD[_state] = _hard
+            STATE_ACE[_state] = _ace
+            STATE_CARDS[_state] = _cards
+
+# one ace counts as 11 as long as the hand does not go over 21
+STATE_SOFT = STATE_ACE & (STATE_HARD <= 11)
+STATE_VALUE = (STATE_HARD + 10 * STATE_SOFT).astype(np.int8)
+STATE_BURNT = STATE_HARD > 21
+# 21 with two cards, split hands excepted (see Hand.is_black_jack)
+STATE_BLACK_JACK = (STATE_VALUE == 21) & (STATE_CARDS == 2)
+
+# Next state, indexed by [state, card value], aces being 1
+NEXT_STATE = np.zeros((STATES, 11), dtype=np.uint8)
+NEXT_STATE[:, 0] = np.arange(STATES)
+for _state in range(STATES):
+    for _value in range(1, 11):
+        NEXT_STATE[_state, _value] = encode(
+            int(STATE_HARD[_state]) + _value,
+            STATE_ACE[_state] or _value == 1,
+            int(STATE_CARDS[_state]) + 1,
+        )
+
+# Dealer's decision to hit, indexed by [mode, state], as
+# Dealer.choose_action: mode 0 stands on all 17s, mode 1 hits soft 17
+DEALER_HITS = np.stack([
+    STATE_VALUE < 17,
+    (STATE_VALUE < 17) | ((STATE_VALUE == 17) & STATE_SOFT),
+])
+
+del _cards, _ace, _hard, _state, _value
+
+# Python lists for lookups of single hands, faster than numpy scalars
+next_states = NEXT_STATE.tolist()
+# (value, is_soft, is_burnt, two cards 21) of every state
+state_totals = list(zip(
+    STATE_VALUE.tolist(),
+    STATE_SOFT.tolist(),
+    STATE_BURNT.tolist(),
+    STATE_BLACK_JACK.tolist(),
+))
+state_hards = STATE_HARD.tolist()
+state_aces = STATE_ACE.tolist()
+dealer_hits = DEALER_HITS.tolist()
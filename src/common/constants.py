@@ -8,7 +8,7 @@ import os
 import json
 from enum import Enum
 
-from src.cards.hand import Hand
+from src.cards.hand import Hand, PersistentHand
 from src.common.config import ConfigPath
 
 # ============================================================================
@@ -57,6 +57,28 @@ class Decision(Enum):
     split = 3
 
 
+class Outcome(Enum):
+    """
+    Class with the results of a Hand against the dealer's one
+    """
+    lose = 0
+    push = 1
+    win = 2
+    black_jack = 3
+
+
+class Phase(Enum):
+    """
+    Class with the phases of a round
+    """
+    betting = 0
+    dealing = 1
+    player_actions = 2
+    dealer_play = 3
+    settlement = 4
+    finished = 5
+
+
 class Moves(Enum):
     """
     Class with moves possibilities
@@ -70,12 +92,24 @@ class PlayerHand:
     Hand list index for player hand
     """
 
+    __slots__ = ("hand", "hand_bet", "is_lock")
+
     def __init__(self, hand: Hand = None,
-                 hand_bet: int = 0, is_lock: bool = False):
+                 hand_bet: float = 0, is_lock: bool = False):
         self.hand: Hand = hand or Hand()
-        self.hand_bet: int = hand_bet
+        self.hand_bet: float = hand_bet
         self.is_lock: bool = is_lock
 
+    def fork(self) -> 'PlayerHand':
+        """
+        Copy whose hand shares its cards with this one, see
+        PersistentHand
+        """
+        hand = self.hand
+        if not isinstance(hand, PersistentHand):
+            hand = PersistentHand.from_hand(hand)
+        return PlayerHand(hand, self.hand_bet, self.is_lock)
+
     def __repr__(self):
         return (f"PlayerHand object(hand = {self.hand}, "
                 f"hand_bet = {self.hand_bet}, "
@@ -7,7 +7,7 @@ from marshmallow import fields, Schema, post_load
 from src.common.constants import CONFIG_GAME_VIEW
 
 
-@dataclass
+@dataclass(slots=True)
 class Dimensions:
     width: Optional[int] = field(default=None)
     height: Optional[int] = field(default=None)
@@ -22,7 +22,7 @@ class DimensionsSchema(Schema):
         return Dimensions(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class Coordinates:
     x: Optional[int] = field(default=None)
     y: Optional[int] = field(default=None)
@@ -42,9 +42,12 @@ class CoordinatesSchema(Schema):
 
 
 @dataclass
-class AreaDefinition(Coordinates, Dimensions):
+class AreaDefinition(Coordinates):
+    # the fields of Dimensions, which cannot be a second base as both
+    # classes have slots
+    width: Optional[int] = field(default=None)
+    height: Optional[int] = field(default=None)
     color: Optional[List[int]] = field(default=None)
-    pass
 
 
 class AreaDefinitionSchema(CoordinatesSchema, DimensionsSchema):
@@ -0,0 +1,91 @@
+from typing import Dict, List, Union
+
+import numpy as np
+
+# Anything a random generator can be made from: nothing (fresh entropy), an
+# integer seed, a SeedSequence or an existing Generator
+RandomSource = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def make_rng(source: RandomSource = None) -> np.random.Generator:
+    """
+    :param source: seed of the generator, a Generator being returned as is
+    :return: a PCG64 Generator
+    """
+    if isinstance(source, np.random.Generator):
+        return source
+    return np.random.Generator(np.random.PCG64(source))
+
+
+def restore_rng(state: dict) -> np.random.Generator:
+    """
+    :param dict state: state of a Generator's bit_generator
+    :return: a Generator continuing the sequence from that state
+    """
+    bit_generator = getattr(np.random, state["bit_generator"])()
+    bit_generator.state = state
+    return np.random.Generator(bit_generator)
+
+
+def chunk_seed_sequence(seed: int, chunk_id: int) -> np.random.SeedSequence:
+    """
+    Seed of one chunk of a simulation. It is the chunk_id-th child spawned
+    by SeedSequence(seed), built directly so that a chunk can be replayed
+    without spawning the chunks before it.
+    :param int seed: seed of the simulation
+    :param int chunk_id: index of the chunk
+    :return: the chunk's SeedSequence
+    """
+    return np.random.SeedSequence(seed, spawn_key=(chunk_id,))
+
+
+def chunk_seed_sequences(seed: int, chunks: int):
+    """
+    :return: the seeds of the first chunks of a simulation
+    """
+    return [chunk_seed_sequence(seed, chunk_id) for chunk_id in range(chunks)]
+
+
+class RandomStream:
+    """
+    Random numbers drawn from a Generator in blocks.
+
+    Drawing one number from a numpy Generator costs about a microsecond of
+    overhead, so the numbers are generated BUFFER_SIZE at a time and served
+    from Python lists. Bot policies and machines drawing many single numbers
+    should use a stream rather than the Generator itself.
+
+    :param source: generator or seed of the numbers
+    """
+
+    BUFFER_SIZE = 1024
+
+    def __init__(self, source: RandomSource = None):
+        self.rng = make_rng(source)
+        self._floats: List[float] = []
+        # buffers of integers, by upper bound
+        self._integers: Dict[int, List[int]] = {}
+
+    def random(self) -> float:
+        """
+        :return: a float uniformly drawn in [0, 1)
+        """
+        if not self._floats:
+            self._floats = self.rng.random(self.BUFFER_SIZE).tolist()
+        return self._floats.pop()
+
+    def integers(self, high: int) -> int:
+        """
+        :return: an integer uniformly drawn in [0, high)
+        """
+        buffer = self._integers.get(high)
+        if not buffer:
+            buffer = self.rng.integers(0, high, self.BUFFER_SIZE).tolist()
+            self._integers[high] = buffer
+        return buffer.pop()
+
+    def choice(self, items):
+        """
+        :return: an item of the sequence, uniformly drawn
+        """
+        return items[self.integers(len(items))]
@@ -0,0 +1,41 @@
+import numpy as np
+
+from src.common.rng import (
+    RandomStream,
+    chunk_seed_sequence,
+    chunk_seed_sequences,
+    make_rng,
+)
+
+
+def test_make_rng():
+
+    rng = make_rng(5)
+    assert isinstance(rng.bit_generator, np.random.PCG64)
+    assert make_rng(rng) is rng
+    assert make_rng(5).random() == make_rng(5).random()
+    assert make_rng(np.random.SeedSequence(5)).random() == rng.random()
+
+
+def test_chunk_seeds():
+
+    children = np.random.SeedSequence(42).spawn(4)
+    for chunk_id, (child, chunk) in enumerate(
+        zip(children, chunk_seed_sequences(42, 4))
+    ):
+        assert np.array_equal(child.generate_state(4), chunk.generate_state(4))
+        assert np.array_equal(
+            chunk.generate_state(4),
+            chunk_seed_sequence(42, chunk_id).generate_state(4),
+        )
+
+
+def test_random_stream():
+
+    stream = RandomStream(3)
+    values = [stream.integers(6) for _ in range(3000)]
+    assert set(values) == set(range(6))
+    assert all(0 <= stream.random() < 1 for _ in range(2000))
+    assert stream.choice("ab") in "ab"
+    same_seed = RandomStream(3)
+    assert [same_seed.integers(6) for _ in range(10)] == values[:10]
@@ -22,6 +22,8 @@ class Signal:
 
 
 class SurfaceWithPosition:
+    __slots__ = ("surface", "position")
+
     def __init__(self, surface: pygame.Surface, position: Coordinates):
         self.surface = surface
         self.position = position
@@ -0,0 +1,158 @@
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+import pygame
+
+# Default number of frames per second of the main loop
+FPS = 30
+
+
+def pygame_wait(timeout: float) -> Optional[pygame.event.Event]:
+    """
+    Waits for the next pygame event, sleeping in SDL while there is none.
+    The timeout of pygame.event.wait needs pygame 2
+    :param float timeout: maximum waiting time in seconds
+    :return: the event, or None if the timeout expired
+    """
+    milliseconds = int(timeout * 1000)
+    if milliseconds > 0:
+        event = pygame.event.wait(milliseconds)
+    else:
+        event = pygame.event.poll()
+    if event.type == pygame.NOEVENT:
+        return None
+    return event
+
+
+class LoopStats:
+    """
+    Measures of a FrameLoop.
+
+    The input latency of an event is the time between the loop waking up
+    with the event and the end of its handling, the loop sleeping in the
+    event queue rather than between frames. The idle CPU is the process
+    time used during the frames without any event, as a fraction of their
+    duration: about 0 for a loop that really sleeps, 1 for a loop spinning
+    on a core.
+
+    :param int history: number of latencies kept for the percentiles
+    """
+
+    def __init__(self, history: int = 10000):
+        self.frames = 0
+        self.events = 0
+        self.idle_frames = 0
+        self.idle_wall_time = 0.
+        self.idle_cpu_time = 0.
+        self.latencies = deque(maxlen=history)
+
+    def add_frame(self, events: int, wall_time: float, cpu_time: float):
+        self.frames += 1
+        self.events += events
+        if not events:
+            self.idle_frames += 1
+            self.idle_wall_time += wall_time
+            self.idle_cpu_time += cpu_time
+
+    @property
+    def idle_cpu(self) -> float:
+        """
+        Fraction of a core used while idle
+        """
+        if not self.idle_wall_time:
+            return 0.
+        return self.idle_cpu_time / self.idle_wall_time
+
+    def latency(self, percentile: float) -> float:
+        """
+        :param float percentile: between 0 and 100
+        :return: input latency in seconds, 0 if there was no input
+        """
+        if not self.latencies:
+            return 0.
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    def report(self) -> str:
+        return (
+            f"Frames: {self.frames} ({self.idle_frames} idle), "
+            f"events: {self.events}, "
+            f"idle CPU: {self.idle_cpu:.1%}, "
+            f"input latency p50: {self.latency(50) * 1000:.2f} ms, "
+            f"p99: {self.latency(99) * 1000:.2f} ms"
+        )
+
+
+class FrameLoop:
+    """
+    Single main loop feeding events one at a time to a handler, at most
+    fps frames per second.
+
+    Within a frame the loop sleeps in wait until an event arrives or the
+    frame is over, so an event is handled as soon as it is received and the
+    loop uses no CPU while nothing happens. After every frame on_frame is
+    called, to redraw for instance.
+
+    :param handle: callable taking one event and returning False to stop
+        the loop
+    :param int fps: frames per second
+    :param wait: callable taking a timeout in seconds and returning the
+        next event, or None once the timeout expired
+    :param on_frame: callable called at the end of every frame
+    """
+
+    def __init__(
+        self,
+        handle: Callable[[Any], bool],
+        fps: int = FPS,
+        wait: Callable[[float], Any] = pygame_wait,
+        on_frame: Callable[[], None] = None,
+    ):
+        self.handle = handle
+        self.period = 1 / fps
+        self.wait = wait
+        self.on_frame = on_frame
+        self.stats = LoopStats()
+        self.running = False
+
+    def step(self) -> bool:
+        """
+        Runs one frame
+        :return: False if the handler asked to stop
+        """
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        deadline = start + self.period
+        events = 0
+        keep_running = True
+        while keep_running:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            event = self.wait(timeout)
+            if event is None:
+                break
+            received = time.perf_counter()
+            keep_running = self.handle(event)
+            self.stats.latencies.append(time.perf_counter() - received)
+            events += 1
+
+        if self.on_frame is not None:
+            self.on_frame()
+        self.stats.add_frame(events, time.perf_counter() - start,
+                             time.process_time() - cpu_start)
+        return keep_running
+
+    def run(self, frames: int = None):
+        """
+        Runs frames until the handler asks to stop
+        :param int frames: maximum number of frames, no limit if None
+        """
+        self.running = True
+        while self.running and (frames is None or frames > 0):
+            self.running = self.step()
+            if frames is not None:
+                frames -= 1
+        self.running = False
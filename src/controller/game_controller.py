@@ -1,10 +1,12 @@
 from src.views.view_game import ViewGame
 from src.humans.dealer import Dealer
+from src.humans.hand_pool import HandPool
 from src.humans.player import Player
 from src.cards.deck import Deck
-from src.common.constants import Decision
+from src.common.constants import Decision, Outcome, Phase
+from src.controller.round_engine import RoundEngine
+from src.controller.time_bank import DecisionClock
 
-import pygame
 from pygame.locals import (
     QUIT,
     KEYDOWN,
@@ -23,28 +25,73 @@ from pygame.locals import (
     K_KP6,
 )
 
+# Buttons executed by the keys of the keyboard and of the keypad
+KEY_BUTTONS = {
+    K_1: "card", K_KP1: "card",
+    K_2: "bet", K_KP2: "bet",
+    K_3: "end_turn", K_KP3: "end_turn",
+    K_4: "split", K_KP4: "split",
+    K_5: "double", K_KP5: "double",
+    K_6: "quit", K_KP6: "quit",
+}
+
 
 class GameController:
     """
-    A controller for all the game
+    A controller for all the game.
+
+    It is a state machine fed one event at a time by handle_event, from the
+    main loop of the application (see frame_loop.FrameLoop). The humans
+    have limited time to bet and play, checked by tick every frame.
+
+    :param window: pygame window of the game
+    :param DecisionClock clock: time given to the humans
     """
-    def __init__(self, window):
+    def __init__(self, window, clock: DecisionClock = None):
         print("Enter in controller")
         self.window = window
-        self.humans_list = []
-        self.dealer = Dealer()
+        # The rules of the round are handled by the engine, the controller
+        # only translates the user's inputs into engine actions
+        self.engine = RoundEngine(Deck(), Dealer(), [], pool=HandPool())
         self.view_game = None
         self.player_wallet = 500
-        self.deck = Deck()
         # Game loop variables
-        self.playing = False
         self.quit = False
         self.human = None
         self.hand_idx = None
+        # index of the human betting, during the betting phase
+        self.better_index = 0
+        self.clock = clock if clock is not None else DecisionClock()
         # self.view_game = View_game(window, view_config)
 
+    @property
+    def humans_list(self):
+        return self.engine.players
+
+    @humans_list.setter
+    def humans_list(self, humans_list):
+        self.engine.players = humans_list
+
+    @property
+    def dealer(self):
+        return self.engine.dealer
+
+    @dealer.setter
+    def dealer(self, dealer):
+        self.engine.dealer = dealer
+
+    @property
+    def deck(self):
+        return self.engine.deck
+
     def game_launch(self):
         self.view_game = ViewGame(self.window)
+        self.connect_buttons()
+
+    def connect_buttons(self):
+        """
+        Attaches the actions of the controller to the buttons of the view
+        """
         self.view_game.buttons["card"].signal.attach(self.btn_card)
         self.view_game.buttons["bet"].signal.attach(self.btn_bet)
         self.view_game.buttons["end_turn"].signal.attach(self.btn_end_turn)
@@ -121,128 +168,150 @@ class GameController:
         """Resetting all humans : no more player and new dealer"""
         self.humans_list = []
         self.dealer = Dealer()
+        # a round left in the middle is abandoned
+        self.engine.phase = Phase.finished
+        self.human = None
+        self.clock.wait_for([])
+
+    # =========================================================================
+    # = State machine
+    # =========================================================================
 
-    def first_round(self):
+    def handle_event(self, event) -> bool:
         """
-        First round allow the players to bet them deal the card for everybody
-        :return: bool : state of the round
+        Feeds one pygame event to the controller, which never waits for
+        the next one: the state of the game is the engine's phase, and the
+        index of the human betting during the betting phase.
+        Once a round is over, the next event starts a new round.
+
+        :param event: pygame event
+        :return: False if the players want to leave the game
         """
+        if event.type == QUIT:
+            return False
+        elif event.type == KEYDOWN and event.key == K_ESCAPE:
+            return False
 
-        for human in self.humans_list:
-            human.clear_hands()
-        self.dealer.clear_hand()
+        if self.engine.phase == Phase.finished:
+            self.start_round()
+        else:
+            if event.type == KEYDOWN and event.key in KEY_BUTTONS:
+                # disabled buttons ignore the keys of the other phases
+                self.view_game.buttons[KEY_BUTTONS[event.key]].execute()
+            for btn in self.view_game.buttons.values():
+                btn.handle_event(event)
+            self.advance()
 
-        # Set buttons state
-        self.enable_buttons("bet", "quit")
-        self.disable_buttons("card", "end_turn", "split", "double")
+        return not self.quit
 
-        # loop only for betting. Betting buttons should be the only one modifiable
-        for self.human in self.humans_list:
-            print(self.human.name + " is betting.")
-            self.quit = False
-            self.playing = True
-            while self.playing:
-                event = pygame.event.wait()
-                if event.type == QUIT:
-                    return False
-                elif event.type == KEYDOWN and event.key == K_ESCAPE:
-                    return False
-                elif event.type == KEYDOWN :
-                    if event.key in [K_2, K_KP2]:
-                        self.view_game.buttons["bet"].execute()
-                    elif event.key in [K_3, K_KP3]:
-                        self.view_game.buttons["end_turn"].execute()
-                    elif event.key in [K_6, K_KP6]:
-                        self.view_game.buttons["quit"].execute()
-
-                for btn in self.view_game.buttons.values():
-                    btn.handle_event(event)
-                
-                if self.quit:
-                    return False
-
-        # loop to deal hands to everybody
-        for self.human in self.humans_list:
-            print(self.human.name + "is receiving cards.")
-            # at initialization we only change the first hand of the player with 2 cards
-            self.human.add_card(self.deck.getCard(), 0)
-            self.human.add_card(self.deck.getCard(), 0)
-
-        # giving the dealer a hand (with 2 card)
-        self.dealer.add_card(self.deck.getCard())
-        self.dealer.add_card(self.deck.getCard())
-        print("End bet_round")
-        return True
-
-    def play_one_round(self):
+    def start_round(self):
+        """
+        Opens the bets of a new round, the humans betting one after the
+        other
+        """
+        self.engine.start_round()
+        self.clock.new_round()
+        self.better_index = 0
+        self.quit = False
 
         # Set buttons state
-        self.enable_buttons("card", "end_turn", "quit")
-        self.disable_buttons("bet", "split", "double")
+        self.enable_buttons("bet", "quit")
+        self.disable_buttons("card", "end_turn", "split", "double")
+        self.advance()
 
-        for self.human in self.humans_list:
+    def advance(self):
+        """
+        Makes the transitions that do not wait for the humans: dealing once
+        everybody bet, and the dealer's play and the settlement once every
+        hand was played
+        """
+        if self.engine.phase == Phase.betting:
+            if self.better_index < len(self.humans_list):
+                if self.human is not self.humans_list[self.better_index]:
+                    self.human = self.humans_list[self.better_index]
+                    print(self.human.name + " is betting.")
+                self.clock.wait_for([self.human.uuid])
+                return
+            # deal hands to everybody who bet, and to the dealer
+            self.engine.deal()
+            print("End bet_round")
+            self.human = None
+            self.enable_buttons("card", "end_turn", "quit")
+            self.disable_buttons("bet", "split", "double")
+
+        if self.engine.phase == Phase.player_actions:
+            self.follow_current_hand()
+
+        if self.engine.phase == Phase.dealer_play:
+            self.end_round()
+
+        # the human awaited has his own decision time
+        self.clock.wait_for([self.human.uuid] if self.human else [])
+
+    def tick(self):
+        """
+        Applies the default action of the human out of time: betting the
+        minimum and ending his turn while betting, standing otherwise
+        """
+        if self.human is None or self.engine.phase not in (
+            Phase.betting, Phase.player_actions
+        ) or not self.clock.expired():
+            return
+        print(self.human.name + " is out of time.")
+        self.clock.timed_out(self.human.uuid)
+        if self.engine.phase == Phase.betting:
+            if self.human.hands[0].hand_bet == 0:
+                self.btn_bet()
+            self.btn_end_turn()
+        elif self.engine.phase == Phase.player_actions:
+            self.btn_end_turn()
+        self.advance()
+
+    def follow_current_hand(self):
+        """
+        Announces the hand to play and enables the buttons of its possible
+        actions
+        """
+        if (self.human is not self.engine.current_player
+                or self.hand_idx != self.engine.hand_index):
+            self.human = self.engine.current_player
+            self.hand_idx = self.engine.hand_index
             print(str(self.human) + " round")
-            for self.hand_idx in range(len(self.human.hands)):
-                print("Hand %i" % self.hand_idx)
-                print(self.human.name + " is playing.")
-                # Get list of possible actions
-                # Manage interfaces
-                # Let human choose
-                self.quit = False
-                self.playing = True
-                while self.playing:
-                    event = pygame.event.wait()
-                    if event.type == QUIT:
-                        return False
-                    elif event.type == KEYDOWN:
-                        if event.key == K_ESCAPE:
-                            return False
-                        elif event.key in [K_1, K_KP1]:
-                            self.view_game.buttons["card"].execute()
-                        elif event.key in [K_2, K_KP2]:
-                            self.view_game.buttons["bet"].execute()
-                        elif event.key in [K_3, K_KP3]:
-                            self.view_game.buttons["end_turn"].execute()
-                        elif event.key in [K_4, K_KP4]:
-                            self.view_game.buttons["split"].execute()
-                        elif event.key in [K_5, K_KP5]:
-                            self.view_game.buttons["double"].execute()
-                        elif event.key in [K_6, K_KP6]:
-                            self.view_game.buttons["quit"].execute()
-                    
-                    for btn in self.view_game.buttons.values():
-                        btn.handle_event(event)
-        
-                    if self.quit:
-                        return False
-
-        dealer_decision = self.dealer.choose_action()
+            print("Hand %i" % self.hand_idx)
+            print(self.human.name + " is playing.")
+        # Manage interfaces depending on the possible actions
+        actions = self.engine.legal_actions()
+        for btn, decision in (("split", Decision.split),
+                              ("double", Decision.double)):
+            if decision in actions:
+                self.enable_buttons(btn)
+            else:
+                self.disable_buttons(btn)
+
+    def end_round(self):
+        """
+        Plays the dealer's hand and settles the round
+        """
+        self.engine.play_dealer()
         print("Dealer hand : " + str(self.dealer.hand))
 
-        while dealer_decision != Decision.stand:
-            print(dealer_decision)
-            if dealer_decision == Decision.hit:
-                self.dealer.add_card(self.deck.getCard())
-            print("Dealer hand : " + str(self.dealer.hand))
-            dealer_decision = self.dealer.choose_action()
+        # Win of loose ?
+        for result in self.engine.settle():
+            hand = result.player.hands[result.hand_index]
+            if result.outcome == Outcome.lose:
+                print("Player %s loose with hand %s." % (result.player, hand))
+            elif result.outcome == Outcome.push:
+                print("Player %s with hand %s is even with the dealer."
+                      % (result.player, hand))
+            else:
+                print("Player %s win with hand %s." % (result.player, hand))
+        for human in self.humans_list:
+            print("Wallet of %s : %s" % (human.name, human.wallet))
 
-        print("Dealer decision : " + str(dealer_decision))
+        self.human = None
+        self.hand_idx = None
+        self.disable_buttons("card", "end_turn", "split", "double")
 
-        # Win of loose ?
-        if self.dealer.hand.is_burnt:
-            print("Everyone win !")
-        else:
-            for human in self.humans_list:
-                for hand in human.hands:
-                    if hand.hand.is_burnt:
-                        print("Player %s loose with hand %s." % (human, str(hand)))
-                    elif hand.hand > self.dealer.hand:
-                        print("Player %s win with hand %s." % (human, str(hand)))
-                    elif hand.hand == self.dealer.hand:
-                        print("Player %s with hand %s is even with the dealer." % (human, str(hand)))
-
-        return True
-    
     # =========================================================================
     # = Buttons
     # =========================================================================
@@ -252,12 +321,9 @@ class GameController:
         Manage actions on card button
         """
 
-        card = self.deck.getCard()
-        self.human.add_card(card, self.hand_idx)
+        self.engine.apply(Decision.hit)
+        self.clock.decided(self.human.uuid)
         print("You : " + str(self.human.hands[self.hand_idx].hand))
-        if self.human.hands[self.hand_idx].hand.is_burnt or self.human.hands[self.hand_idx].hand.is_black_jack:
-            print("Is burnt or black jack")
-            self.playing = False
 
         print("btn_card")
 
@@ -267,12 +333,8 @@ class GameController:
         """
 
         bet_amount = 5
-        hand_id = 0
-        if len(self.human.hands) >= 2:
-            print("You have %i hands" % len(self.human.hands))
-            hand_id = input("Hand number for bet : ")
-        self.human.bet(int(bet_amount), int(hand_id))
-        print(f"Hand amount {self.human.hands[hand_id].hand_bet} in the {hand_id}")
+        self.engine.place_bet(self.human, bet_amount)
+        print(f"Hand amount {self.human.hands[0].hand_bet}")
         self.enable_buttons("end_turn")
 
         print("btn_bet")
@@ -282,7 +344,12 @@ class GameController:
         Manage actions on end turn button
         """
 
-        self.playing = False
+        if self.engine.phase == Phase.player_actions:
+            self.engine.apply(Decision.stand)
+        else:
+            # the next human bets
+            self.better_index += 1
+        self.clock.decided(self.human.uuid)
 
         print("btn_end_turn")
 
@@ -291,11 +358,8 @@ class GameController:
         Manage actions on split button
         """
 
-        hand_id = 0
-        if len(self.human.hands) >= 2:
-            print("You have %i hands" % len(self.human.hands))
-            hand_id = input("Hand number for bet : ")
-        self.human.split(hand_id)
+        self.engine.apply(Decision.split)
+        self.clock.decided(self.human.uuid)
 
         print("btn_split")
 
@@ -304,7 +368,8 @@ class GameController:
         Manage actions on double button
         """
 
-        self.human.double(0)
+        self.engine.apply(Decision.double)
+        self.clock.decided(self.human.uuid)
 
         print("btn_double")
 
@@ -0,0 +1,331 @@
+from typing import Callable, Dict, List, Optional
+
+from src.cards.card import Card
+from src.cards.deck import Deck
+from src.common.constants import Decision, Phase, PlayerHand
+from src.controller.settlement import HandResult, settle_table
+from src.humans.dealer import Dealer
+from src.humans.hand_pool import HandPool
+from src.humans.player import Player
+
+
+# ============================================================================
+# = Policies
+# ============================================================================
+
+
+def dealer_policy(engine: 'RoundEngine') -> Decision:
+    """
+    Policy mimicking the dealer: hit below 17 and stand otherwise
+    """
+    if engine.current_hand.hand.value < 17:
+        return Decision.hit
+    return Decision.stand
+
+
+# ============================================================================
+# = Engine
+# ============================================================================
+
+
+class RoundEngine:
+    """
+    Plays rounds of black jack without any user interface.
+
+    A round goes through the phases betting, dealing, player actions,
+    dealer play and settlement. Each phase can be driven step by step (this
+    is what the GameController does with the buttons), or the whole round
+    can be played by play_round, the players' decisions then being given by
+    the policy callable.
+
+    :param Deck deck: shoe used to deal the cards
+    :param Dealer dealer: dealer of the table
+    :param list players: players seated at the table
+    :param policy: callable taking the engine and returning the Decision
+        for its current hand, used by play_round
+    :param bet_policy: callable taking a Player and returning the amount he
+        bets, used by play_round. Bets minimum_bet by default
+    :param int dealer_mode: mode given to Dealer.choose_action
+    :param int minimum_bet: default bet of the players
+    :param HandPool pool: pool recycling the hands of the finished rounds,
+        new hands are allocated every round if None
+    """
+
+    def __init__(
+        self,
+        deck: Deck = None,
+        dealer: Dealer = None,
+        players: List[Player] = None,
+        policy: Callable[['RoundEngine'], Decision] = dealer_policy,
+        bet_policy: Callable[[Player], int] = None,
+        dealer_mode: int = 0,
+        minimum_bet: int = 5,
+        pool: HandPool = None,
+    ):
+        self.deck = deck if deck is not None else Deck()
+        self.dealer = dealer if dealer is not None else Dealer()
+        self.players = players if players is not None else []
+        self.policy = policy
+        self.bet_policy = bet_policy
+        self.dealer_mode = dealer_mode
+        self.minimum_bet = minimum_bet
+        self.pool = pool
+
+        self.phase = Phase.finished
+        # players who bet this round, and position of the hand being played
+        self.seated: List[Player] = []
+        self.seat_index = 0
+        self.hand_index = 0
+        self.results: List[HandResult] = []
+
+    # =========================================================================
+    # = State
+    # =========================================================================
+
+    @property
+    def current_player(self) -> Optional[Player]:
+        if self.phase != Phase.player_actions:
+            return None
+        return self.seated[self.seat_index]
+
+    @property
+    def current_hand(self) -> Optional[PlayerHand]:
+        if self.phase != Phase.player_actions:
+            return None
+        return self.seated[self.seat_index].hands[self.hand_index]
+
+    @property
+    def dealer_upcard(self) -> Card:
+        return self.dealer.hand.card_list[0]
+
+    def _check_phase(self, phase: Phase):
+        if self.phase != phase:
+            raise ValueError(
+                f"Action only possible during {phase.name} phase, "
+                f"current phase is {self.phase.name}"
+            )
+
+    # =========================================================================
+    # = Phases
+    # =========================================================================
+
+    def start_round(self):
+        """
+        Shuffles the deck if the red card was reached, clears all the hands
+        and opens the bets
+        """
+        if self.deck.needs_shuffling:
+            self.deck.shuffle()
+        for player in self.players:
+            player.clear_hands(self.pool)
+        self.dealer.clear_hand(self.pool)
+        self.seated = []
+        self.results = []
+        self.phase = Phase.betting
+
+    def place_bet(self, player: Player, amount: int) -> bool:
+        """
+        Bets on the first hand of the player
+        :return: False if the wallet did not allow the whole amount
+        """
+        self._check_phase(Phase.betting)
+        return player.bet(amount, 0)
+
+    def collect_bets(self):
+        """
+        Makes every player bet the amount given by the bet policy
+        """
+        for player in self.players:
+            if self.bet_policy is None:
+                amount = self.minimum_bet
+            else:
+                amount = self.bet_policy(player)
+            if amount > 0 and player.wallet > 0:
+                self.place_bet(player, amount)
+
+    def deal(self):
+        """
+        Deals two cards to every player who bet and to the dealer
+        """
+        self._check_phase(Phase.betting)
+        self.phase = Phase.dealing
+        self.seated = [
+            player for player in self.players if player.hands[0].hand_bet > 0
+        ]
+        for _ in range(2):
+            for player in self.seated:
+                player.add_card(self.deck.getCard(), 0)
+            self.dealer.add_card(self.deck.getCard())
+
+        self.phase = Phase.player_actions
+        self.seat_index = 0
+        self.hand_index = 0
+        self._next_playable_hand()
+
+    def legal_actions(self) -> List[Decision]:
+        """
+        :return: the decisions possible for the current hand
+        """
+        self._check_phase(Phase.player_actions)
+        player = self.current_player
+        actions = [Decision.stand, Decision.hit]
+        if len(self.current_hand.hand.card_list) == 2:
+            if player.check_double_bet_is_possible(self.hand_index):
+                actions.append(Decision.double)
+            if player.check_split_is_possible(self.hand_index):
+                actions.append(Decision.split)
+        return actions
+
+    def apply(self, decision: Decision):
+        """
+        Applies the decision to the current hand, then moves to the next
+        hand to play if the current one is over
+        :param Decision decision: one of legal_actions()
+        """
+        if decision not in self.legal_actions():
+            raise ValueError(
+                f"{decision} is not possible for {self.current_hand}"
+            )
+        player = self.current_player
+        index = self.hand_index
+
+        if decision == Decision.stand:
+            player.hands[index].is_lock = True
+        elif decision == Decision.hit:
+            player.add_card(self.deck.getCard(), index)
+        elif decision == Decision.double:
+            # doubling locks the hand after one last card
+            player.double(index)
+            player.add_card(self.deck.getCard(), index)
+        elif decision == Decision.split:
+            player.split(index, self.pool)
+            player.add_card(self.deck.getCard(), index)
+            player.add_card(self.deck.getCard(), index + 1)
+
+        self._next_playable_hand()
+
+    def _next_playable_hand(self):
+        """
+        Locks the finished hands and moves to the first hand that still has
+        to be played, or to the dealer's play if there is none
+        """
+        while self.seat_index < len(self.seated):
+            hands = self.seated[self.seat_index].hands
+            while self.hand_index < len(hands):
+                player_hand = hands[self.hand_index]
+                if not (
+                    player_hand.is_lock
+                    or player_hand.hand.is_burnt
+                    or player_hand.hand.value == 21
+                ):
+                    return
+                player_hand.is_lock = True
+                self.hand_index += 1
+            self.seat_index += 1
+            self.hand_index = 0
+        self.phase = Phase.dealer_play
+
+    def play_dealer(self):
+        """
+        The dealer draws cards until he decides to stand
+        """
+        self._check_phase(Phase.dealer_play)
+        while self.dealer.choose_action(self.dealer_mode) == Decision.hit:
+            self.dealer.add_card(self.deck.getCard())
+        self.phase = Phase.settlement
+
+    def settle(self) -> List[HandResult]:
+        """
+        Compares every hand that was played to the dealer's hand and pays
+        the players, see settlement.settle_table
+        :return: the result of every hand
+        """
+        self._check_phase(Phase.settlement)
+        self.results = settle_table(self.seated, self.dealer.hand)
+        self.phase = Phase.finished
+        return self.results
+
+    def play_round(self) -> List[HandResult]:
+        """
+        Plays a whole round, using the policies for the players' decisions
+        :return: the result of every hand
+        """
+        self.start_round()
+        self.collect_bets()
+        self.deal()
+        return self.play_out()
+
+    def play_out(self) -> List[HandResult]:
+        """
+        Plays the rest of a dealt round with the policy and settles it
+        :return: the result of every hand
+        """
+        while self.phase == Phase.player_actions:
+            self.apply(self.policy(self))
+        self.play_dealer()
+        return self.settle()
+
+    # =========================================================================
+    # = What-if analysis
+    # =========================================================================
+
+    def fork(self) -> 'RoundEngine':
+        """
+        Copy of the whole table that can be played on without changing this
+        one: the deck is forked copy-on-write (see Deck.fork), and the
+        hands of the copies share their cards (see PersistentHand). The
+        copy deals the same cards as this engine would. It does not share
+        the pool of this engine.
+        :return: the forked engine
+        """
+        players = {id(player): player.fork() for player in self.players}
+        for player in self.seated:
+            if id(player) not in players:
+                players[id(player)] = player.fork()
+
+        engine = RoundEngine(
+            self.deck.fork(),
+            self.dealer.fork(),
+            [players[id(player)] for player in self.players],
+            policy=self.policy,
+            bet_policy=self.bet_policy,
+            dealer_mode=self.dealer_mode,
+            minimum_bet=self.minimum_bet,
+        )
+        engine.phase = self.phase
+        engine.seated = [players[id(player)] for player in self.seated]
+        engine.seat_index = self.seat_index
+        engine.hand_index = self.hand_index
+        engine.results = [
+            result._replace(player=players[id(result.player)])
+            for result in self.results
+        ]
+        return engine
+
+    def what_if(self, decision: Decision) -> List[HandResult]:
+        """
+        Plays the rest of the round in a fork, after applying the decision
+        to the current hand
+        :param Decision decision: one of legal_actions()
+        :return: the results of the forked round
+        """
+        engine = self.fork()
+        engine.apply(decision)
+        return engine.play_out()
+
+    def decision_values(self) -> Dict[Decision, float]:
+        """
+        Money won or lost by the current player in the round for every legal
+        decision of the current hand, the rest of the round being played by
+        the policy. The regret of a decision is its difference with the best
+        value.
+        :return: dict of the legal decisions and the player's net
+        """
+        uuid = self.current_player.uuid
+        return {
+            decision: sum(
+                result.net for result in self.what_if(decision)
+                if result.player.uuid == uuid
+            )
+            for decision in self.legal_actions()
+        }
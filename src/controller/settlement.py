@@ -0,0 +1,186 @@
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from src.cards.hand import Hand
+from src.common.constants import Outcome
+from src.humans.player import Player
+
+
+# ============================================================================
+# = Results
+# ============================================================================
+
+
+class HandResult(NamedTuple):
+    """
+    Result of one PlayerHand at the end of a round
+    """
+    player: Player
+    hand_index: int
+    outcome: Outcome
+    bet: float
+    # money won (positive) or lost (negative) by the hand
+    net: float
+
+
+# Money won for each unit bet, depending on the outcome
+PAYOUTS = {
+    Outcome.lose: -1,
+    Outcome.push: 0,
+    Outcome.win: 1,
+    Outcome.black_jack: 1.5,
+}
+
+# PAYOUTS indexed by Outcome value
+PAYOUT_ARRAY = np.array([PAYOUTS[outcome] for outcome in Outcome])
+
+_outcomes = list(Outcome)
+
+
+class DealerState(NamedTuple):
+    """
+    What the settlement needs to know of the dealer's final hand, read once
+    for all the hands of the table
+    """
+    value: int
+    is_burnt: bool
+    is_black_jack: bool
+
+    @classmethod
+    def from_hand(cls, hand: Hand) -> 'DealerState':
+        return cls(hand.value, hand.is_burnt, hand.is_black_jack)
+
+
+def classify(hand: Hand, dealer: DealerState) -> Outcome:
+    """
+    Compares a player's hand to the dealer's final hand, reading every
+    attribute of the hand once. Gives the same outcome as comparing the
+    hands with Hand's operators, except that a burnt hand always loses, even
+    against a dealer burnt with the same value, which Hand.__eq__ would
+    consider even.
+    :param Hand hand: player's hand
+    :param DealerState dealer: state of the dealer's final hand
+    :return: outcome of the hand
+    """
+    if hand.is_burnt:
+        return Outcome.lose
+    if hand.is_black_jack:
+        return Outcome.push if dealer.is_black_jack else Outcome.black_jack
+    if dealer.is_black_jack:
+        return Outcome.lose
+    if dealer.is_burnt:
+        return Outcome.win
+    value = hand.value
+    if value > dealer.value:
+        return Outcome.win
+    if value == dealer.value:
+        return Outcome.push
+    return Outcome.lose
+
+
+def classify_hand(hand: Hand, dealer_hand: Hand) -> Outcome:
+    """
+    Compares a player's hand to the dealer's final hand
+    :param Hand hand: player's hand
+    :param Hand dealer_hand: dealer's hand
+    :return: outcome of the hand
+    """
+    return classify(hand, DealerState.from_hand(dealer_hand))
+
+
+def classify_arrays(
+    values: np.ndarray,
+    burnt: np.ndarray,
+    black_jacks: np.ndarray,
+    dealer_values: np.ndarray,
+    dealer_burnt: np.ndarray,
+    dealer_black_jacks: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized classify: every argument is an array with one item per hand,
+    the dealer's arrays holding the state of the dealer of each hand
+    :return: array of Outcome values
+    """
+    outcomes = np.where(values > dealer_values, Outcome.win.value,
+                        Outcome.lose.value)
+    outcomes[values == dealer_values] = Outcome.push.value
+    outcomes[dealer_burnt] = Outcome.win.value
+    outcomes[dealer_black_jacks] = Outcome.lose.value
+    outcomes[black_jacks] = np.where(dealer_black_jacks[black_jacks],
+                                     Outcome.push.value,
+                                     Outcome.black_jack.value)
+    outcomes[burnt] = Outcome.lose.value
+    return outcomes
+
+
+# ============================================================================
+# = Settlement
+# ============================================================================
+
+
+def settle_table(players: Sequence[Player], dealer_hand: Hand,
+                 pay: bool = True) -> List[HandResult]:
+    """
+    Settles every hand of the players against the dealer's final hand.
+    The bets were taken from the wallets when they were placed (see
+    Player.bet, double and split), so a paid hand gets its bet back plus its
+    winnings: 2 times the bet for a win, 2.5 times for a black jack, the bet
+    for a push.
+    :param players: players of the table who played the round
+    :param Hand dealer_hand: dealer's final hand
+    :param bool pay: credit the wallets
+    :return: the result of every hand
+    """
+    dealer = DealerState.from_hand(dealer_hand)
+    results = []
+    for player in players:
+        for index, player_hand in enumerate(player.hands):
+            outcome = classify(player_hand.hand, dealer)
+            bet = player_hand.hand_bet
+            net = PAYOUTS[outcome] * bet
+            if pay:
+                player.wallet += bet + net
+            results.append(HandResult(player, index, outcome, bet, net))
+    return results
+
+
+def settle_tables(tables: Sequence[Tuple[Sequence[Player], Hand]],
+                  pay: bool = True) -> List[List[HandResult]]:
+    """
+    Settles several tables at once: the hands of all the tables are
+    gathered in arrays and classified by classify_arrays
+    :param tables: (players, dealer's final hand) of every table
+    :param bool pay: credit the wallets
+    :return: the results of every table, as settle_table
+    """
+    seats = []
+    columns = []
+    for table, (players, dealer_hand) in enumerate(tables):
+        dealer = DealerState.from_hand(dealer_hand)
+        for player in players:
+            for index, player_hand in enumerate(player.hands):
+                hand = player_hand.hand
+                seats.append((table, player, index, player_hand.hand_bet))
+                columns.append((hand.value, hand.is_burnt, hand.is_black_jack)
+                               + dealer)
+
+    results = [[] for _ in tables]
+    if not seats:
+        return results
+    values, burnt, black_jacks, dealer_values, dealer_burnt, \
+        dealer_black_jacks = (np.array(column) for column in zip(*columns))
+    outcomes = classify_arrays(values, burnt, black_jacks, dealer_values,
+                               dealer_burnt, dealer_black_jacks)
+    bets = np.array([seat[3] for seat in seats], dtype=float)
+    nets = PAYOUT_ARRAY[outcomes] * bets
+
+    for (table, player, index, bet), outcome, net in zip(
+        seats, outcomes.tolist(), nets.tolist()
+    ):
+        if pay:
+            player.wallet += bet + net
+        results[table].append(
+            HandResult(player, index, _outcomes[outcome], bet, net)
+        )
+    return results
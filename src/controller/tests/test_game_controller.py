@@ -0,0 +1,128 @@
+import os
+from types import SimpleNamespace
+
+import pygame
+from pygame.locals import KEYDOWN, K_1, K_2, K_3, K_ESCAPE, MOUSEMOTION
+
+from src.button import Button
+from src.cards.deck import Deck
+from src.common.constants import CONFIG_GAME_VIEW, Phase
+from src.controller.frame_loop import FrameLoop, LoopStats
+from src.controller.game_controller import GameController
+from src.controller.time_bank import DecisionClock
+from src.humans.player import Player
+
+# no window is shown during the tests
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame.init()
+
+
+def make_controller(humans=1, clock=None) -> GameController:
+    """
+    Controller with the buttons of the game view, without its pictures
+    """
+    window = pygame.display.set_mode((1200, 800))
+    controller = GameController(window, clock)
+    controller.view_game = SimpleNamespace(buttons={
+        iid: Button(window, **params)
+        for iid, params in CONFIG_GAME_VIEW["game_buttons"].items()
+    })
+    controller.connect_buttons()
+    controller.engine.deck = Deck(rng=11)
+    for index in range(humans):
+        controller.add_human(Player(f"Human {index}", 500))
+    return controller
+
+
+def key(code):
+    return pygame.event.Event(KEYDOWN, key=code)
+
+
+def test_controller_state_machine():
+    controller = make_controller(humans=2)
+    first, second = controller.humans_list
+
+    # any event starts a round, then the humans bet one after the other
+    assert controller.handle_event(pygame.event.Event(MOUSEMOTION, pos=(0, 0),
+                                                      rel=(0, 0), buttons=()))
+    assert controller.engine.phase == Phase.betting
+    assert controller.human is first
+    # hitting is not possible while betting
+    controller.handle_event(key(K_1))
+    assert controller.engine.phase == Phase.betting
+
+    controller.handle_event(key(K_2))
+    controller.handle_event(key(K_3))
+    assert controller.human is second and first.hands[0].hand_bet == 5
+    controller.handle_event(key(K_2))
+    controller.handle_event(key(K_2))
+    controller.handle_event(key(K_3))
+    assert second.hands[0].hand_bet == 10
+
+    # every event moves the round on, without waiting for the next one
+    rounds = 0
+    while controller.engine.phase != Phase.finished:
+        assert controller.engine.phase == Phase.player_actions
+        assert controller.handle_event(key(K_3))
+        rounds += 1
+    assert rounds <= 4
+    assert len(controller.engine.results) == 2
+    assert first.wallet + second.wallet == 985 + sum(
+        result.bet + result.net for result in controller.engine.results
+    )
+
+    controller.handle_event(key(K_2))
+    assert controller.engine.phase == Phase.betting
+    assert not controller.handle_event(key(K_ESCAPE))
+
+
+def test_controller_time_bank():
+    now = [0.]
+    clock = DecisionClock(decision_time=10, time_bank=0, clock=lambda: now[0])
+    controller = make_controller(clock=clock)
+    human = controller.humans_list[0]
+    controller.start_round()
+    controller.tick()
+    assert controller.engine.phase == Phase.betting
+
+    # out of time, the human bets the minimum, then stands
+    now[0] = 10
+    controller.tick()
+    assert human.hands[0].hand_bet == 5
+    while controller.engine.phase == Phase.player_actions:
+        now[0] += 10
+        controller.tick()
+    assert controller.engine.phase == Phase.finished
+    assert clock.metrics()[human.uuid]["timeouts"] >= 2
+    controller.tick()
+
+
+def test_frame_loop_feeds_events():
+    events = [1, 2, 3, None, 4, None]
+    handled = []
+
+    def wait(timeout):
+        return events.pop(0) if events else None
+
+    def handle(event):
+        handled.append(event)
+        return event != 4
+
+    loop = FrameLoop(handle, fps=200, wait=wait)
+    loop.run(frames=10)
+    assert handled == [1, 2, 3, 4]
+    # the fourth event stopped the loop in the second frame
+    assert loop.stats.frames == 2 and loop.stats.events == 4
+    assert len(loop.stats.latencies) == 4
+
+
+def test_frame_loop_sleeps_when_idle():
+    loop = FrameLoop(lambda event: True, fps=50,
+                     wait=lambda timeout: pygame.time.wait(
+                         int(timeout * 1000)) and None)
+    loop.run(frames=5)
+    stats = loop.stats
+    assert stats.idle_frames == 5
+    assert stats.idle_wall_time >= 5 * 0.015
+    assert stats.idle_cpu < 0.5
+    assert LoopStats().latency(99) == 0.
@@ -0,0 +1,147 @@
+import numpy as np
+
+from src.cards.card import Card
+from src.cards.deck import Deck
+from src.cards.hand import Hand
+from src.common.constants import Decision, Outcome, Phase
+from src.controller.round_engine import RoundEngine
+from src.controller.settlement import classify_hand
+from src.humans.player import Player
+
+
+def stacked_deck(*ranks):
+    """
+    Deck dealing the given ranks first, all of hearts
+    """
+    deck = Deck(False, decks=1)
+    deck.cards[:len(ranks)] = [Card(rank).code for rank in ranks]
+    return deck
+
+
+def test_play_round_headless():
+
+    players = [Player("Bot1", 1000), Player("Bot2", 1000)]
+    engine = RoundEngine(Deck(), players=players)
+    for _ in range(50):
+        results = engine.play_round()
+        assert engine.phase == Phase.finished
+        assert len(results) >= 1
+        for result in results:
+            assert result.outcome in Outcome
+
+
+def test_round_steps():
+
+    # player: 10, 6 / dealer: 9, 8 / next card: 5
+    player = Player("Bot", 100)
+    engine = RoundEngine(stacked_deck(10, 9, 6, 8, 5), players=[player])
+    engine.start_round()
+    assert engine.place_bet(player, 10)
+    engine.deal()
+    assert engine.phase == Phase.player_actions
+    assert engine.current_player is player
+    assert engine.dealer_upcard.value == 9
+    assert Decision.double in engine.legal_actions()
+    assert Decision.split not in engine.legal_actions()
+
+    engine.apply(Decision.hit)
+    # 21 ends the hand
+    assert engine.phase == Phase.dealer_play
+    engine.play_dealer()
+    [result] = engine.settle()
+    assert result.outcome == Outcome.win
+    assert result.net == 10
+
+
+def test_round_split_and_black_jack():
+
+    # player: 8, 8 / dealer: 10, 7 / split hands receive 3 and 10
+    player = Player("Bot", 100)
+    engine = RoundEngine(stacked_deck(8, 10, 8, 7, 3, 10), players=[player])
+    engine.start_round()
+    engine.place_bet(player, 10)
+    engine.deal()
+    engine.apply(Decision.split)
+    assert len(player.hands) == 2
+    assert player.wallet == 80
+    assert engine.hand_index == 0
+    engine.apply(Decision.stand)
+    engine.apply(Decision.stand)
+    engine.play_dealer()
+    outcomes = [result.outcome for result in engine.settle()]
+    assert outcomes == [Outcome.lose, Outcome.win]
+
+    # player: ACE, KING / dealer: 10, 9
+    engine.deck = stacked_deck(1, 10, 13, 9)
+    engine.start_round()
+    engine.place_bet(player, 10)
+    engine.deal()
+    assert engine.phase == Phase.dealer_play
+    engine.play_dealer()
+    [result] = engine.settle()
+    assert result.outcome == Outcome.black_jack
+    assert result.net == 15
+
+
+def test_illegal_action():
+
+    player = Player("Bot", 100)
+    engine = RoundEngine(stacked_deck(10, 9, 6, 8), players=[player])
+    engine.start_round()
+    engine.place_bet(player, 10)
+    engine.deal()
+    try:
+        engine.apply(Decision.split)
+    except ValueError:
+        assert True
+    else:
+        assert False
+
+
+def test_burnt_hand_loses():
+
+    player_hand = Hand([Card(10), Card(6), Card(6)])
+    dealer_hand = Hand([Card(10), Card(2), Card(10)], is_dealer_hand=True)
+    assert classify_hand(player_hand, dealer_hand) == Outcome.lose
+    dealer_hand = Hand([Card(10), Card(6), Card(9)], is_dealer_hand=True)
+    assert classify_hand(Hand([Card(10), Card(8)]), dealer_hand) == Outcome.win
+
+
+def test_fork_what_if():
+
+    # player: 6, 5 / dealer: 10, 7 / next cards: 10, 2, 9
+    player = Player("Bot", 100)
+    engine = RoundEngine(stacked_deck(6, 10, 5, 7, 10, 2, 9),
+                         players=[player])
+    engine.start_round()
+    engine.place_bet(player, 10)
+    engine.deal()
+
+    fork = engine.fork()
+    assert fork.deck.cards is engine.deck.cards
+    assert fork.current_player is not player
+    assert fork.current_player.uuid == player.uuid
+
+    values = engine.decision_values()
+    # doubling draws the 10, hitting draws the 10 and stands on 21
+    assert values[Decision.double] == 20
+    assert values[Decision.hit] == 10
+    assert values[Decision.stand] == -10
+
+    # the original table is untouched
+    assert engine.deck.top_card_index == 4
+    assert player.wallet == 90
+    assert player.hands[0].hand.value == 11
+    assert engine.phase == Phase.player_actions
+
+    # shuffling a fork does not change the original shoe
+    shoe = engine.deck.cards.copy()
+    fork.deck.shuffle()
+    assert np.array_equal(engine.deck.cards, shoe)
+    assert fork.deck.cards is not engine.deck.cards
+
+    engine.apply(Decision.double)
+    engine.play_dealer()
+    [result] = engine.settle()
+    assert result.net == 20
+    assert player.wallet == 120
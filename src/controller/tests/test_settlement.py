@@ -0,0 +1,120 @@
+import itertools
+
+import numpy as np
+
+from src.cards.card import Card
+from src.cards.hand import Hand
+from src.common.constants import Outcome
+from src.controller.settlement import (
+    DealerState,
+    classify,
+    classify_arrays,
+    settle_table,
+    settle_tables,
+)
+from src.humans.player import Player
+
+
+def hand_of(*ranks, dealer=False, split=False):
+    hand = Hand(is_dealer_hand=dealer, isSplit=split)
+    for rank in ranks:
+        hand += Card(rank)
+    return hand
+
+
+def reference_outcome(hand, dealer_hand):
+    """
+    Outcome given by Hand's comparison operators
+    """
+    if hand.is_burnt:
+        return Outcome.lose
+    if hand > dealer_hand:
+        return Outcome.black_jack if hand.is_black_jack else Outcome.win
+    if hand == dealer_hand:
+        return Outcome.push
+    return Outcome.lose
+
+
+HANDS = [(10, 1), (10, 9), (10, 6, 5), (10, 7), (9, 8), (10, 5, 9),
+         (1, 1, 9), (4, 3), (10, 6, 8)]
+
+
+def test_classify_matches_comparisons():
+
+    hands = [hand_of(*ranks) for ranks in HANDS] + [hand_of(10, 1, split=True)]
+    dealers = [hand_of(*ranks, dealer=True) for ranks in HANDS]
+    columns = []
+    expected = []
+    for hand, dealer_hand in itertools.product(hands, dealers):
+        outcome = classify(hand, DealerState.from_hand(dealer_hand))
+        assert outcome == reference_outcome(hand, dealer_hand)
+        columns.append((hand.value, hand.is_burnt, hand.is_black_jack)
+                       + DealerState.from_hand(dealer_hand))
+        expected.append(outcome.value)
+
+    arrays = [np.array(column) for column in zip(*columns)]
+    assert classify_arrays(*arrays).tolist() == expected
+
+
+def test_settle_table_pays_wallets():
+
+    player = Player("Bot", 100)
+    player.bet(10, 0)
+    player.hands[0].hand = hand_of(10, 1)
+    doubler = Player("Doubler", 100)
+    doubler.bet(10, 0)
+    doubler.hands[0].hand = hand_of(6, 5)
+    doubler.double(0)
+    doubler.add_card(Card(9), 0)
+    splitter = Player("Splitter", 100)
+    splitter.bet(10, 0)
+    splitter.hands[0].hand = hand_of(8, 8)
+    splitter.split(0)
+    splitter.add_card(Card(10), 0)
+    splitter.add_card(Card(2), 1)
+    splitter.add_card(Card(6), 1)
+    assert (player.wallet, doubler.wallet, splitter.wallet) == (90, 80, 80)
+
+    dealer_hand = hand_of(10, 7, dealer=True)
+    results = settle_table([player, doubler, splitter], dealer_hand)
+    assert [result.outcome for result in results] == [
+        Outcome.black_jack, Outcome.win, Outcome.win, Outcome.lose,
+    ]
+    assert [result.net for result in results] == [15, 20, 10, -10]
+    assert (player.wallet, doubler.wallet, splitter.wallet) == (115, 120, 100)
+
+    # a black jack on an odd bet pays half a unit
+    player = Player("Bot", 100)
+    player.bet(5, 0)
+    player.hands[0].hand = hand_of(1, 10)
+    settle_table([player], dealer_hand)
+    assert player.wallet == 107.5
+    # and the wallet keeps the half unit for the next bets
+    player.clear_hands()
+    assert not player.bet(108, 0)
+    assert (player.wallet, player.hands[0].hand_bet) == (0, 107.5)
+
+
+def test_settle_tables():
+
+    def table():
+        players = []
+        for ranks in HANDS[:4]:
+            player = Player("Bot", 50)
+            player.bet(10, 0)
+            player.hands[0].hand = hand_of(*ranks)
+            players.append(player)
+        return players
+
+    tables = [(table(), hand_of(*ranks, dealer=True)) for ranks in HANDS]
+    references = [(table(), dealer_hand) for _, dealer_hand in tables]
+    batch = settle_tables(tables)
+    for results, (players, dealer_hand) in zip(batch, references):
+        assert [result[1:] for result in results] == [
+            result[1:] for result in settle_table(players, dealer_hand)
+        ]
+    for (players, _), (reference_players, _) in zip(tables, references):
+        assert [player.wallet for player in players] == [
+            player.wallet for player in reference_players
+        ]
+    assert settle_tables([]) == []
@@ -0,0 +1,47 @@
+from src.controller.time_bank import DecisionClock
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.
+
+    def __call__(self):
+        return self.now
+
+
+def test_decision_clock():
+    time = FakeTime()
+    clock = DecisionClock(decision_time=10, time_bank=20, refill=5,
+                          clock=time)
+    clock.wait_for(["first", "second"])
+    assert clock.next_deadline() == 30
+    time.now = 4
+    assert clock.decided("first") == 4
+    # a quick decision leaves the bank untouched
+    assert clock.seat("first").bank == 20
+    assert clock.deadline("first") is None
+    assert clock.time_left("second") == 26
+
+    # the bank runs down after the decision time
+    time.now = 25
+    clock.wait_for(["first"])
+    assert clock.seat("second").bank == 5
+    assert clock.expired() == []
+    time.now = 55
+    assert clock.expired() == ["first"]
+    clock.timed_out("first")
+    assert clock.seat("first").bank == 0
+    assert clock.next_deadline() is None
+
+    clock.new_round()
+    assert clock.seat("first").bank == 5 and clock.seat("second").bank == 10
+    metrics = clock.metrics()
+    assert metrics["first"]["decisions"] == 2
+    assert metrics["first"]["timeouts"] == 1
+    assert metrics["first"]["waited"] == 4 + 30
+    assert metrics["second"]["mean_wait"] == 25
+    clock.forget("second")
+    assert "second" not in clock.metrics()
+
+    # bets at once, then 2 players taking 3 decisions each
+    assert clock.round_bound(2, decisions=3) == 30 + 2 * (30 + 20)
@@ -0,0 +1,205 @@
+import time
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+
+class SeatClock:
+    """
+    Waiting times of one seat
+
+    :param float bank: seconds of the time bank
+    """
+    __slots__ = ("bank", "waiting_since", "waited", "decisions", "timeouts")
+
+    def __init__(self, bank: float):
+        self.bank = bank
+        # start of the decision awaited, None if the seat is not awaited
+        self.waiting_since: Optional[float] = None
+        self.waited = 0.
+        self.decisions = 0
+        self.timeouts = 0
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "waited": self.waited,
+            "decisions": self.decisions,
+            "timeouts": self.timeouts,
+            "mean_wait": self.waited / self.decisions if self.decisions else 0.,
+            "bank": self.bank,
+        }
+
+
+class DecisionClock:
+    """
+    Time given to the players for their decisions.
+
+    Each decision gets decision_time seconds, after which the player's time
+    bank runs down. Once the bank is empty too the decision times out and
+    the table applies a default action. The banks are refilled by refill
+    seconds every round, up to time_bank.
+
+    A decision can thus never take more than decision_time + time_bank
+    seconds, and a player more than decisions * decision_time + time_bank
+    seconds in a round: see round_bound.
+
+    The clock only measures time, it never sleeps: the owner of the clock
+    checks the deadline (see next_deadline and expired) from its own
+    timer or loop.
+
+    :param float decision_time: seconds of every decision
+    :param float time_bank: seconds of the time bank of a player
+    :param float refill: seconds added to the banks every round
+    :param clock: callable returning a monotonic time in seconds
+    """
+
+    def __init__(
+        self,
+        decision_time: float = 15.,
+        time_bank: float = 30.,
+        refill: float = 5.,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if decision_time <= 0 or time_bank < 0 or refill < 0:
+            raise ValueError("Decision times cannot be negative")
+        self.decision_time = decision_time
+        self.time_bank = time_bank
+        self.refill = refill
+        self.clock = clock
+        self.seats: Dict[Hashable, SeatClock] = {}
+
+    def seat(self, seat: Hashable) -> SeatClock:
+        """
+        :return: the clock of the seat, created with a full bank if needed
+        """
+        seat_clock = self.seats.get(seat)
+        if seat_clock is None:
+            seat_clock = self.seats[seat] = SeatClock(self.time_bank)
+        return seat_clock
+
+    def forget(self, seat: Hashable):
+        self.seats.pop(seat, None)
+
+    # =========================================================================
+    # = Decisions
+    # =========================================================================
+
+    def wait_for(self, seats: Iterable[Hashable]):
+        """
+        Starts the decisions of the seats not awaited yet, and stops the
+        decisions of the other seats
+        :param seats: seats whose decision is awaited
+        """
+        awaited = set(seats)
+        now = self.clock()
+        for seat, seat_clock in self.seats.items():
+            if seat_clock.waiting_since is not None and seat not in awaited:
+                self._stop(seat_clock, now)
+        for seat in awaited:
+            seat_clock = self.seat(seat)
+            if seat_clock.waiting_since is None:
+                seat_clock.waiting_since = now
+
+    def decided(self, seat: Hashable) -> float:
+        """
+        Stops the decision of the seat, the time beyond decision_time being
+        taken from its bank
+        :return: duration of the decision, 0 if it was not awaited
+        """
+        seat_clock = self.seats.get(seat)
+        if seat_clock is None or seat_clock.waiting_since is None:
+            return 0.
+        return self._stop(seat_clock, self.clock())
+
+    def _stop(self, seat_clock: SeatClock, now: float) -> float:
+        elapsed = now - seat_clock.waiting_since
+        seat_clock.waiting_since = None
+        seat_clock.bank = max(
+            0., seat_clock.bank - max(0., elapsed - self.decision_time)
+        )
+        seat_clock.waited += elapsed
+        seat_clock.decisions += 1
+        return elapsed
+
+    def timed_out(self, seat: Hashable):
+        """
+        Stops the decision of a seat which timed out
+        """
+        self.decided(seat)
+        self.seat(seat).timeouts += 1
+
+    def new_round(self):
+        """
+        Refills the time banks
+        """
+        for seat_clock in self.seats.values():
+            seat_clock.bank = min(self.time_bank,
+                                  seat_clock.bank + self.refill)
+
+    # =========================================================================
+    # = Deadlines
+    # =========================================================================
+
+    def deadline(self, seat: Hashable) -> Optional[float]:
+        """
+        :return: time at which the decision of the seat times out, None if
+            it is not awaited
+        """
+        seat_clock = self.seats.get(seat)
+        if seat_clock is None or seat_clock.waiting_since is None:
+            return None
+        return seat_clock.waiting_since + self.decision_time + seat_clock.bank
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        :return: the first deadline of the seats awaited, None if no seat is
+        """
+        deadlines = [
+            seat_clock.waiting_since + self.decision_time + seat_clock.bank
+            for seat_clock in self.seats.values()
+            if seat_clock.waiting_since is not None
+        ]
+        return min(deadlines) if deadlines else None
+
+    def time_left(self, seat: Hashable) -> Optional[float]:
+        """
+        :return: seconds left for the decision of the seat, None if it is
+            not awaited
+        """
+        deadline = self.deadline(seat)
+        if deadline is None:
+            return None
+        return max(0., deadline - self.clock())
+
+    def expired(self) -> List[Hashable]:
+        """
+        :return: the seats whose decision timed out
+        """
+        now = self.clock()
+        return [
+            seat for seat in self.seats
+            if self.deadline(seat) is not None and self.deadline(seat) <= now
+        ]
+
+    # =========================================================================
+    # = Measures
+    # =========================================================================
+
+    def metrics(self) -> Dict[Hashable, Dict[str, float]]:
+        """
+        :return: by seat, the seconds spent waiting for its decisions, the
+            number of decisions and of timeouts, the mean waiting time and
+            the seconds left in the bank
+        """
+        return {seat: seat_clock.metrics()
+                for seat, seat_clock in self.seats.items()}
+
+    def round_bound(self, seats: int, decisions: int = 4) -> float:
+        """
+        Longest time a table can wait for its players in a round: the bets
+        are awaited at the same time, then each seat plays in turn
+        :param int seats: number of players
+        :param int decisions: most decisions of a player during his turn
+        :return: seconds, whatever the players do
+        """
+        bets = self.decision_time + self.time_bank
+        turns = seats * (decisions * self.decision_time + self.time_bank)
+        return bets + turns
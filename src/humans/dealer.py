@@ -1,10 +1,18 @@
-from src.cards.hand import Hand
+from typing import TYPE_CHECKING
+
+from src.cards.hand import Hand, PersistentHand
+from src.cards.transitions import dealer_hits
 from src.common.constants import Decision
 
+if TYPE_CHECKING:
+    from src.humans.hand_pool import HandPool
+
 
 class Dealer:
+    __slots__ = ("hand", "name")
+
     def __init__(self):
-        self.hand = Hand()
+        self.hand = Hand(is_dealer_hand=True)
         self.name = "Hackiflette God"
 
     def choose_action(self, mode=0) -> Decision:
@@ -17,28 +25,37 @@ class Dealer:
             above)
         :return: decision
         """
-        if mode == 0:
-            if self.hand.value < 17:  # Dealer stands on all 17s
-                return Decision.hit
-
-        elif mode == 1:
-            if self.hand.value < 17:  # Dealer hits on soft 17
-                return Decision.hit
-            elif self.hand.value == 17:
-                card_list = self.hand.card_list
-                raw_sum = sum((card.value for card in card_list))
-                if raw_sum != 17:
-                    # if the raw sum (calculated without taking into account
-                    # that an ace can count as 11) is not 17 (then it would
-                    # be 7), we have a soft 17, thus we hit
-                    return Decision.hit
-        else:
+        if mode not in (0, 1):
             raise ValueError("'mode' parameter of class Dealer's "
                              "'chooseAction' method should be 0 or 1")
+        # the rules of both modes are tabulated in transitions.DEALER_HITS
+        if dealer_hits[mode][self.hand.state]:
+            return Decision.hit
         return Decision.stand
 
     def add_card(self, card_to_add):
         self.hand += card_to_add
 
-    def clear_hand(self):
-        self.hand = Hand()
+    def clear_hand(self, pool: 'HandPool' = None):
+        """
+        Gives the dealer an empty hand
+        :param HandPool pool: pool taking back the dealer's hand and giving
+            the new one, plain allocation if None
+        """
+        if pool is None:
+            self.hand = Hand(is_dealer_hand=True)
+            return
+        pool.release_hand(self.hand)
+        self.hand = pool.acquire_hand(is_dealer_hand=True)
+
+    def fork(self) -> 'Dealer':
+        """
+        Copy of the dealer whose hand shares its cards with this one
+        """
+        dealer = Dealer()
+        dealer.name = self.name
+        if isinstance(self.hand, PersistentHand):
+            dealer.hand = self.hand
+        else:
+            dealer.hand = PersistentHand.from_hand(self.hand)
+        return dealer
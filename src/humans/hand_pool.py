@@ -0,0 +1,120 @@
+from typing import List, Tuple
+
+from src.cards.card import Card
+from src.cards.hand import Hand
+from src.common.constants import PlayerHand
+
+
+class HandPool:
+    """
+    Free lists of the Hand and PlayerHand objects of finished rounds.
+
+    Clearing the hands at the start of every round, and splitting, would
+    otherwise allocate new hands and card lists each time. A released hand
+    is reset in place (see Hand.reset), its card list included, and given
+    back by the next acquire. Only plain Hand objects are recycled: a
+    PersistentHand may be shared by forks and is left to the garbage
+    collector.
+
+    A hand must not be used once it was released. Players and dealers
+    release their hands to the pool given to clear_hands, clear_hand and
+    split, which is what RoundEngine does when it is given a pool. A pool is
+    not thread safe, but can be shared by the tables of one thread.
+
+    :param int max_size: number of free objects kept of each kind
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._hands: List[Hand] = []
+        self._player_hands: List[PlayerHand] = []
+        # objects built, and objects given back from the free lists
+        self.created = 0
+        self.reused = 0
+
+    @property
+    def allocations_avoided(self) -> int:
+        return self.reused
+
+    def __len__(self) -> int:
+        """
+        Number of free objects of the pool
+        """
+        return len(self._hands) + len(self._player_hands)
+
+    # =========================================================================
+    # = Hands
+    # =========================================================================
+
+    def acquire_hand(self, is_dealer_hand: bool = False,
+                     is_split: bool = False) -> Hand:
+        """
+        :return: an empty hand
+        """
+        if self._hands:
+            self.reused += 1
+            hand = self._hands.pop()
+            hand.is_dealer_hand = is_dealer_hand
+            hand.is_split = is_split
+            return hand
+        self.created += 1
+        return Hand(is_dealer_hand=is_dealer_hand, isSplit=is_split)
+
+    def release_hand(self, hand: Hand):
+        """
+        Resets the hand and keeps it for a later acquire_hand
+        """
+        if type(hand) is Hand and len(self._hands) < self.max_size:
+            hand.reset()
+            self._hands.append(hand)
+
+    def split_hand(self, hand: Hand) -> Tuple[Hand, Hand]:
+        """
+        Pooled Hand.split: the hand is released and its two cards moved to
+        two split hands of the pool
+        :raise: CardsAPIError if the hand cannot be split
+        """
+        first_card, second_card = hand.split_cards()
+        self.release_hand(hand)
+        return (self._hand_of(first_card, True),
+                self._hand_of(second_card, True))
+
+    def _hand_of(self, card: Card, is_split: bool) -> Hand:
+        hand = self.acquire_hand(is_split=is_split)
+        hand += card
+        return hand
+
+    # =========================================================================
+    # = Player hands
+    # =========================================================================
+
+    def acquire_player_hand(self, hand: Hand = None, hand_bet: int = 0,
+                            is_lock: bool = False) -> PlayerHand:
+        """
+        :param Hand hand: hand of the PlayerHand, an empty hand of the pool
+            if None
+        :return: a PlayerHand
+        """
+        if hand is None:
+            hand = self.acquire_hand()
+        if self._player_hands:
+            self.reused += 1
+            player_hand = self._player_hands.pop()
+            player_hand.hand = hand
+            player_hand.hand_bet = hand_bet
+            player_hand.is_lock = is_lock
+            return player_hand
+        self.created += 1
+        return PlayerHand(hand, hand_bet, is_lock)
+
+    def release_player_hand(self, player_hand: PlayerHand,
+                            with_hand: bool = True):
+        """
+        Keeps the PlayerHand for a later acquire_player_hand
+        :param bool with_hand: also release its hand
+        """
+        if with_hand:
+            self.release_hand(player_hand.hand)
+        if len(self._player_hands) < self.max_size:
+            player_hand.hand = None
+            self._player_hands.append(player_hand)
@@ -1,15 +1,21 @@
 from src.cards.exceptions import CardsAPIError
 import uuid
-from typing import List
+from typing import TYPE_CHECKING, List
 from src.common.constants import PlayerHand
 
+if TYPE_CHECKING:
+    from src.humans.hand_pool import HandPool
+
 
 class Player:
+    __slots__ = ("uuid", "hands", "wallet", "name")
+
     def __init__(self, name, wallet, uid=None):
         self.uuid: uuid.UUID = self.create_uuid(uid)
         # hands are list of Hand, money bet and if the hand is lock
         self.hands: List[PlayerHand] = [PlayerHand()]
-        self.wallet: int = wallet
+        # a black jack pays 3 to 2, an odd bet leaves half a unit
+        self.wallet: float = wallet
         self.name = name
 
     @staticmethod
@@ -84,32 +90,41 @@ class Player:
         else:
             print("<class Player>[double] double bet on Player", self.uuid, "is impossible")
 
-    def split(self, index_of_hand_to_split):
+    def split(self, index_of_hand_to_split, pool: 'HandPool' = None):
         """
         Check if the hand can be split if so it split it
+        :param HandPool pool: pool taking back the split hand and giving
+            the two new ones, plain allocations if None
         """
 
         if self.check_split_is_possible(index_of_hand_to_split):
             # if check is ok cards are good and wallet have enough money
-            splitted_hand = self.hands[index_of_hand_to_split].hand.split()
-            bet_of_the_hand = self.hands[index_of_hand_to_split].hand_bet
+            player_hand = self.hands[index_of_hand_to_split]
+            bet_of_the_hand = player_hand.hand_bet
+            if pool is not None:
+                first, second = pool.split_hand(player_hand.hand)
+                pool.release_player_hand(player_hand, with_hand=False)
+                self.wallet -= bet_of_the_hand
+                index = index_of_hand_to_split
+                self.hands[index:index + 1] = [
+                    pool.acquire_player_hand(first, bet_of_the_hand),
+                    pool.acquire_player_hand(second, bet_of_the_hand),
+                ]
+                return
+            splitted_hand = player_hand.hand.split()
 
             # remove bet of the second hand just created
             self.wallet -= bet_of_the_hand
 
             if len(splitted_hand) == 2:
                 # ---- Creating the new hands ---
-                # 1 - reinitialize hands of the player
-                self.clear_hands()
-                self.hands.pop()
-
-                # 2 - adding first hand with the associated bet
-                self.hands.append(PlayerHand(splitted_hand[0],
-                                             bet_of_the_hand, False))
-
-                # 3 - adding second hand with it associated bet
-                self.hands.append(PlayerHand(splitted_hand[1],
-                                             bet_of_the_hand, False))
+                # the split hand is replaced by the two new ones, each with
+                # the bet of the original hand, the other hands are kept
+                index = index_of_hand_to_split
+                self.hands[index:index + 1] = [
+                    PlayerHand(splitted_hand[0], bet_of_the_hand, False),
+                    PlayerHand(splitted_hand[1], bet_of_the_hand, False),
+                ]
             else:
                 raise CardsAPIError(
                     f"Split does not return exactly two hands for "
@@ -119,8 +134,29 @@ class Player:
     def add_card(self, card_to_add, index_of_the_hand_to_change):
         self.hands[index_of_the_hand_to_change].hand += card_to_add
 
-    def clear_hands(self):
-        self.hands = [PlayerHand()]
+    def clear_hands(self, pool: 'HandPool' = None):
+        """
+        Gives the player one empty hand
+        :param HandPool pool: pool taking back the hands of the player and
+            giving the new one, plain allocations if None
+        """
+        if pool is None:
+            self.hands = [PlayerHand()]
+            return
+        hands = self.hands
+        for player_hand in hands:
+            pool.release_player_hand(player_hand)
+        hands.clear()
+        hands.append(pool.acquire_player_hand())
+
+    def fork(self) -> 'Player':
+        """
+        Copy of the player, with the same uuid, that can play on without
+        changing this one
+        """
+        player = Player(self.name, self.wallet, self.uuid)
+        player.hands = [player_hand.fork() for player_hand in self.hands]
+        return player
 
     def __repr__(self):
         return f"Player(name = {self.name}, uuid = {self.uuid},\n" \
@@ -0,0 +1,207 @@
+import json
+import os
+from typing import Union
+
+import numpy as np
+
+from src.cards.card import Card
+from src.cards.hand import Hand
+from src.common.config import ConfigPath
+from src.common.constants import Decision
+
+# Codes used in the strategy charts, and the decision they stand for when
+# doubling is possible or not
+CHART_CODES = {
+    "H": (Decision.hit, Decision.hit),
+    "S": (Decision.stand, Decision.stand),
+    "D": (Decision.double, Decision.hit),
+    "Ds": (Decision.double, Decision.stand),
+    "P": (Decision.split, Decision.split),
+}
+
+# Compiled tables are indexed by [can double, hand value, soft flag,
+# pair card value (0 if not a pair), dealer upcard value]
+TABLE_SHAPE = (2, 22, 2, 11, 11)
+
+_UPCARDS = {str(value): value for value in range(2, 11)}
+_UPCARDS["A"] = 1
+
+# Decision of every table value
+_decisions = {decision.value: decision for decision in Decision}
+
+
+def _pair_state(pair: int):
+    """
+    :return: (value, soft flag) of a pair of cards of the given value
+    """
+    if pair == 1:
+        return 12, 1
+    return 2 * pair, 0
+
+
+class StrategyTable:
+    """
+    Playing strategy compiled into a dense array of decisions.
+
+    A decision is a single index in the table, for one hand with decision,
+    or for arrays of hands with decisions.
+
+    :param np.ndarray table: int8 array of Decision values of shape
+        TABLE_SHAPE
+    :param str name: name of the strategy
+    """
+
+    def __init__(self, table: np.ndarray, name: str = ""):
+        if table.shape != TABLE_SHAPE:
+            raise ValueError(f"Strategy table should have shape {TABLE_SHAPE}")
+        self.table = table
+        self.name = name
+
+    # =========================================================================
+    # = Loading
+    # =========================================================================
+
+    @classmethod
+    def from_chart(cls, chart: dict) -> 'StrategyTable':
+        """
+        Compiles a strategy chart, see data/config/strategies.
+        Missing hard and soft rows are hit, missing pairs are played like
+        the same hand without splitting.
+        :param dict chart: chart with "upcards", "hard", "soft" and
+            "pairs" rows of codes from CHART_CODES
+        :return: the compiled table
+        """
+        table = np.full(TABLE_SHAPE, Decision.hit.value, dtype=np.int8)
+        upcards = [_UPCARDS[upcard] for upcard in chart["upcards"]]
+
+        def fill(pair, value, soft, codes):
+            if len(codes) != len(upcards):
+                raise ValueError(f"Row {value} of the chart should have "
+                                 f"{len(upcards)} codes")
+            for upcard, code in zip(upcards, codes):
+                if code not in CHART_CODES:
+                    raise ValueError(f"Unknown code {code!r} in the chart")
+                for can_double, decision in enumerate(
+                    reversed(CHART_CODES[code])
+                ):
+                    table[can_double, value, soft, pair, upcard] = (
+                        decision.value
+                    )
+
+        for soft, rows in enumerate((chart["hard"], chart["soft"])):
+            for value, codes in rows.items():
+                # the same hand holding a pair is played the same way
+                for pair in range(11):
+                    fill(pair, int(value), soft, codes)
+        for pair, codes in chart.get("pairs", {}).items():
+            pair = _UPCARDS[pair]
+            fill(pair, *_pair_state(pair), codes)
+
+        return cls(table, chart.get("name", ""))
+
+    @classmethod
+    def load(cls, name: str) -> 'StrategyTable':
+        """
+        Loads and compiles a chart of data/config/strategies
+        :param str name: name of the chart file, without extension
+        :return: the compiled table
+        """
+        path = os.path.join(ConfigPath.folder("strategies"), name + ".json")
+        with open(path, encoding="utf-8") as f:
+            return cls.from_chart(json.load(f))
+
+    @classmethod
+    def from_solution(cls, solution) -> 'StrategyTable':
+        """
+        Compiles the solution of analysis.infinite_deck.solve
+        :param InfiniteDeckStrategy solution: the solved game
+        :return: the compiled table
+        """
+        table = np.empty(TABLE_SHAPE, dtype=np.int8)
+        table[0] = solution.hit_stand[:, :, np.newaxis, :]
+        table[1] = solution.decisions[:, :, np.newaxis, :]
+        for pair in range(1, 11):
+            value, soft = _pair_state(pair)
+            splits = solution.pair_splits[pair]
+            table[:, value, soft, pair, splits] = Decision.split.value
+        return cls(table, "Infinite deck solution")
+
+    # =========================================================================
+    # = Decisions
+    # =========================================================================
+
+    def decision(self, value: int, soft: bool, pair: int, upcard: int,
+                 can_double: bool = True) -> Decision:
+        """
+        :param int value: value of the hand
+        :param bool soft: the hand is soft
+        :param int pair: value of the pair's cards, 0 if the hand is not a
+            pair or if it cannot be split
+        :param int upcard: value of the dealer's upcard, 1 for an ace
+        :param bool can_double: the hand can be doubled
+        :return: decision of the strategy
+        """
+        return _decisions[
+            self.table[int(can_double), value, int(soft), pair, upcard]
+        ]
+
+    def decide(self, hand: Hand, upcard: Union[Card, int],
+               can_double: bool = True, can_split: bool = True) -> Decision:
+        """
+        Decision of the strategy for a Hand
+        :param Hand hand: the player's hand
+        :param upcard: dealer's upcard or its value
+        :param bool can_double: the player's wallet allows doubling
+        :param bool can_split: the player's wallet allows splitting
+        :return: decision of the strategy
+        """
+        if isinstance(upcard, Card):
+            upcard = upcard.value
+        two_cards = len(hand.card_list) == 2
+        pair = 0
+        if two_cards and can_split and hand.checkSplitIsPossible():
+            pair = hand.card_list[0].value
+        return self.decision(hand.value, hand.is_soft, pair, upcard,
+                             two_cards and can_double)
+
+    def decisions(self, values: np.ndarray, softs: np.ndarray,
+                  pairs: np.ndarray, upcards: np.ndarray,
+                  can_double: np.ndarray = True) -> np.ndarray:
+        """
+        Decisions of the strategy for arrays of hands, with the same
+        arguments as decision
+        :return: array of Decision values
+        """
+        return self.table[
+            np.asarray(can_double, dtype=np.intp),
+            values,
+            np.asarray(softs, dtype=np.intp),
+            pairs,
+            upcards,
+        ]
+
+    def policy(self, engine) -> Decision:
+        """
+        Policy for RoundEngine playing the strategy
+        :param RoundEngine engine: engine in its player actions phase
+        :return: decision for the current hand
+        """
+        actions = engine.legal_actions()
+        return self.decide(
+            engine.current_hand.hand,
+            engine.dealer_upcard,
+            Decision.double in actions,
+            Decision.split in actions,
+        )
+
+    @property
+    def batch_table(self) -> np.ndarray:
+        """
+        Table without pairs for simulate.batch.BatchSimulator, indexed by
+        [can double, hand value, soft flag, upcard value].
+
+        The batch simulator cannot split: a pair is played as a hard or soft
+        total, so the game played with this table is not the chart's game
+        whenever the chart splits.
+        """
+        return self.table[:, :, :, 0, :]
@@ -0,0 +1,74 @@
+from src.cards.card import Card
+from src.cards.deck import Deck
+from src.cards.hand import Hand, PersistentHand
+from src.common.constants import Decision
+from src.controller.round_engine import RoundEngine
+from src.humans.dealer import Dealer
+from src.humans.hand_pool import HandPool
+from src.humans.player import Player
+
+
+def test_hand_reset_keeps_card_list():
+    hand = Hand([Card(10), Card(1)])
+    cards = hand.card_list
+    hand.reset()
+    assert hand.card_list is cards and cards == []
+    assert hand.value == 0 and not hand.is_black_jack
+    hand += Card(9)
+    assert hand.value == 9
+
+
+def test_pool_recycles_hands():
+    pool = HandPool()
+    player = Player("Pooled", 100)
+    first = player.hands[0]
+    player.bet(10, 0)
+    player.add_card(Card(8), 0)
+    player.add_card(Card(8, "spades"), 0)
+
+    player.split(0, pool)
+    assert len(player.hands) == 2 and player.wallet == 80
+    assert all(player_hand.hand_bet == 10 for player_hand in player.hands)
+    assert all(player_hand.hand.is_split for player_hand in player.hands)
+    assert [player_hand.hand.value for player_hand in player.hands] == [8, 8]
+    # the split hand's PlayerHand and Hand were given back, then reused
+    assert pool.reused == 2 and pool.created == 2
+
+    split_hands = list(player.hands)
+    player.clear_hands(pool)
+    assert player.hands[0] in split_hands
+    assert player.hands[0].hand.card_list == []
+    assert player.hands[0].hand_bet == 0 and not player.hands[0].is_lock
+    assert first not in player.hands
+
+    dealer = Dealer()
+    dealer.add_card(Card(5))
+    dealer.clear_hand(pool)
+    assert dealer.hand.is_dealer_hand and dealer.hand.value == 0
+
+    # persistent hands may be shared, they are not recycled
+    free = len(pool)
+    pool.release_hand(PersistentHand([Card(3)]))
+    assert len(pool) == free
+
+
+def test_pooled_engine_plays_like_unpooled():
+    def split_policy(engine):
+        if Decision.split in engine.legal_actions():
+            return Decision.split
+        return Decision.hit if engine.current_hand.hand.value < 14 \
+            else Decision.stand
+
+    def play(pool):
+        players = [Player(f"Player {i}", 10 ** 6) for i in range(3)]
+        engine = RoundEngine(Deck(rng=3), players=players,
+                             policy=split_policy, pool=pool)
+        return [
+            [(result.hand_index, result.outcome, result.net)
+             for result in engine.play_round()]
+            for _ in range(300)
+        ]
+
+    pool = HandPool()
+    assert play(pool) == play(None)
+    assert pool.allocations_avoided > 300 * 4
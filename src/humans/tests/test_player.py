@@ -77,3 +77,10 @@ def testDealerDecision():
 
     # dealer hand is at 7 should hit
     assert dealer.choose_action() == Decision.hit
+
+
+def test_seated_player_memory():
+    from src.benchmarks.memory import allocated_bytes, seated_players
+
+    assert not hasattr(Player("Slotted", 10), "__dict__")
+    assert 0 < allocated_bytes(lambda: seated_players(100)) / 100 < 2000
@@ -0,0 +1,160 @@
+import json
+import os
+
+import numpy as np
+
+from src.analysis.infinite_deck import solve
+from src.cards.card import Card
+from src.cards.deck import Deck
+from src.cards.hand import Hand
+from src.common.config import ConfigPath
+from src.common.constants import Decision
+from src.controller.round_engine import RoundEngine
+from src.humans.player import Player
+from src.humans.strategy import CHART_CODES, StrategyTable
+from src.simulate.batch import BatchSimulator
+from src.simulate.runner import run_chunk
+from src.simulate.stats import SimulationStats
+
+
+def hand_of(*ranks):
+    hand = Hand()
+    for rank in ranks:
+        hand += Card(rank)
+    return hand
+
+
+def test_chart_decisions():
+
+    table = StrategyTable.load("basic_s17")
+    assert table.decide(hand_of(10, 6), 10) == Decision.hit
+    assert table.decide(hand_of(10, 3), 2) == Decision.stand
+    assert table.decide(hand_of(6, 5), Card(6)) == Decision.double
+    # doubles fall back to hitting or standing
+    assert table.decide(hand_of(4, 4, 3), 6) == Decision.hit
+    assert table.decide(hand_of(1, 7), 4) == Decision.double
+    assert table.decide(hand_of(1, 7), 4, can_double=False) == Decision.stand
+    # pairs are only split when possible
+    assert table.decide(hand_of(8, 8), 9) == Decision.split
+    assert table.decide(hand_of(8, 8), 9, can_split=False) == Decision.hit
+    assert table.decide(hand_of(1, 1), 1) == Decision.split
+    assert table.decide(hand_of(10, 10), 6) == Decision.stand
+
+
+def test_chart_basic_strategy():
+
+    # cells of the published basic strategy for these rules, no peek
+    # making splits and doubles against a ten or an ace costlier
+    for name in ("basic_s17", "basic_h17"):
+        table = StrategyTable.load(name)
+        assert table.decide(hand_of(3, 3), 8) == Decision.hit
+        assert table.decide(hand_of(7, 7), 8) == Decision.hit
+        assert table.decide(hand_of(8, 8), 10) == Decision.hit
+        assert table.decide(hand_of(7, 7), 7) == Decision.split
+        assert table.decide(hand_of(9, 9), 7) == Decision.stand
+        assert table.decide(hand_of(4, 4), 5) == Decision.split
+        assert table.decide(hand_of(1, 1), 10) == Decision.split
+        assert table.decide(hand_of(10, 10), 6) == Decision.stand
+        assert table.decide(hand_of(5, 5), 9) == Decision.double
+        assert table.decide(hand_of(10, 2), 3) == Decision.hit
+        assert table.decide(hand_of(10, 2), 4) == Decision.stand
+        assert table.decide(hand_of(6, 5), 10) == Decision.hit
+        assert table.decide(hand_of(1, 6), 3) == Decision.double
+
+
+def test_chart_matches_solution():
+
+    folder = ConfigPath.folder("strategies")
+    for mode, name in enumerate(("basic_s17", "basic_h17")):
+        with open(os.path.join(folder, name + ".json"), encoding="utf-8") as f:
+            chart = json.load(f)
+        solution = solve(mode)
+        upcards = [1 if upcard == "A" else int(upcard)
+                   for upcard in chart["upcards"]]
+
+        def expected(value, soft, upcard):
+            return (Decision(solution.decisions[value, soft, upcard]),
+                    Decision(solution.hit_stand[value, soft, upcard]))
+
+        # every hand that can be dealt has its row in the chart
+        rows = [(0, value, chart["hard"][str(value)])
+                for value in range(4, 22)]
+        rows += [(1, value, chart["soft"][str(value)])
+                 for value in range(12, 22)]
+        for soft, value, codes in rows:
+            for upcard, code in zip(upcards, codes):
+                assert CHART_CODES[code] == expected(value, soft, upcard), \
+                    (name, value, soft, upcard)
+        for pair in range(1, 11):
+            codes = chart["pairs"]["A" if pair == 1 else str(pair)]
+            value, soft = (12, 1) if pair == 1 else (2 * pair, 0)
+            for upcard, code in zip(upcards, codes):
+                split = solution.pair_splits[pair, upcard]
+                assert (code == "P") == split, (name, pair, upcard)
+                if not split:
+                    assert CHART_CODES[code] == expected(value, soft, upcard)
+
+
+def test_batch_decisions():
+
+    table = StrategyTable.load("basic_s17")
+    values = np.array([16, 11, 18, 16])
+    softs = np.array([0, 0, 1, 0])
+    pairs = np.array([0, 0, 0, 8])
+    upcards = np.array([10, 6, 4, 9])
+    decisions = table.decisions(values, softs, pairs, upcards,
+                                np.array([1, 0, 0, 1]))
+    assert decisions.tolist() == [
+        Decision.hit.value,
+        Decision.hit.value,
+        Decision.stand.value,
+        Decision.split.value,
+    ]
+
+
+def test_policy():
+
+    table = StrategyTable.load("basic_s17")
+    decided = []
+
+    def policy(engine):
+        decision = table.policy(engine)
+        # only legal actions are taken
+        assert decision in engine.legal_actions()
+        decided.append((engine.current_hand.hand.card_list[:],
+                        engine.dealer_upcard.value, decision))
+        return decision
+
+    players = [Player("Bot1", 10 ** 6), Player("Bot2", 10 ** 6)]
+    engine = RoundEngine(Deck(rng=np.random.default_rng(3)), players=players,
+                         policy=policy)
+    for _ in range(200):
+        engine.play_round()
+    assert len(decided) > 200
+    hands = [(cards, upcard, decision) for cards, upcard, decision in decided
+             if len(cards) == 2]
+    # the chart's decision is played for the hands dealt
+    for cards, upcard, decision in hands:
+        hand = Hand()
+        for card in cards:
+            hand += card
+        assert decision == table.decide(hand, upcard)
+    assert {decision for _, _, decision in hands} >= {
+        Decision.hit, Decision.stand, Decision.double, Decision.split
+    }
+
+    # without splits, the object engine and the batch simulator play the
+    # same game
+    def no_split(engine):
+        actions = engine.legal_actions()
+        return table.decide(engine.current_hand.hand, engine.dealer_upcard,
+                            Decision.double in actions, can_split=False)
+
+    rounds = run_chunk(20000, np.random.SeedSequence(5), policy=no_split)
+    simulator = BatchSimulator(20000, strategy=table.batch_table,
+                               rng=np.random.default_rng(5))
+    stats = SimulationStats()
+    for _ in range(5):
+        simulator.play_rounds(stats)
+    assert abs(rounds.ev - stats.ev) < 0.05
+    assert abs(stats.ev - solve(allow_split=False).ev) < 0.02
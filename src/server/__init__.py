@@ -0,0 +1,6 @@
+from .exceptions import ProtocolError, TableError
+from .table import Table
+from .scheduler import TableScheduler
+from .server import TableServer
+from .client import TableClient
+from .router import Router
@@ -0,0 +1,70 @@
+# ============================================================================
+# = Black jack table server
+# =
+# = Usage: python -m src.server --host 0.0.0.0 --port 8765 [--workers 4]
+# ============================================================================
+
+import argparse
+import asyncio
+
+from src.server.router import Router
+from src.server.server import TableServer
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.server",
+        description="Hosts black jack tables for remote players",
+    )
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address listened to")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="port listened to")
+    parser.add_argument("--decks", type=int, default=6,
+                        help="number of decks in the shoes")
+    parser.add_argument("--h17", action="store_true",
+                        help="the dealer hits on soft 17")
+    parser.add_argument("--minimum-bet", type=int, default=5,
+                        help="smallest bet of the tables")
+    parser.add_argument("--max-seats", type=int, default=7,
+                        help="number of players of a table")
+    parser.add_argument("--decision-time", type=float, default=30.,
+                        help="seconds of every decision, 0 for no limit")
+    parser.add_argument("--time-bank", type=float, default=60.,
+                        help="seconds of the time bank of the players")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="number of worker processes hosting the "
+                             "tables, none to host them in this process")
+    return parser.parse_args(argv)
+
+
+async def serve(args: argparse.Namespace):
+    rules = dict(
+        decks=args.decks,
+        dealer_mode=int(args.h17),
+        minimum_bet=args.minimum_bet,
+        max_seats=args.max_seats,
+        decision_time=args.decision_time or None,
+        time_bank=args.time_bank,
+    )
+    if args.workers:
+        server = Router(args.workers, args.host, args.port, **rules)
+    else:
+        server = TableServer(args.host, args.port, **rules)
+    await server.start()
+    print(f"Serving tables on {server.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
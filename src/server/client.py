@@ -0,0 +1,69 @@
+import asyncio
+import json
+from typing import Callable
+
+from src.server.protocol import Message, encode
+
+
+class TableClient:
+    """
+    Asyncio client of a TableServer
+
+    :param asyncio.StreamReader reader: stream from the server
+    :param asyncio.StreamWriter writer: stream to the server
+    """
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1",
+                      port: int = 8765) -> 'TableClient':
+        reader, writer = await asyncio.open_connection(host, port,
+                                                       limit=1 << 20)
+        return cls(reader, writer)
+
+    async def __aenter__(self) -> 'TableClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def send(self, kind: str, **fields):
+        """
+        Sends a message of the given type, see protocol.py
+        """
+        self.writer.write(encode({"type": kind, **fields}))
+        await self.writer.drain()
+
+    async def receive(self) -> Message:
+        """
+        :return: the next message of the server
+        :raise: ConnectionError if the server closed the connection
+        """
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the server")
+        return json.loads(line)
+
+    async def receive_until(
+        self, predicate: Callable[[Message], bool]
+    ) -> Message:
+        """
+        :return: the first message of the server matching the predicate,
+            the messages before it being dropped
+        """
+        while True:
+            message = await self.receive()
+            if predicate(message):
+                return message
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
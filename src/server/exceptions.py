@@ -0,0 +1,12 @@
+class ProtocolError(Exception):
+    """
+    Message of a client that cannot be understood
+    """
+    pass
+
+
+class TableError(Exception):
+    """
+    Action refused by a table
+    """
+    pass
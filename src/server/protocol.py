@@ -0,0 +1,64 @@
+import json
+from typing import Any, Dict
+
+from src.common.constants import Decision
+from src.server.exceptions import ProtocolError
+
+# ============================================================================
+# = Messages
+# =
+# = Clients and server exchange JSON objects, one per line. Every message has
+# = a "type". The client sends:
+# =     {"type": "join", "table": "main", "name": "Alice", "wallet": 500}
+# =     {"type": "bet", "amount": 10}
+# =     {"type": "hit" | "stand" | "double" | "split"}
+# =     {"type": "leave"}
+# =     {"type": "resume", "table": "main", "session": "..."}
+# =     {"type": "ping"}
+# = Actions may carry the "version" of the table state they answer, and are
+# = refused if the table changed since. The server sends "joined",
+# = "resumed", "left", "state" (see Table.snapshot), "results", "timeout",
+# = "pong" and "error" messages. "joined" gives the session token with which
+# = the player can take his seat back from another connection. "timeout"
+# = names the player out of time and the action applied for him: each
+# = decision gets the "decision_time" of the state, then the player's time
+# = "bank" runs down.
+# ============================================================================
+
+Message = Dict[str, Any]
+
+# Decisions of the players, by message type
+ACTIONS = {decision.name: decision for decision in (
+    Decision.hit, Decision.stand, Decision.double, Decision.split
+)}
+
+CLIENT_MESSAGES = frozenset(
+    ("join", "leave", "resume", "ping", "bet", *ACTIONS)
+)
+
+# Longest line accepted from a client
+MAX_LINE = 4096
+
+
+def encode(message: Message) -> bytes:
+    """
+    :return: the line sent for the message
+    """
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode(line: bytes) -> Message:
+    """
+    :param bytes line: line received from a client
+    :return: the client's message
+    :raise: ProtocolError if the line is not a client message
+    """
+    try:
+        message = json.loads(line)
+    except ValueError:
+        raise ProtocolError("Messages should be JSON objects") from None
+    if not isinstance(message, dict):
+        raise ProtocolError("Messages should be JSON objects")
+    if message.get("type") not in CLIENT_MESSAGES:
+        raise ProtocolError(f"Unknown message type: {message.get('type')!r}")
+    return message
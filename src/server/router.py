@@ -0,0 +1,406 @@
+import asyncio
+import json
+import multiprocessing
+import zlib
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, Dict, List, Optional, Set
+
+from src.server.exceptions import ProtocolError, TableError
+from src.server.protocol import MAX_LINE, Message, decode, encode
+from src.server.worker import run_worker
+
+PING = encode({"type": "ping"})
+PONG = encode({"type": "pong"})
+JOINED = b'{"type":"joined"'
+
+
+class Shard:
+    """
+    Worker process hosting a part of the tables
+
+    :param int index: index of the shard in the router
+    :param process: the worker process, see worker.run_worker
+    :param Connection control: pipe of the worker's commands
+    :param int port: port of the worker's TableServer
+    """
+
+    def __init__(self, index: int, process: BaseProcess,
+                 control: Connection, port: int):
+        self.index = index
+        self.process = process
+        self.control = control
+        self.port = port
+        # a draining shard gets no new table
+        self.draining = False
+        # one command at a time goes through the pipe
+        self.lock = asyncio.Lock()
+
+
+class Session:
+    """
+    Client of the router, pinned to the shard hosting its table: its lines
+    are forwarded to a connection to this shard, and the shard's lines
+    back to the client.
+
+    :param asyncio.StreamReader reader: stream from the client
+    :param asyncio.StreamWriter writer: stream to the client
+    """
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.table_id: Optional[str] = None
+        # session token of the seat, given by the shard's "joined" message
+        self.token: Optional[str] = None
+        self.shard: Optional[Shard] = None
+        self._upstream: Optional[asyncio.StreamWriter] = None
+        self._pump: Optional[asyncio.Task] = None
+        # while the table migrates, the client's lines wait in the backlog
+        self.migrating = False
+        self.backlog: List[bytes] = []
+        self._pong: Optional[asyncio.Future] = None
+
+    def send(self, message: Message):
+        self.writer.write(encode(message))
+
+    async def connect(self, shard: Shard, host: str):
+        """
+        Pins the session to the shard, the previous connection being closed
+        """
+        await self.disconnect()
+        reader, self._upstream = await asyncio.open_connection(
+            host, shard.port, limit=1 << 20
+        )
+        self.shard = shard
+        self._pump = asyncio.get_running_loop().create_task(
+            self._pump_upstream(reader)
+        )
+
+    async def disconnect(self):
+        if self._pump is not None:
+            self._pump.cancel()
+            self._pump = None
+        if self._upstream is not None:
+            self._upstream.close()
+            self._upstream = None
+
+    async def forward(self, line: bytes):
+        if self.migrating:
+            self.backlog.append(line)
+            return
+        self._upstream.write(line)
+        await self._upstream.drain()
+
+    async def sync(self, timeout: float = 5):
+        """
+        Waits until the shard handled every line forwarded so far
+        """
+        self._pong = asyncio.get_running_loop().create_future()
+        self._upstream.write(PING)
+        await asyncio.wait_for(self._pong, timeout)
+
+    async def resume(self, shard: Shard, host: str):
+        """
+        Reconnects to the shard the table migrated to, takes the seat back
+        and forwards the lines received meanwhile
+        """
+        await self.connect(shard, host)
+        if self.token is not None:
+            self._upstream.write(encode({
+                "type": "resume", "table": self.table_id,
+                "session": self.token,
+            }))
+        self.migrating = False
+        backlog, self.backlog = self.backlog, []
+        self._upstream.write(b"".join(backlog))
+        await self._upstream.drain()
+
+    async def _pump_upstream(self, reader: asyncio.StreamReader):
+        while True:
+            try:
+                line = await reader.readline()
+            except (ValueError, ConnectionError):
+                line = b""
+            if not line:
+                break
+            if line == PONG and self._pong is not None \
+                    and not self._pong.done():
+                self._pong.set_result(None)
+                continue
+            if line.startswith(JOINED):
+                self.token = json.loads(line).get("session")
+            self.writer.write(line)
+            try:
+                await self.writer.drain()
+            except ConnectionError:
+                break
+        if not self.migrating:
+            # the shard closed the connection
+            self.writer.close()
+
+
+class Router:
+    """
+    Front-end spreading the tables over worker processes, each running a
+    TableServer on a loopback port (see worker.run_worker).
+
+    A client speaks to the router as to a TableServer. Its session is pinned
+    to the shard of the table it joins, chosen by a hash of the table's name
+    the first time the table is seen, and the lines are then forwarded
+    between the client and the shard.
+
+    A table can be migrated to another shard: its sessions hold their
+    lines, the table is exported with its round in progress, adopted by the
+    other shard, and the sessions resume their seats there. Draining a
+    shard migrates all its tables away.
+
+    :param int workers: number of worker processes
+    :param str host: address listened to
+    :param int port: port listened to, any free port if 0
+    :param str worker_host: address of the workers' servers
+    :param rules: keyword arguments of the workers' TableScheduler
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        worker_host: str = "127.0.0.1",
+        **rules
+    ):
+        if workers < 1:
+            raise ValueError("A router needs at least one worker")
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.worker_host = worker_host
+        self.rules = rules
+        self.shards: List[Shard] = []
+        # shard index of every table seen
+        self.assignments: Dict[str, int] = {}
+        self.sessions: Set[Session] = set()
+        # tables migrating, set once they can be joined again
+        self._migrations: Dict[str, asyncio.Event] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def __aenter__(self) -> 'Router':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")
+        for index in range(self.workers):
+            control, child_control = context.Pipe()
+            process = context.Process(
+                target=run_worker,
+                args=(child_control, self.worker_host),
+                kwargs=self.rules,
+                name=f"TableWorker-{index}",
+                daemon=True,
+            )
+            process.start()
+            self.shards.append(Shard(index, process, control, 0))
+        for shard in self.shards:
+            shard.port = await loop.run_in_executor(None, shard.control.recv)
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port, limit=MAX_LINE
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for session in list(self.sessions):
+            await session.disconnect()
+            session.writer.close()
+        loop = asyncio.get_running_loop()
+        for shard in self.shards:
+            await self.command(shard, "stop")
+            await loop.run_in_executor(None, shard.process.join)
+        self.shards = []
+
+    async def command(self, shard: Shard, *command) -> Any:
+        """
+        Sends a command to the worker of the shard, see
+        worker.handle_command
+        :return: the result of the command
+        :raise: TableError if the command failed
+        """
+        loop = asyncio.get_running_loop()
+        async with shard.lock:
+            await loop.run_in_executor(None, shard.control.send, command)
+            status, result = await loop.run_in_executor(
+                None, shard.control.recv
+            )
+        if status == "error":
+            raise TableError(result)
+        return result
+
+    # =========================================================================
+    # = Routing
+    # =========================================================================
+
+    def shard_of(self, table_id: str) -> Shard:
+        """
+        :return: the shard hosting the table, chosen among the shards not
+            draining if the table is new
+        """
+        index = self.assignments.get(table_id)
+        if index is None:
+            active = [shard for shard in self.shards if not shard.draining]
+            if not active:
+                raise TableError("Every shard is draining")
+            shard = active[zlib.crc32(table_id.encode()) % len(active)]
+            index = self.assignments[table_id] = shard.index
+        return self.shards[index]
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        session = Session(reader, writer)
+        self.sessions.add(session)
+        try:
+            while not writer.is_closing():
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                try:
+                    await self._route(session, line)
+                except (ProtocolError, TableError) as error:
+                    session.send({"type": "error", "message": str(error)})
+        finally:
+            self.sessions.discard(session)
+            await session.disconnect()
+            writer.close()
+
+    async def _route(self, session: Session, line: bytes):
+        message = decode(line)
+        kind = message["type"]
+        if kind in ("join", "resume") and session.table_id is None:
+            table_id = message.get("table")
+            if not isinstance(table_id, str):
+                raise ProtocolError("Joining needs a table")
+            # drain sees the table of the session from now on
+            session.table_id = table_id
+            session.token = message.get("session")
+            try:
+                while True:
+                    migration = self._migrations.get(table_id)
+                    if migration is not None:
+                        await migration.wait()
+                    shard = self.shard_of(table_id)
+                    if session.shard is shard:
+                        break
+                    # the table may move while connecting, hence the loop
+                    await session.connect(shard, self.worker_host)
+            except TableError:
+                session.table_id = session.token = None
+                raise
+        elif session.shard is None:
+            if kind == "ping":
+                session.writer.write(PONG)
+                return
+            raise TableError("Join a table first")
+        await session.forward(line)
+        if kind == "leave":
+            session.table_id = None
+            session.token = None
+
+    # =========================================================================
+    # = Migration
+    # =========================================================================
+
+    async def migrate(self, table_id: str, target: int):
+        """
+        Moves a table, with its round in progress, to another shard. The
+        clients seated at the table keep playing once it was moved.
+        :param str table_id: name of the table
+        :param int target: index of the shard receiving the table
+        """
+        source = self.shard_of(table_id)
+        shard = self.shards[target]
+        if source is shard:
+            return
+        done = self._migrations[table_id] = asyncio.Event()
+        sessions = [
+            session for session in self.sessions
+            if session.table_id == table_id and session.shard is source
+        ]
+        data = None
+        moved = False
+        try:
+            for session in sessions:
+                session.migrating = True
+            # every action forwarded is applied before the export
+            await asyncio.gather(*(session.sync() for session in sessions))
+            try:
+                data = await self.command(source, "export", table_id)
+            except TableError:
+                # the table closed, it will be created on the new shard
+                pass
+            if data is not None:
+                await self.command(shard, "import", data)
+            self.assignments[table_id] = target
+            moved = True
+            for session in sessions:
+                await session.resume(shard, self.worker_host)
+        finally:
+            if not moved and data is not None:
+                # the target did not adopt the table, the source takes it
+                # back with its players' wallets and hands
+                await self.command(source, "import", data)
+            home = shard if moved else source
+            for session in sessions:
+                if session.migrating:
+                    await session.resume(home, self.worker_host)
+            del self._migrations[table_id]
+            done.set()
+
+    async def drain(self, index: int) -> List[str]:
+        """
+        Migrates every table of the shard to the other shards, which get
+        the new tables from now on
+        :param int index: index of the shard
+        :return: names of the tables migrated
+        """
+        shard = self.shards[index]
+        shard.draining = True
+        tables = list(await self.command(shard, "tables"))
+        # the tables joined while the list was made are moved too
+        for session in self.sessions:
+            table_id = session.table_id
+            if self.assignments.get(table_id) == index \
+                    and table_id not in tables:
+                tables.append(table_id)
+        for table_id, shard_index in list(self.assignments.items()):
+            if shard_index == index and table_id not in tables:
+                # routed again when it is joined
+                del self.assignments[table_id]
+        for table_id in tables:
+            self.assignments.pop(table_id, None)
+            target = self.shard_of(table_id)
+            self.assignments[table_id] = index
+            await self.migrate(table_id, target.index)
+        return tables
+
+    def undrain(self, index: int):
+        """
+        The shard gets new tables again
+        """
+        self.shards[index].draining = False
@@ -0,0 +1,275 @@
+import asyncio
+import pickle
+import time
+import traceback
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from src.cards.deck import Deck
+from src.common.rng import RandomSource, make_rng
+from src.controller.time_bank import DecisionClock
+from src.humans.hand_pool import HandPool
+from src.server.exceptions import TableError
+from src.server.table import Table
+
+# Operation queued for the worker: submission time, callable and arguments
+Operation = Tuple[float, Callable, tuple]
+
+
+class TableScheduler:
+    """
+    Runs thousands of tables in one event loop.
+
+    The tables have no task of their own. The operations on them (actions
+    of the players, seats, departures) are queued by submit and run by a
+    single worker task. The worker sleeps while the queue is empty, so an
+    idle table only costs its memory, and it runs every operation queued
+    when it wakes up in one batch. After every batch the on_batch_end
+    callbacks are called; the server writes then the messages of each
+    client at once, rather than once per message.
+
+    All the tables of a scheduler live in the loop's thread: they share
+    one HandPool and the random generator of their decks.
+
+    The players have decision_time seconds per decision plus a time bank
+    (see DecisionClock). Every table with players awaited has one timer of
+    the event loop, moved at each new deadline, which submits its expire
+    once the deadline is reached: the tables still never sleep.
+
+    :param int decks: number of decks of the shoes
+    :param float penetration: penetration of the shoes
+    :param int dealer_mode: mode given to Dealer.choose_action
+    :param int minimum_bet: smallest bet of the tables
+    :param int max_seats: number of players of a table
+    :param rng: random generator of the decks, or its seed
+    :param float decision_time: seconds of every decision, no time limit if
+        None
+    :param float time_bank: seconds of the time bank of the players
+    :param float refill: seconds added to the banks every round
+    :param int history: number of latencies kept for the percentiles
+    """
+
+    def __init__(
+        self,
+        decks: int = 6,
+        penetration: float = 0.75,
+        dealer_mode: int = 0,
+        minimum_bet: int = 5,
+        max_seats: int = 7,
+        rng: RandomSource = None,
+        decision_time: Optional[float] = 30.,
+        time_bank: float = 60.,
+        refill: float = 10.,
+        history: int = 100000,
+    ):
+        self.decks = decks
+        self.penetration = penetration
+        self.dealer_mode = dealer_mode
+        self.minimum_bet = minimum_bet
+        self.max_seats = max_seats
+        self.rng = make_rng(rng)
+        self.decision_time = decision_time
+        self.time_bank = time_bank
+        self.refill = refill
+        self.pool = HandPool()
+        self.tables: Dict[str, Table] = {}
+        self.on_batch_end: List[Callable[[], None]] = []
+
+        self._queue: Deque[Operation] = deque()
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # timers of the deadlines, by table
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        # time between the submission and the end of the operations
+        self.latencies: Deque[float] = deque(maxlen=history)
+        self.operations = 0
+        self.batches = 0
+
+    # =========================================================================
+    # = Tables
+    # =========================================================================
+
+    def table(self, table_id: str) -> Table:
+        """
+        :return: the table of that name, created if needed
+        """
+        table = self.tables.get(table_id)
+        if table is None:
+            table = Table(
+                table_id,
+                Deck(decks=self.decks, penetration=self.penetration,
+                     rng=self.rng),
+                dealer_mode=self.dealer_mode,
+                minimum_bet=self.minimum_bet,
+                max_seats=self.max_seats,
+                pool=self.pool,
+                clock=self._make_clock(),
+            )
+            table.on_deadline = self._arm
+            self.tables[table_id] = table
+        return table
+
+    def _make_clock(self) -> Optional[DecisionClock]:
+        if self.decision_time is None:
+            return None
+        return DecisionClock(self.decision_time, self.time_bank, self.refill)
+
+    def remove(self, table_id: str):
+        self.tables.pop(table_id, None)
+        self._disarm(table_id)
+
+    def export(self, table_id: str) -> bytes:
+        """
+        Removes the table from the scheduler, to be adopted by the scheduler
+        of another process. Its round goes on where it stopped: the players
+        keep their wallets and hands, the deck its cards.
+        :return: the pickled table
+        :raise: TableError if there is no such table
+        """
+        if table_id not in self.tables:
+            raise TableError(f"No table {table_id}")
+        table = self.tables.pop(table_id)
+        self._disarm(table_id)
+        table.engine.pool = None
+        return pickle.dumps(table)
+
+    def adopt(self, data: bytes) -> Table:
+        """
+        Runs a table exported by another scheduler. Its data must come from
+        a trusted process, as it is unpickled.
+        :return: the table
+        :raise: TableError if the scheduler already has a table of that name
+        """
+        table = pickle.loads(data)
+        if table.table_id in self.tables:
+            raise TableError(f"Table {table.table_id} already exists")
+        table.engine.pool = self.pool
+        table.engine.deck.rng = self.rng
+        self.tables[table.table_id] = table
+        # the decisions awaited keep their deadlines, monotonic clocks being
+        # shared by the processes of a host
+        table.on_deadline = self._arm
+        table.update_deadline()
+        return table
+
+    # =========================================================================
+    # = Deadlines
+    # =========================================================================
+
+    def _arm(self, table: Table):
+        """
+        Moves the timer of the table to its deadline
+        """
+        self._disarm(table.table_id)
+        if table.deadline is None or self._loop is None:
+            return
+        delay = table.deadline - table.clock.clock()
+        self._timers[table.table_id] = self._loop.call_later(
+            delay, self.submit, self._expire, table.table_id
+        )
+
+    def _disarm(self, table_id: str):
+        timer = self._timers.pop(table_id, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _expire(self, table_id: str):
+        table = self.tables.get(table_id)
+        if table is None:
+            return
+        if not table.expire():
+            # woken up a little early
+            self._arm(table)
+
+    def wait_metrics(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        :return: by table, the time spent waiting for each player, see
+            Table.wait_metrics
+        """
+        return {table_id: table.wait_metrics()
+                for table_id, table in self.tables.items()}
+
+    # =========================================================================
+    # = Worker
+    # =========================================================================
+
+    def start(self):
+        """
+        Starts the worker in the running event loop
+        """
+        if self._worker is None:
+            self._loop = asyncio.get_running_loop()
+            self._worker = self._loop.create_task(
+                self._run(), name="TableScheduler"
+            )
+            for table in self.tables.values():
+                self._arm(table)
+
+    async def close(self):
+        """
+        Stops the worker and the timers, then runs the operations still
+        queued: their deadlines arm no timer anymore
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for table_id in list(self._timers):
+            self._disarm(table_id)
+        self._loop = None
+        self.run_pending()
+
+    def submit(self, operation: Callable, *args):
+        """
+        Queues a call of the operation, run by the worker in the next batch.
+        Errors of the operation are printed, they never stop the worker.
+        """
+        self._queue.append((time.perf_counter(), operation, args))
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            self.run_pending()
+
+    def run_pending(self):
+        """
+        Runs the operations queued so far as one batch
+        """
+        queue = self._queue
+        if not queue:
+            return
+        latencies = self.latencies
+        # operations submitted by this batch wait for the next one
+        count = len(queue)
+        for _ in range(count):
+            submitted, operation, args = queue.popleft()
+            try:
+                operation(*args)
+            except Exception:
+                traceback.print_exc()
+            latencies.append(time.perf_counter() - submitted)
+        self.operations += count
+        self.batches += 1
+        for callback in self.on_batch_end:
+            callback()
+
+    # =========================================================================
+    # = Measures
+    # =========================================================================
+
+    def latency(self, percentile: float) -> float:
+        """
+        :param float percentile: between 0 and 100
+        :return: latency of the operations in seconds, 0 if there was none
+        """
+        if not self.latencies:
+            return 0.
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
@@ -0,0 +1,288 @@
+import asyncio
+import math
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from src.humans.player import Player
+from src.server.exceptions import ProtocolError, TableError
+from src.server.protocol import MAX_LINE, Message, decode, encode
+from src.server.scheduler import TableScheduler
+from src.server.table import Table
+
+
+class Connection:
+    """
+    Client connected to the server, seated at one table at most.
+
+    The messages sent to the client are buffered, and written at once by
+    flush at the end of the scheduler's batch.
+
+    :param asyncio.StreamWriter writer: stream to the client
+    :param int max_buffer: bytes waiting to be sent above which the client
+        is considered too slow and disconnected
+    :param list dirty: connections with buffered messages, this one being
+        added when it gets its first message
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, max_buffer: int,
+                 dirty: List['Connection']):
+        self.writer = writer
+        self.max_buffer = max_buffer
+        self.table: Optional[Table] = None
+        self.player: Optional[Player] = None
+        self._dirty = dirty
+        self._lines: List[bytes] = []
+
+    def send(self, message: Message):
+        self.send_line(encode(message))
+
+    def send_line(self, line: bytes):
+        """
+        Queues an encoded message without waiting for the client to read
+        it, so that a table never waits for a slow client
+        """
+        if not self._lines:
+            self._dirty.append(self)
+        self._lines.append(line)
+
+    def flush(self):
+        lines = self._lines
+        self._lines = []
+        if self.writer.is_closing():
+            return
+        self.writer.write(b"".join(lines))
+        if self.writer.transport.get_write_buffer_size() > self.max_buffer:
+            self.writer.close()
+
+
+class TableServer:
+    """
+    Asyncio TCP server hosting tables, created when a first client joins
+    them. The clients speak the JSON lines protocol of protocol.py.
+
+    Every client has its own reading task, which submits the client's
+    messages to the TableScheduler running all the tables. A client that
+    does not play or does not read thus only holds up the rounds of its own
+    table.
+
+    :param str host: address listened to
+    :param int port: port listened to, any free port if 0
+    :param TableScheduler scheduler: scheduler of the tables, a new one
+        built with the rules keyword arguments if None
+    :param int max_buffer: see Connection
+    :param rules: keyword arguments of TableScheduler
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        scheduler: TableScheduler = None,
+        max_buffer: int = 1 << 20,
+        **rules
+    ):
+        self.host = host
+        self.port = port
+        self.scheduler = (
+            scheduler if scheduler is not None else TableScheduler(**rules)
+        )
+        self.scheduler.on_batch_end.append(self._flush)
+        self.max_buffer = max_buffer
+        # connections with messages to write
+        self._dirty: List[Connection] = []
+        # connections of the seated players
+        self._bound: Dict[UUID, Connection] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def tables(self) -> Dict[str, Table]:
+        return self.scheduler.tables
+
+    async def __aenter__(self) -> 'TableServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        self.scheduler.start()
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port, limit=MAX_LINE
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.scheduler.close()
+
+    # =========================================================================
+    # = Clients
+    # =========================================================================
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        connection = Connection(writer, self.max_buffer, self._dirty)
+        try:
+            while not writer.is_closing():
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    # line over MAX_LINE, or connection reset
+                    break
+                if not line:
+                    break
+                try:
+                    message = decode(line)
+                except ProtocolError as error:
+                    connection.send({"type": "error", "message": str(error)})
+                    connection.flush()
+                else:
+                    self.scheduler.submit(self._dispatch, connection, message)
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    break
+        finally:
+            self.scheduler.submit(self._leave, connection)
+            self.scheduler.submit(writer.close)
+
+    def _flush(self):
+        """
+        Writes the messages buffered during the scheduler's batch
+        """
+        dirty = self._dirty
+        for connection in dirty:
+            connection.flush()
+        dirty.clear()
+
+    def _dispatch(self, connection: Connection, message: Message):
+        try:
+            self._apply(connection, message)
+        except (ProtocolError, TableError) as error:
+            connection.send({"type": "error", "message": str(error)})
+
+    def _apply(self, connection: Connection, message: Message):
+        kind = message["type"]
+        if kind == "ping":
+            connection.send({"type": "pong"})
+        elif kind == "join":
+            self._join(connection, message)
+        elif kind == "resume":
+            self._resume(connection, message)
+        elif connection.player is None:
+            raise TableError("Join a table first")
+        elif kind == "leave":
+            self._leave(connection)
+            connection.send({"type": "left"})
+        else:
+            connection.table.act(connection.player, kind,
+                                 message.get("amount"),
+                                 message.get("version"))
+
+    def _join(self, connection: Connection, message: Message):
+        if connection.player is not None:
+            raise TableError("Already seated at a table")
+        table_id = message.get("table")
+        name = message.get("name")
+        wallet = message.get("wallet", 500)
+        if not isinstance(table_id, str) or not isinstance(name, str):
+            raise ProtocolError("Joining needs a table and a name")
+        if not isinstance(wallet, (int, float)) or isinstance(wallet, bool) \
+                or not 0 <= wallet < math.inf:
+            raise ProtocolError("The wallet should be a positive number")
+
+        table = self.scheduler.table(table_id)
+        try:
+            player = table.seat(name, wallet)
+        except TableError:
+            if not table.players:
+                self.scheduler.remove(table_id)
+            raise
+        connection.send({
+            "type": "joined",
+            "table": table_id,
+            "player": str(player.uuid),
+            "session": table.open_session(player),
+        })
+        self._bind(connection, table, player)
+
+    def _resume(self, connection: Connection, message: Message):
+        """
+        Seats the connection in place of the one that opened the session
+        """
+        if connection.player is not None:
+            raise TableError("Already seated at a table")
+        table = self.tables.get(message.get("table"))
+        if table is None:
+            raise TableError(f"No table {message.get('table')!r}")
+        player = table.session_player(message.get("session"))
+        if player.uuid in self._bound:
+            raise TableError("The session is already connected")
+        connection.send({
+            "type": "resumed",
+            "table": table.table_id,
+            "player": str(player.uuid),
+        })
+        self._bind(connection, table, player)
+
+    def _bind(self, connection: Connection, table: Table, player: Player):
+        connection.table = table
+        connection.player = player
+        self._bound[player.uuid] = connection
+        # the player receives every state from his seat on
+        connection.send(table.snapshot())
+        table.subscribe(connection.send_line)
+
+    def _unbind(self, connection: Connection):
+        connection.table.unsubscribe(connection.send_line)
+        del self._bound[connection.player.uuid]
+        connection.table = None
+        connection.player = None
+
+    def _leave(self, connection: Connection):
+        table = connection.table
+        if table is None:
+            return
+        player = connection.player
+        self._unbind(connection)
+        table.leave(player)
+        if not table.players:
+            self.scheduler.remove(table.table_id)
+
+    # =========================================================================
+    # = Migration
+    # =========================================================================
+
+    def export_table(self, table_id: str) -> bytes:
+        """
+        Removes a table and closes the connections of its players, without
+        them leaving: their seats can be resumed where the table is adopted,
+        see TableScheduler.export
+        :return: the exported table
+        """
+        # the actions already received are applied first
+        self.scheduler.run_pending()
+        table = self.tables.get(table_id)
+        if table is None:
+            raise TableError(f"No table {table_id}")
+        for connection in list(self._bound.values()):
+            if connection.table is table:
+                self._unbind(connection)
+                connection.flush()
+                connection.writer.close()
+        return self.scheduler.export(table_id)
+
+    def import_table(self, data: bytes) -> Table:
+        """
+        Hosts a table exported by another server
+        """
+        return self.scheduler.adopt(data)
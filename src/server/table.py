@@ -0,0 +1,426 @@
+import secrets
+from typing import Callable, Dict, List, Optional, Set
+from uuid import UUID
+
+from src.cards.deck import Deck
+from src.common.constants import Decision, Phase
+from src.controller.round_engine import RoundEngine
+from src.controller.settlement import HandResult
+from src.controller.time_bank import DecisionClock
+from src.humans.hand_pool import HandPool
+from src.humans.player import Player
+from src.server.exceptions import TableError
+from src.server.protocol import ACTIONS, Message, encode
+
+# Callable receiving the messages of a table, encoded as protocol lines
+Listener = Callable[[bytes], None]
+
+
+class Table:
+    """
+    Table of a server, whose rounds are played by a RoundEngine driven by
+    the actions of remote players.
+
+    Every method runs to completion without waiting: an action is applied,
+    the round moves on as far as it can without another action, and the
+    new state is sent to the listeners. A table thus never blocks the other
+    tables of the event loop it belongs to.
+
+    The bets of a round are closed once every seated player bet or sat the
+    round out (by standing while betting). After the settlement the next
+    round starts at once if players are still seated.
+
+    With a DecisionClock the players have limited time for their bets and
+    decisions. The table does not sleep until the deadline: its owner is
+    told of every new deadline by on_deadline and calls expire once it is
+    reached, which applies the default actions of the players out of time.
+
+    :param str table_id: name of the table
+    :param Deck deck: shoe of the table, a new 6 decks shoe if None
+    :param int dealer_mode: mode given to Dealer.choose_action
+    :param int minimum_bet: smallest bet accepted
+    :param int max_seats: number of players the table can seat
+    :param HandPool pool: pool recycling the hands, see RoundEngine
+    :param DecisionClock clock: time given to the players, no limit if None
+    """
+
+    def __init__(
+        self,
+        table_id: str,
+        deck: Deck = None,
+        dealer_mode: int = 0,
+        minimum_bet: int = 5,
+        max_seats: int = 7,
+        pool: HandPool = None,
+        clock: DecisionClock = None,
+    ):
+        self.table_id = table_id
+        self.max_seats = max_seats
+        self.engine = RoundEngine(
+            deck if deck is not None else Deck(),
+            players=[],
+            dealer_mode=dealer_mode,
+            minimum_bet=minimum_bet,
+            pool=pool,
+        )
+        self.listeners: List[Listener] = []
+        # players who bet or sat out this round, and players who left
+        # during a round and are removed once it is settled
+        self.ready: Set[UUID] = set()
+        self.leaving: Set[UUID] = set()
+        # ids of the players in the messages
+        self.player_ids: Dict[UUID, str] = {}
+        # players by session token, see open_session
+        self.sessions: Dict[str, UUID] = {}
+        self.round = 0
+        # incremented at every change of the state
+        self.version = 0
+        # number of actions applied
+        self.actions = 0
+        self.clock = clock
+        # first deadline of the players awaited, and callable taking the
+        # table, called whenever it changes
+        self.deadline: Optional[float] = None
+        self.on_deadline: Optional[Callable[['Table'], None]] = None
+
+    @property
+    def players(self) -> List[Player]:
+        return self.engine.players
+
+    @property
+    def phase(self) -> Phase:
+        return self.engine.phase
+
+    def __getstate__(self):
+        # the listeners belong to the process of the table
+        state = self.__dict__.copy()
+        state["listeners"] = []
+        state["on_deadline"] = None
+        state["deadline"] = None
+        return state
+
+    def player(self, player_id: UUID) -> Player:
+        for player in self.players:
+            if player.uuid == player_id:
+                return player
+        raise TableError(f"No player {player_id} at table {self.table_id}")
+
+    # =========================================================================
+    # = Listeners
+    # =========================================================================
+
+    def subscribe(self, listener: Listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def broadcast(self, message: Message):
+        """
+        Sends the message to every listener, encoded once for all
+        """
+        if not self.listeners:
+            return
+        line = encode(message)
+        for listener in list(self.listeners):
+            listener(line)
+
+    # =========================================================================
+    # = Seats
+    # =========================================================================
+
+    def seat(self, name: str, wallet: float, uid: UUID = None) -> Player:
+        """
+        Seats a new player. He plays from the next betting phase, or from
+        the current one if the bets are open.
+        :raise: TableError if the table is full
+        """
+        if len(self.players) - len(self.leaving) >= self.max_seats:
+            raise TableError(f"Table {self.table_id} is full")
+        player = Player(name, wallet, uid)
+        self.players.append(player)
+        self.player_ids[player.uuid] = str(player.uuid)
+        if self.phase == Phase.finished:
+            self._start_round()
+        self._advance()
+        return player
+
+    def open_session(self, player: Player) -> str:
+        """
+        :return: a secret token with which the player can take his seat
+            back from another connection, see session_player
+        """
+        token = secrets.token_hex(16)
+        self.sessions[token] = player.uuid
+        return token
+
+    def session_player(self, token: str) -> Player:
+        """
+        :return: the player of the session
+        :raise: TableError if the session is unknown
+        """
+        if token not in self.sessions:
+            raise TableError(f"No such session at table {self.table_id}")
+        return self.player(self.sessions[token])
+
+    def leave(self, player: Player):
+        """
+        Removes the player. A player playing the current round is removed
+        once it is settled, his remaining hands standing.
+        """
+        if player.uuid in self.leaving or player not in self.players:
+            return
+        if player in self.engine.seated and self.phase != Phase.betting:
+            self.leaving.add(player.uuid)
+        else:
+            self._remove(player)
+        self._advance()
+
+    # =========================================================================
+    # = Actions
+    # =========================================================================
+
+    def act(self, player: Player, action: str, amount: int = None,
+            version: int = None):
+        """
+        Applies the action of a player
+        :param Player player: player seated at the table
+        :param str action: "bet" or one of protocol.ACTIONS
+        :param int amount: amount of a bet
+        :param int version: version of the state the action answers, the
+            action being refused if the table changed since
+        :raise: TableError if the action is not possible
+        """
+        if version is not None and version != self.version:
+            raise TableError(f"Stale action, the table is at version "
+                             f"{self.version}")
+        if player.uuid in self.leaving:
+            raise TableError(f"{player} left the table")
+
+        if self.phase == Phase.betting:
+            self._bet(player, action, amount)
+        elif self.phase == Phase.player_actions:
+            if player is not self.engine.current_player:
+                raise TableError(f"It is not the turn of {player}")
+            decision = ACTIONS.get(action)
+            if decision not in self.engine.legal_actions():
+                raise TableError(f"{action} is not possible now")
+            self.engine.apply(decision)
+        else:
+            raise TableError(f"No action possible during the "
+                             f"{self.phase.name} phase")
+        if self.clock is not None:
+            self.clock.decided(player.uuid)
+        self.actions += 1
+        self._advance()
+
+    def expire(self) -> List[Player]:
+        """
+        Applies the default action of the players out of time: the minimum
+        bet while betting, or sitting the round out if their wallet is too
+        short, and standing during their turn
+        :return: the players who timed out
+        """
+        timed_out = []
+        if self.clock is None:
+            return timed_out
+        expired = self.clock.expired()
+        while expired:
+            player = self.player(expired[0])
+            minimum_bet = self.engine.minimum_bet
+            if self.phase == Phase.betting and player.wallet >= minimum_bet:
+                action = "bet"
+            else:
+                action = Decision.stand.name
+            self.clock.timed_out(player.uuid)
+            self.broadcast({
+                "type": "timeout",
+                "table": self.table_id,
+                "player": self.player_ids[player.uuid],
+                "action": action,
+            })
+            self.act(player, action, minimum_bet)
+            timed_out.append(player)
+            expired = self.clock.expired()
+        return timed_out
+
+    def _bet(self, player: Player, action: str, amount: Optional[int]):
+        if player.uuid in self.ready:
+            raise TableError(f"{player} already bet this round")
+        if action == "bet":
+            if not isinstance(amount, int) or isinstance(amount, bool):
+                raise TableError("A bet needs an integer amount")
+            if amount < self.engine.minimum_bet:
+                raise TableError(
+                    f"Minimum bet is {self.engine.minimum_bet}"
+                )
+            if amount > player.wallet:
+                raise TableError(f"{player} cannot bet {amount}")
+            self.engine.place_bet(player, amount)
+        elif action != Decision.stand.name:
+            raise TableError(f"{action} is not possible while betting")
+        # standing while betting sits the round out
+        self.ready.add(player.uuid)
+
+    # =========================================================================
+    # = Rounds
+    # =========================================================================
+
+    def _remove(self, player: Player):
+        self.players.remove(player)
+        self.ready.discard(player.uuid)
+        del self.player_ids[player.uuid]
+        if self.clock is not None:
+            self.clock.forget(player.uuid)
+        for token, uid in list(self.sessions.items()):
+            if uid == player.uuid:
+                del self.sessions[token]
+
+    def _start_round(self):
+        self.engine.start_round()
+        self.ready = set()
+        self.round += 1
+        if self.clock is not None:
+            self.clock.new_round()
+
+    def _advance(self):
+        """
+        Moves the round on as long as no player has to act, then sends the
+        new state
+        """
+        engine = self.engine
+        if engine.phase == Phase.betting and self.players and all(
+            player.uuid in self.ready for player in self.players
+        ):
+            engine.deal()
+
+        while engine.phase == Phase.player_actions and (
+            engine.current_player.uuid in self.leaving
+        ):
+            engine.apply(Decision.stand)
+
+        if engine.phase == Phase.dealer_play:
+            engine.play_dealer()
+            self._publish_results(engine.settle())
+            for player in list(self.players):
+                if player.uuid in self.leaving:
+                    self._remove(player)
+            self.leaving.clear()
+            if self.players:
+                self._start_round()
+
+        self.version += 1
+        self.update_deadline()
+        self.broadcast(self.snapshot())
+
+    def update_deadline(self):
+        """
+        Starts the decision time of the players awaited, and calls
+        on_deadline if the first deadline changed
+        """
+        if self.clock is None:
+            return
+        engine = self.engine
+        if engine.phase == Phase.betting:
+            awaited = [player.uuid for player in self.players
+                       if player.uuid not in self.ready]
+        elif engine.phase == Phase.player_actions:
+            awaited = [engine.current_player.uuid]
+        else:
+            awaited = []
+        self.clock.wait_for(awaited)
+        deadline = self.clock.next_deadline()
+        if deadline != self.deadline:
+            self.deadline = deadline
+            if self.on_deadline is not None:
+                self.on_deadline(self)
+
+    def _publish_results(self, results: List[HandResult]):
+        self.broadcast({
+            "type": "results",
+            "table": self.table_id,
+            "round": self.round,
+            "dealer": [card.code for card in self.engine.dealer.hand.card_list],
+            "results": [
+                {
+                    "player": self.player_ids[result.player.uuid],
+                    "hand": result.hand_index,
+                    "outcome": result.outcome.name,
+                    "bet": result.bet,
+                    "net": result.net,
+                }
+                for result in results
+            ],
+        })
+
+    # =========================================================================
+    # = State
+    # =========================================================================
+
+    def wait_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        :return: by player id, the time spent waiting for the player, see
+            DecisionClock.metrics
+        """
+        if self.clock is None:
+            return {}
+        return {
+            self.player_ids[uid]: metrics
+            for uid, metrics in self.clock.metrics().items()
+        }
+
+    def snapshot(self) -> Message:
+        """
+        State of the table sent to the clients. Cards are given by their
+        code (see Card.code), the dealer's hole card being hidden until the
+        players played.
+        """
+        engine = self.engine
+        dealer_cards = [card.code for card in engine.dealer.hand.card_list]
+        hidden = engine.phase in (Phase.dealing, Phase.player_actions)
+        current = None
+        if engine.phase == Phase.player_actions:
+            current = {
+                "player": self.player_ids[engine.current_player.uuid],
+                "hand": engine.hand_index,
+            }
+        return {
+            "type": "state",
+            "table": self.table_id,
+            "round": self.round,
+            "version": self.version,
+            "phase": engine.phase.name,
+            "dealer": {
+                "cards": dealer_cards[:1] if hidden else dealer_cards,
+                "value": None if hidden else engine.dealer.hand.value,
+            },
+            "players": [self._player_state(player) for player in self.players],
+            "current": current,
+            "decision_time": (
+                self.clock.decision_time if self.clock is not None else None
+            ),
+        }
+
+    def _player_state(self, player: Player) -> Dict:
+        clock = self.clock
+        return {
+            "id": self.player_ids[player.uuid],
+            "name": player.name,
+            "wallet": player.wallet,
+            "ready": player.uuid in self.ready,
+            # seconds left in the time bank
+            "bank": (
+                round(clock.seat(player.uuid).bank, 3)
+                if clock is not None else None
+            ),
+            "hands": [
+                {
+                    "cards": [card.code for card in player_hand.hand.card_list],
+                    "value": player_hand.hand.value,
+                    "bet": player_hand.hand_bet,
+                    "locked": player_hand.is_lock,
+                }
+                for player_hand in player.hands
+            ],
+        }
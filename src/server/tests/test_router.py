@@ -0,0 +1,128 @@
+import asyncio
+
+from src.server.client import TableClient
+from src.server.exceptions import TableError
+from src.server.router import Router
+
+
+def is_state(message):
+    return message["type"] == "state"
+
+
+async def migrate_tables():
+    async with Router(workers=2, rng=7) as router:
+        async with await TableClient.connect(port=router.port) as alice, \
+                await TableClient.connect(port=router.port) as bob:
+            await alice.send("ping")
+            assert (await alice.receive())["type"] == "pong"
+            await alice.send("hit")
+            assert (await alice.receive())["type"] == "error"
+
+            await alice.send("join", table="main", name="Alice", wallet=100)
+            await alice.receive_until(lambda message: message["type"] == "joined")
+            await bob.send("join", table="main", name="Bob", wallet=100)
+            await bob.receive_until(lambda message: message["type"] == "joined")
+            await alice.send("bet", amount=10)
+            await bob.send("bet", amount=20)
+            state = await alice.receive_until(
+                lambda message: is_state(message)
+                and message["phase"] != "betting"
+            )
+            await bob.receive_until(
+                lambda message: is_state(message)
+                and message["version"] == state["version"]
+            )
+
+            source = router.shard_of("main").index
+            assert await router.drain(source) == ["main"]
+            assert router.shard_of("main").index != source
+            assert await router.command(router.shards[source], "tables") == {}
+            assert await router.command(router.shard_of("main"), "tables") \
+                == {"main": 2}
+
+            # the players get their seats back, the round where it stopped
+            for client in (alice, bob):
+                resumed = await client.receive()
+                assert resumed["type"] == "resumed"
+                assert await client.receive() == state
+
+            # and they play on
+            clients = {
+                player["name"]: client for player, client
+                in zip(state["players"], (alice, bob))
+            }
+            while state["round"] == 1:
+                if state["phase"] == "player_actions":
+                    current = state["current"]["player"]
+                    name = next(player["name"] for player in state["players"]
+                                if player["id"] == current)
+                    await clients[name].send("stand",
+                                             version=state["version"])
+                state = await alice.receive_until(
+                    lambda message: is_state(message)
+                    and message["version"] > state["version"]
+                )
+            assert [player["wallet"] for player in state["players"]] != \
+                [100, 100]
+
+            # new tables avoid the drained shard
+            async with await TableClient.connect(port=router.port) as carol:
+                await carol.send("join", table="other", name="Carol")
+                await carol.receive_until(
+                    lambda message: message["type"] == "joined"
+                )
+                assert router.shard_of("other").index != source
+
+
+def test_router_migrates_tables():
+    asyncio.run(asyncio.wait_for(migrate_tables(), 60))
+
+
+async def fail_migration():
+    async with Router(workers=2, rng=7) as router:
+        async with await TableClient.connect(port=router.port) as alice:
+            await alice.send("join", table="main", name="Alice", wallet=100)
+            await alice.receive_until(lambda message: message["type"] == "joined")
+            await alice.send("bet", amount=10)
+            state = await alice.receive_until(
+                lambda message: is_state(message)
+                and message["phase"] != "betting"
+            )
+            source = router.shard_of("main")
+            target = router.shards[1 - source.index]
+            command = router.command
+
+            async def refusing_import(shard, *args):
+                if shard is target and args[0] == "import":
+                    raise TableError("The target refused the table")
+                return await command(shard, *args)
+
+            router.command = refusing_import
+            try:
+                await router.migrate("main", target.index)
+            except TableError:
+                pass
+            else:
+                raise AssertionError("The migration should have failed")
+            router.command = command
+
+            # the table is back on its shard, the player in his seat
+            assert router.shard_of("main") is source
+            assert await router.command(source, "tables") == {"main": 1}
+            assert await router.command(target, "tables") == {}
+            assert (await alice.receive())["type"] == "resumed"
+            assert await alice.receive() == state
+            # and plays on with his wallet
+            assert state["phase"] == "player_actions"
+            await alice.send("stand", version=state["version"])
+            results = await alice.receive_until(
+                lambda message: message["type"] == "results"
+            )
+            state = await alice.receive()
+            assert state["round"] == 2
+            assert state["players"][0]["wallet"] == \
+                100 + results["results"][0]["net"]
+
+
+def test_router_keeps_tables_of_failed_migrations():
+    asyncio.run(asyncio.wait_for(fail_migration(), 60))
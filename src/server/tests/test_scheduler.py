@@ -0,0 +1,64 @@
+import asyncio
+
+from src.benchmarks.tables import build_tables, play_action
+from src.common.constants import Phase
+from src.server.scheduler import TableScheduler
+
+
+def test_scheduler_batches():
+    scheduler = TableScheduler(rng=1)
+    tables = build_tables(scheduler, 20, seats=2)
+    assert len(scheduler.tables) == 20
+    # the tables share the random generator of their decks and their pool
+    assert tables[0].engine.deck.rng is tables[1].engine.deck.rng
+    assert tables[0].engine.pool is scheduler.pool
+
+    batches = []
+    scheduler.on_batch_end.append(lambda: batches.append(scheduler.operations))
+
+    def failing():
+        raise RuntimeError("the other operations still run")
+
+    async def run():
+        scheduler.start()
+        for table in tables:
+            scheduler.submit(play_action, table)
+        scheduler.submit(failing)
+        # nothing runs until the worker gets the hand
+        assert scheduler.operations == 0
+        await asyncio.sleep(0.01)
+        assert batches == [21]
+        for _ in range(200):
+            for table in tables:
+                scheduler.submit(play_action, table)
+            await asyncio.sleep(0)
+        await scheduler.close()
+
+    asyncio.run(run())
+    assert scheduler.operations == 21 + 200 * 20
+    assert len(scheduler.latencies) == scheduler.operations
+    assert 0 < scheduler.latency(50) <= scheduler.latency(99)
+    assert all(table.round > 1 for table in tables)
+    assert all(table.phase != Phase.finished for table in tables)
+
+    scheduler.remove("table 0")
+    assert "table 0" not in scheduler.tables
+
+
+def test_scheduler_timeouts():
+    scheduler = TableScheduler(rng=1, decision_time=0.02, time_bank=0.01)
+    slow = scheduler.table("slow")
+    player = slow.seat("Sleeper", 100)
+
+    async def run():
+        scheduler.start()
+        # the timers play for the sleeper, the loop never blocking
+        while slow.round < 3:
+            await asyncio.sleep(0.01)
+        await scheduler.close()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
+    metrics = scheduler.wait_metrics()["slow"][str(player.uuid)]
+    assert metrics["timeouts"] >= 2
+    assert metrics["mean_wait"] >= 0.02
+    assert scheduler._timers == {}
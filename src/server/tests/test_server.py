@@ -0,0 +1,57 @@
+import asyncio
+
+from src.benchmarks.server import run_bot
+from src.server.client import TableClient
+from src.server.server import TableServer
+
+
+async def play_tables():
+    async with TableServer() as server:
+        # bots play at two tables at the same time
+        actions = await asyncio.gather(*(
+            run_bot(server.port, table, f"bot {seat}", rounds=5)
+            for table in ("first", "second")
+            for seat in range(3)
+        ))
+        assert all(count >= 5 for count in actions)
+
+        async with await TableClient.connect(port=server.port) as client:
+            await client.send("hit")
+            assert (await client.receive())["type"] == "error"
+            client.writer.write(b"not json\n")
+            assert (await client.receive())["type"] == "error"
+
+            await client.send("join", table="main", name="Alice", wallet=50)
+            joined = await client.receive()
+            assert joined["type"] == "joined"
+            state = await client.receive()
+            assert state["phase"] == "betting"
+            assert state["players"][0]["id"] == joined["player"]
+            await client.send("bet", amount=10, version=state["version"])
+            state = await client.receive_until(
+                lambda message: message["type"] == "state"
+            )
+            assert state["players"][0]["wallet"] <= 40 or \
+                state["round"] == 2
+
+            # a second client watching the same table sees the new player
+            async with await TableClient.connect(port=server.port) as other:
+                await other.send("join", table="main", name="Bob")
+                await other.receive_until(
+                    lambda message: message["type"] == "joined"
+                )
+                state = await client.receive_until(
+                    lambda message: message["type"] == "state"
+                    and len(message["players"]) == 2
+                )
+                assert state["players"][1]["name"] == "Bob"
+            await client.send("leave")
+            await client.receive_until(lambda message: message["type"] == "left")
+
+        # tables without players are closed
+        await asyncio.sleep(0.05)
+        assert server.tables == {}
+
+
+def test_server_hosts_tables():
+    asyncio.run(asyncio.wait_for(play_tables(), 30))
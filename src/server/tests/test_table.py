@@ -0,0 +1,120 @@
+import json
+
+from src.cards.deck import Deck
+from src.common.constants import Phase
+from src.controller.time_bank import DecisionClock
+from src.server.exceptions import TableError
+from src.server.table import Table
+
+
+def make_table(players=2):
+    table = Table("test", Deck(rng=7))
+    messages = []
+    table.subscribe(lambda line: messages.append(json.loads(line)))
+    seated = [table.seat(f"Player {index}", 100) for index in range(players)]
+    return table, seated, messages
+
+
+def refused(action, *args, **kwargs):
+    try:
+        action(*args, **kwargs)
+    except TableError:
+        return True
+    return False
+
+
+def test_table_round():
+    table, (first, second), messages = make_table()
+    assert table.phase == Phase.betting and table.round == 1
+    assert messages[-1]["type"] == "state"
+    assert len(messages[-1]["players"]) == 2
+
+    assert refused(table.act, first, "bet", 1)
+    assert refused(table.act, first, "hit")
+    table.act(first, "bet", 10)
+    assert refused(table.act, first, "bet", 10)
+    assert table.phase == Phase.betting
+    # standing while betting sits the round out
+    table.act(second, "stand")
+    assert table.phase == Phase.player_actions
+
+    state = messages[-1]
+    # the hole card is hidden while the players play
+    assert len(state["dealer"]["cards"]) == 1
+    assert state["current"]["player"] == str(first.uuid)
+    assert refused(table.act, second, "stand")
+    assert refused(table.act, first, "stand", version=state["version"] - 1)
+    table.act(first, "stand", version=state["version"])
+
+    results = [message for message in messages if message["type"] == "results"]
+    assert len(results) == 1
+    assert [result["player"] for result in results[0]["results"]] == \
+        [str(first.uuid)]
+    # the next round starts at once
+    assert table.phase == Phase.betting and table.round == 2
+    assert messages[-1]["dealer"]["cards"] == []
+
+
+def test_table_leave_during_round():
+    table, (first, second), messages = make_table()
+    table.act(first, "bet", 10)
+    table.act(second, "bet", 10)
+    assert table.engine.current_player is first
+    # the hands of a player leaving stand, he is removed at the end
+    table.leave(second)
+    assert table.players == [first, second]
+    assert refused(table.act, second, "hit")
+    table.act(first, "stand")
+    assert table.phase == Phase.betting and table.round == 2
+    assert table.players == [first]
+    results = [message for message in messages if message["type"] == "results"]
+    assert len(results[0]["results"]) == 2
+    table.leave(first)
+    assert table.players == []
+
+    full = Table("full", max_seats=1)
+    full.seat("One", 10)
+    assert refused(full.seat, "Two", 10)
+
+
+def test_table_timeouts():
+    now = [0.]
+    clock = DecisionClock(decision_time=10, time_bank=5, refill=0,
+                          clock=lambda: now[0])
+    table = Table("timed", Deck(rng=7), clock=clock)
+    deadlines = []
+    table.on_deadline = lambda table: deadlines.append(table.deadline)
+    messages = []
+    table.subscribe(lambda line: messages.append(json.loads(line)))
+    first = table.seat("First", 100)
+    second = table.seat("Second", 3)
+    assert deadlines == [15] and messages[-1]["decision_time"] == 10
+    assert table.expire() == []
+
+    now[0] = 4
+    table.act(first, "stand")
+    # out of time, the second bets the minimum if his wallet allows it
+    now[0] = 15
+    assert table.expire() == [second]
+    timeouts = [message for message in messages
+                if message["type"] == "timeout"]
+    assert timeouts == [{"type": "timeout", "table": "timed",
+                        "player": str(second.uuid), "action": "stand"}]
+    # nobody bet, a new round starts, the second without any bank left
+    assert table.round == 2 and deadlines[-1] == 15 + 10
+
+    now[0] = 20
+    table.act(second, "stand")
+    now[0] = 30
+    assert table.expire() == [first]
+    assert table.phase == Phase.player_actions
+    assert first.hands[0].hand_bet == table.engine.minimum_bet
+    # he stands once his bank is empty too
+    now[0] = 40
+    assert table.expire() == [first]
+    assert table.round == 3
+
+    metrics = table.wait_metrics()
+    assert metrics[str(first.uuid)]["timeouts"] == 2
+    assert metrics[str(second.uuid)]["waited"] == 15 + 5
+    assert messages[-1]["players"][0]["bank"] == 0
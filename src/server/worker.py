@@ -0,0 +1,57 @@
+import asyncio
+from multiprocessing.connection import Connection
+from typing import Any, Tuple
+
+from src.server.server import TableServer
+
+# Command sent to a worker: name and arguments
+Command = Tuple[Any, ...]
+
+
+def handle_command(server: TableServer, command: Command) -> Any:
+    """
+    Runs a command of the router in the worker's event loop:
+        ("tables",): names and number of players of the tables
+        ("export", table_id): the exported table, see export_table
+        ("import", data): name of the table adopted
+    """
+    name, *args = command
+    if name == "tables":
+        return {
+            table_id: len(table.players)
+            for table_id, table in server.tables.items()
+        }
+    elif name == "export":
+        return server.export_table(*args)
+    elif name == "import":
+        return server.import_table(*args).table_id
+    raise ValueError(f"Unknown command {name!r}")
+
+
+async def serve(control: Connection, host: str, rules: dict):
+    async with TableServer(host, 0, **rules) as server:
+        control.send(server.port)
+        loop = asyncio.get_running_loop()
+        while True:
+            # a thread waits for the router, the loop serving meanwhile
+            command = await loop.run_in_executor(None, control.recv)
+            if command == ("stop",):
+                break
+            try:
+                control.send(("ok", handle_command(server, command)))
+            except Exception as error:
+                control.send(("error", f"{type(error).__name__}: {error}"))
+    control.send(("ok", None))
+
+
+def run_worker(control: Connection, host: str = "127.0.0.1", **rules):
+    """
+    Target of a worker process: runs a TableServer on a free port, sent
+    first through the control pipe, then answers the router's commands
+    (see handle_command) with ("ok", result) or ("error", message) until
+    it gets ("stop",)
+    :param Connection control: pipe to the router
+    :param str host: address listened to
+    :param rules: keyword arguments of the TableScheduler
+    """
+    asyncio.run(serve(control, host, rules))
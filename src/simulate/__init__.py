@@ -0,0 +1,3 @@
+from .runner import simulate, run_chunk, replay_chunk
+from .stats import SimulationStats
+from .batch import BatchSimulator, dealer_strategy_table
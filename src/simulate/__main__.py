@@ -0,0 +1,102 @@
+# ============================================================================
+# = Monte Carlo simulation of black jack rounds
+# =
+# = Usage: python -m src.simulate --rounds 1000000 --workers 4 --seed 42
+# = Replay: python -m src.simulate --rounds 1000000 --seed 42 --replay-chunk 3
+# ============================================================================
+
+import argparse
+import time
+
+import numpy as np
+
+from src.humans.strategy import StrategyTable
+from src.simulate.runner import replay_chunk, simulate
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.simulate",
+        description="Simulates black jack rounds over several processes",
+    )
+    parser.add_argument("--rounds", type=int, default=1000000,
+                        help="number of rounds to play")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of processes, all the cores by default")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the simulation, random by default")
+    parser.add_argument("--chunk-size", type=int, default=100000,
+                        help="number of rounds played by each task")
+    parser.add_argument("--decks", type=int, default=6,
+                        help="number of decks in the shoe")
+    parser.add_argument("--penetration", type=float, default=0.75,
+                        help="part of the shoe dealt before shuffling")
+    parser.add_argument("--h17", action="store_true",
+                        help="the dealer hits on soft 17")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="play the rounds in lockstep with numpy arrays")
+    parser.add_argument("--replay-chunk", type=int, default=None,
+                        help="only play again this chunk of the seed's "
+                             "simulation")
+    parser.add_argument("--csm", action="store_true",
+                        help="deal from a continuous shuffling machine")
+    parser.add_argument("--strategy", default=None,
+                        help="strategy chart of data/config/strategies "
+                             "played, mimic the dealer by default")
+    args = parser.parse_args(argv)
+    if args.replay_chunk is not None and args.seed is None:
+        parser.error("--replay-chunk needs the --seed of the simulation")
+    if args.csm and args.vectorized:
+        parser.error("--csm is not available with --vectorized")
+    if args.strategy is not None and args.vectorized:
+        # the batch simulator never splits, the chart would not be played
+        parser.error("--strategy is not available with --vectorized")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    seed = args.seed
+    if seed is None:
+        # draw the seed here so it can be printed and the run replayed
+        seed = int(np.random.SeedSequence().entropy % 2 ** 63)
+
+    rules = dict(
+        decks=args.decks,
+        penetration=args.penetration,
+        dealer_mode=1 if args.h17 else 0,
+    )
+    if args.csm:
+        rules["continuous"] = True
+    if args.strategy is not None:
+        rules["policy"] = StrategyTable.load(args.strategy).policy
+
+    start = time.perf_counter()
+    if args.replay_chunk is not None:
+        stats = replay_chunk(
+            seed,
+            args.replay_chunk,
+            args.rounds,
+            chunk_size=args.chunk_size,
+            vectorized=args.vectorized,
+            **rules
+        )
+    else:
+        stats = simulate(
+            args.rounds,
+            workers=args.workers,
+            seed=seed,
+            chunk_size=args.chunk_size,
+            vectorized=args.vectorized,
+            **rules
+        )
+    duration = time.perf_counter() - start
+
+    print(f"Seed:         {seed}")
+    print(stats.report())
+    print(f"Duration:     {duration:.2f}s "
+          f"({stats.rounds / duration:.0f} rounds/s)")
+
+
+if __name__ == '__main__':
+    main()
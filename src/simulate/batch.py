@@ -0,0 +1,239 @@
+import numpy as np
+
+from src.cards.transitions import (
+    DEALER_HITS,
+    EMPTY,
+    NEXT_STATE,
+    STATE_BLACK_JACK,
+    STATE_BURNT,
+    STATE_CARDS,
+    STATE_SOFT,
+    STATE_VALUE,
+)
+from src.common.constants import Decision, Outcome
+from src.common.rng import RandomSource, make_rng
+from src.controller.settlement import PAYOUT_ARRAY, classify_arrays
+from src.simulate.stats import SimulationStats
+
+# value of every card code (see Card.code), aces count as 1
+CODE_VALUES = np.minimum(np.arange(52) // 4 + 1, 10).astype(np.int8)
+
+# Strategy tables are indexed by [hand value, soft flag, dealer upcard value]
+# and hold Decision values. Hand values above 21 are never looked up.
+STRATEGY_SHAPE = (22, 2, 11)
+# Strategy tables can also be indexed by [can double, hand value, soft flag,
+# dealer upcard value], giving the decision of hands that cannot double
+DOUBLING_STRATEGY_SHAPE = (2,) + STRATEGY_SHAPE
+
+
+def dealer_strategy_table() -> np.ndarray:
+    """
+    Strategy table mimicking the dealer: hit below 17 and stand otherwise
+    :return: table of shape STRATEGY_SHAPE
+    """
+    table = np.full(STRATEGY_SHAPE, Decision.stand.value, dtype=np.int8)
+    table[:17] = Decision.hit.value
+    return table
+
+
+class BatchSimulator:
+    """
+    Plays independent rounds in lockstep, one per lane, with numpy arrays.
+
+    Every lane has its own shoe and one seat betting one unit. The hands are
+    stored as arrays of states of transitions.py, and the strategy table is
+    applied to all the hands still playing at once. The
+    rules are those of RoundEngine: the player stands automatically on 21,
+    doubles only on two cards, the dealer plays with Dealer.choose_action's
+    mode and black jack pays 3:2. Splits are not simulated, the strategy
+    table being indexed by hand value.
+
+    :param int lanes: number of rounds played at once
+    :param int decks: number of decks in each shoe
+    :param float penetration: part of the shoes dealt before shuffling
+    :param int dealer_mode: 0 if the dealer stands on all 17s, 1 if he hits
+        soft 17
+    :param np.ndarray strategy: table of Decision values of shape
+        STRATEGY_SHAPE or DOUBLING_STRATEGY_SHAPE, dealer_strategy_table() by
+        default. With STRATEGY_SHAPE, hands that cannot double hit instead
+    :param rng: random generator of the shoes or its seed
+    """
+
+    def __init__(
+        self,
+        lanes: int = 10000,
+        decks: int = 6,
+        penetration: float = 0.75,
+        dealer_mode: int = 0,
+        strategy: np.ndarray = None,
+        rng: RandomSource = None,
+    ):
+        if dealer_mode not in (0, 1):
+            raise ValueError("'dealer_mode' should be 0 or 1")
+        if strategy is None:
+            strategy = dealer_strategy_table()
+        if strategy.shape == STRATEGY_SHAPE:
+            no_double = np.where(strategy == Decision.double.value,
+                                 Decision.hit.value, strategy)
+            strategy = np.stack([no_double, strategy])
+        if strategy.shape != DOUBLING_STRATEGY_SHAPE:
+            raise ValueError(
+                f"Strategy table should have shape {STRATEGY_SHAPE} or "
+                f"{DOUBLING_STRATEGY_SHAPE}"
+            )
+        self.lanes = lanes
+        self.penetration = penetration
+        self.dealer_mode = dealer_mode
+        self.strategy = strategy
+        # decision of every hand state against every upcard, so that the
+        # decisions are one lookup (burnt states are never looked up)
+        self._state_strategy = strategy[
+            (STATE_CARDS == 2).astype(np.intp),
+            np.minimum(STATE_VALUE, 21),
+            STATE_SOFT.astype(np.intp),
+        ]
+        self.rng = make_rng(rng)
+
+        self.shoe_length = 52 * decks
+        self.shoes = np.tile(np.arange(52, dtype=np.uint8), (lanes, decks))
+        self.positions = np.zeros(lanes, dtype=np.int64)
+        self.red_cards = np.zeros(lanes, dtype=np.int64)
+        self._all_lanes = np.arange(lanes)
+        self._shuffle(np.ones(lanes, dtype=bool))
+
+    def _shuffle(self, mask: np.ndarray):
+        """
+        Shuffles the shoes of the lanes in mask and places their red card
+        like Deck.computeRedCardIndex does
+        """
+        count = int(mask.sum())
+        if not count:
+            return
+        self.shoes[mask] = self.rng.permuted(self.shoes[mask], axis=1)
+        self.positions[mask] = 0
+        center = int(self.penetration * self.shoe_length)
+        spread = min(30, self.shoe_length // 8)
+        low = max(1, center - spread)
+        high = min(self.shoe_length, center + spread)
+        self.red_cards[mask] = self.rng.integers(low, high + 1, size=count)
+
+    def _draw(self, lanes: np.ndarray) -> np.ndarray:
+        """
+        Deals one card in each of the given lanes
+        :param np.ndarray lanes: indices of the lanes
+        :return: values of the cards dealt
+        """
+        exhausted = self.positions[lanes] >= self.shoe_length
+        if exhausted.any():
+            mask = np.zeros(self.lanes, dtype=bool)
+            mask[lanes[exhausted]] = True
+            self._shuffle(mask)
+        codes = self.shoes[lanes, self.positions[lanes]]
+        self.positions[lanes] += 1
+        return CODE_VALUES[codes]
+
+    def play_rounds(self, stats: SimulationStats = None) -> SimulationStats:
+        """
+        Plays one round on every lane
+        :param SimulationStats stats: aggregates to add the rounds to, new
+            ones by default
+        :return: the aggregates
+        """
+        stats = stats if stats is not None else SimulationStats()
+        everyone = self._all_lanes
+        self._shuffle(self.positions >= self.red_cards)
+
+        # Dealing, in the same order as RoundEngine.deal
+        player_1 = self._draw(everyone)
+        upcard = self._draw(everyone)
+        player_2 = self._draw(everyone)
+        hole_card = self._draw(everyone)
+
+        player = NEXT_STATE[NEXT_STATE[EMPTY, player_1], player_2]
+        dealer = NEXT_STATE[NEXT_STATE[EMPTY, upcard], hole_card]
+        bets = np.ones(self.lanes, dtype=np.int8)
+        playing = STATE_VALUE[player] < 21
+
+        # Player's decisions, for all the hands still playing at once
+        while playing.any():
+            lanes = np.flatnonzero(playing)
+            decisions = self._state_strategy[player[lanes], upcard[lanes]]
+            doubles = decisions == Decision.double.value
+            hits = (decisions == Decision.hit.value) | doubles
+            hitting = lanes[hits]
+            player[hitting] = NEXT_STATE[player[hitting], self._draw(hitting)]
+            bets[lanes[doubles]] = 2
+
+            # standing, doubled, burnt and 21 hands are over
+            playing[lanes[~hits | doubles]] = False
+            playing &= STATE_VALUE[player] < 21
+
+        # Dealer's play, as Dealer.choose_action
+        hits = DEALER_HITS[self.dealer_mode]
+        while True:
+            lanes = np.flatnonzero(hits[dealer])
+            if not len(lanes):
+                break
+            dealer[lanes] = NEXT_STATE[dealer[lanes], self._draw(lanes)]
+
+        # Settlement, as settlement.settle_table
+        dealer_burnt = STATE_BURNT[dealer]
+        outcomes = classify_arrays(
+            STATE_VALUE[player],
+            STATE_BURNT[player],
+            STATE_BLACK_JACK[player],
+            STATE_VALUE[dealer],
+            dealer_burnt,
+            STATE_BLACK_JACK[dealer],
+        )
+        net = bets * PAYOUT_ARRAY[outcomes]
+        counts = np.bincount(outcomes, minlength=len(Outcome))
+
+        stats.rounds += self.lanes
+        stats.hands += self.lanes
+        black_jacks = counts[Outcome.black_jack.value]
+        stats.wins += int(counts[Outcome.win.value] + black_jacks)
+        stats.losses += int(counts[Outcome.lose.value])
+        stats.pushes += int(counts[Outcome.push.value])
+        stats.black_jacks += int(black_jacks)
+        stats.net += float(net.sum())
+        stats.net_squared += float((net * net).sum())
+        upcards = np.bincount(upcard, minlength=11)
+        busts = np.bincount(upcard[dealer_burnt], minlength=11)
+        for card_value in range(1, 11):
+            stats.upcards[card_value] += int(upcards[card_value])
+            stats.dealer_busts[card_value] += int(busts[card_value])
+        return stats
+
+
+def run_batch_chunk(
+    rounds: int,
+    seed_sequence: np.random.SeedSequence,
+    decks: int = 6,
+    penetration: float = 0.75,
+    dealer_mode: int = 0,
+    strategy: np.ndarray = None,
+    lanes: int = 10000,
+) -> SimulationStats:
+    """
+    Vectorized counterpart of runner.run_chunk
+    :param int rounds: number of rounds to play
+    :param SeedSequence seed_sequence: seed of the shoes' random generator
+    :param int decks: number of decks of the shoes
+    :param float penetration: penetration of the shoes
+    :param int dealer_mode: 0 for S17, 1 for H17
+    :param np.ndarray strategy: strategy table, see BatchSimulator
+    :param int lanes: maximum number of rounds played in lockstep
+    :return: aggregates of the chunk
+    """
+    rng = make_rng(seed_sequence)
+    stats = SimulationStats()
+    simulator = None
+    while stats.rounds < rounds:
+        size = min(lanes, rounds - stats.rounds)
+        if simulator is None or simulator.lanes != size:
+            simulator = BatchSimulator(
+                size, decks, penetration, dealer_mode, strategy, rng
+            )
+        simulator.play_rounds(stats)
+    return stats
@@ -0,0 +1,139 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, List
+
+import numpy as np
+
+from src.cards.deck import ContinuousShuffler, Deck
+from src.common.constants import Decision
+from src.common.rng import chunk_seed_sequence, chunk_seed_sequences, make_rng
+from src.controller.round_engine import RoundEngine, dealer_policy
+from src.humans.hand_pool import HandPool
+from src.humans.player import Player
+from src.simulate.batch import run_batch_chunk
+from src.simulate.stats import SimulationStats
+
+
+def run_chunk(
+    rounds: int,
+    seed_sequence: np.random.SeedSequence,
+    decks: int = 6,
+    penetration: float = 0.75,
+    dealer_mode: int = 0,
+    policy: Callable[[RoundEngine], Decision] = dealer_policy,
+    continuous: bool = False,
+) -> SimulationStats:
+    """
+    Plays rounds of one player betting one unit per round on a new shoe.
+    Runs in a worker process, everything it uses must be picklable.
+    :param int rounds: number of rounds to play
+    :param SeedSequence seed_sequence: seed of the shoe's random generator
+    :param int decks: number of decks of the shoe
+    :param float penetration: penetration of the shoe
+    :param int dealer_mode: mode given to Dealer.choose_action
+    :param policy: player's policy, a module level function
+    :param bool continuous: deal from a continuous shuffling machine, the
+        penetration being ignored
+    :return: aggregates of the chunk
+    """
+    rng = make_rng(seed_sequence)
+    if continuous:
+        deck = ContinuousShuffler(decks, rng)
+    else:
+        deck = Deck(decks=decks, penetration=penetration, rng=rng)
+    engine = RoundEngine(
+        deck,
+        players=[Player("Bot", float("inf"))],
+        policy=policy,
+        dealer_mode=dealer_mode,
+        minimum_bet=1,
+        pool=HandPool(),
+    )
+    stats = SimulationStats()
+    for _ in range(rounds):
+        results = engine.play_round()
+        stats.add_round(
+            results, engine.dealer.hand, engine.dealer_upcard.value, 1
+        )
+    return stats
+
+
+def split_rounds(rounds: int, chunk_size: int) -> List[int]:
+    """
+    :return: sizes of the chunks needed to play the given number of rounds
+    """
+    sizes = [chunk_size] * (rounds // chunk_size)
+    if rounds % chunk_size:
+        sizes.append(rounds % chunk_size)
+    return sizes
+
+
+def simulate(
+    rounds: int,
+    workers: int = None,
+    seed: int = None,
+    chunk_size: int = 100000,
+    vectorized: bool = False,
+    **rules
+) -> SimulationStats:
+    """
+    Plays rounds split in chunks over a pool of processes, and merges the
+    aggregates of the chunks.
+    Every chunk gets its own random generator spawned from the seed (see
+    common.rng.chunk_seed_sequence), so the result only depends on the seed
+    and the chunk size, not on the number of workers, and any chunk can be
+    replayed alone with replay_chunk.
+    :param int rounds: total number of rounds
+    :param int workers: number of processes, defaults to the number of
+        cores. With 1 the chunks are played in the current process
+    :param int seed: seed of the simulation, random if None
+    :param int chunk_size: number of rounds played by a chunk
+    :param bool vectorized: play the chunks with batch.run_batch_chunk
+        instead of run_chunk
+    :param rules: keyword arguments given to the chunk function
+    :return: merged aggregates
+    """
+    run = run_batch_chunk if vectorized else run_chunk
+
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    sizes = split_rounds(rounds, chunk_size)
+    children = chunk_seed_sequences(seed, len(sizes))
+
+    total = SimulationStats()
+    if workers == 1:
+        for size, child in zip(sizes, children):
+            total.merge(run(size, child, **rules))
+        return total
+
+    # a partial of a module level function can be sent to the workers
+    play = partial(run, **rules)
+    with ProcessPoolExecutor(workers) as executor:
+        for stats in executor.map(play, sizes, children):
+            total.merge(stats)
+    return total
+
+
+def replay_chunk(
+    seed: int,
+    chunk_id: int,
+    rounds: int,
+    chunk_size: int = 100000,
+    vectorized: bool = False,
+    **rules
+) -> SimulationStats:
+    """
+    Plays again one chunk of a simulation, in the current process
+    :param int seed: seed of the simulation
+    :param int chunk_id: index of the chunk
+    :param int rounds: total number of rounds of the simulation
+    :param int chunk_size: chunk size of the simulation
+    :param bool vectorized: the simulation was vectorized
+    :param rules: rules of the simulation
+    :return: aggregates of the chunk, equal to the ones it had in simulate
+    """
+    sizes = split_rounds(rounds, chunk_size)
+    if not 0 <= chunk_id < len(sizes):
+        raise ValueError(f"The simulation only has {len(sizes)} chunks")
+    run = run_batch_chunk if vectorized else run_chunk
+    return run(sizes[chunk_id], chunk_seed_sequence(seed, chunk_id), **rules)
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from typing import List
+
+from src.common.constants import Outcome
+
+
+def _per_upcard() -> List[int]:
+    # index 1 to 10 are the values of the dealer's upcard (1 for aces)
+    return [0] * 11
+
+
+@dataclass
+class SimulationStats:
+    """
+    Aggregates of simulated rounds, for one bet unit per round.
+    Aggregates of independent runs are combined with merge.
+    """
+    rounds: int = 0
+    hands: int = 0
+    wins: int = 0
+    pushes: int = 0
+    losses: int = 0
+    black_jacks: int = 0
+    # sum of the round results and of their squares, in bet units
+    net: float = 0.
+    net_squared: float = 0.
+    upcards: List[int] = field(default_factory=_per_upcard)
+    dealer_busts: List[int] = field(default_factory=_per_upcard)
+
+    def add_round(self, results, dealer_hand, upcard_value: int, bet: int):
+        """
+        Adds the results of one round
+        :param results: HandResult list returned by RoundEngine.settle
+        :param Hand dealer_hand: final hand of the dealer
+        :param int upcard_value: value of the dealer's upcard
+        :param int bet: initial bet of the round
+        """
+        round_net = 0
+        for result in results:
+            self.hands += 1
+            if result.outcome == Outcome.lose:
+                self.losses += 1
+            elif result.outcome == Outcome.push:
+                self.pushes += 1
+            else:
+                self.wins += 1
+                if result.outcome == Outcome.black_jack:
+                    self.black_jacks += 1
+            round_net += result.net
+        round_net /= bet
+        self.rounds += 1
+        self.net += round_net
+        self.net_squared += round_net * round_net
+        self.upcards[upcard_value] += 1
+        if dealer_hand.is_burnt:
+            self.dealer_busts[upcard_value] += 1
+
+    def merge(self, other: 'SimulationStats') -> 'SimulationStats':
+        """
+        Adds the aggregates of other to self
+        :return: self
+        """
+        self.rounds += other.rounds
+        self.hands += other.hands
+        self.wins += other.wins
+        self.pushes += other.pushes
+        self.losses += other.losses
+        self.black_jacks += other.black_jacks
+        self.net += other.net
+        self.net_squared += other.net_squared
+        for value in range(len(self.upcards)):
+            self.upcards[value] += other.upcards[value]
+            self.dealer_busts[value] += other.dealer_busts[value]
+        return self
+
+    @property
+    def ev(self) -> float:
+        """
+        Expected result of a round, in bet units
+        """
+        return self.net / self.rounds if self.rounds else 0.
+
+    @property
+    def variance(self) -> float:
+        """
+        Variance of the result of a round, in squared bet units
+        """
+        if not self.rounds:
+            return 0.
+        return self.net_squared / self.rounds - self.ev ** 2
+
+    def rate(self, count: int) -> float:
+        return count / self.hands if self.hands else 0.
+
+    def bust_rate(self, upcard_value: int) -> float:
+        """
+        Part of the rounds where the dealer busts with the given upcard
+        """
+        if not self.upcards[upcard_value]:
+            return 0.
+        return self.dealer_busts[upcard_value] / self.upcards[upcard_value]
+
+    def report(self) -> str:
+        lines = [
+            f"Rounds:       {self.rounds}",
+            f"Hands:        {self.hands}",
+            f"EV per round: {self.ev:+.5f} "
+            f"(std error {(self.variance / max(self.rounds, 1)) ** .5:.5f})",
+            f"Variance:     {self.variance:.5f}",
+            f"Win:          {self.rate(self.wins):.4%}",
+            f"Push:         {self.rate(self.pushes):.4%}",
+            f"Loss:         {self.rate(self.losses):.4%}",
+            f"Black jack:   {self.rate(self.black_jacks):.4%}",
+            "Dealer bust rate per upcard:",
+        ]
+        for value in range(2, 11):
+            lines.append(f"  {value:>5}: {self.bust_rate(value):.4%}")
+        lines.append(f"  {'ACE':>5}: {self.bust_rate(1):.4%}")
+        return "\n".join(lines)
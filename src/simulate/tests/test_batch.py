@@ -0,0 +1,59 @@
+import numpy as np
+
+from src.cards.deck import Deck
+from src.common.constants import Decision
+from src.controller.round_engine import RoundEngine
+from src.humans.player import Player
+from src.simulate.batch import (
+    BatchSimulator,
+    dealer_strategy_table,
+    run_batch_chunk,
+)
+
+
+def table_policy(table):
+    def policy(engine):
+        hand = engine.current_hand.hand
+        decision = Decision(
+            table[hand.value, int(hand.is_soft), engine.dealer_upcard.value]
+        )
+        if decision not in engine.legal_actions():
+            return Decision.hit
+        return decision
+    return policy
+
+
+def test_batch_matches_round_engine():
+
+    table = dealer_strategy_table()
+    table[10:12, 0, 2:10] = Decision.double.value
+    for dealer_mode in (0, 1):
+        simulator = BatchSimulator(
+            lanes=300, decks=1, dealer_mode=dealer_mode, strategy=table,
+            rng=np.random.default_rng(dealer_mode),
+        )
+        # the red card is never reached, every lane plays its shoe's start
+        simulator.red_cards[:] = simulator.shoe_length
+        shoes = simulator.shoes.copy()
+        stats = simulator.play_rounds()
+
+        net = 0
+        for shoe in shoes:
+            deck = Deck(False, decks=1)
+            deck.cards[:] = shoe
+            engine = RoundEngine(
+                deck, players=[Player("Bot", float("inf"))],
+                policy=table_policy(table), dealer_mode=dealer_mode,
+                minimum_bet=1,
+            )
+            [result] = engine.play_round()
+            net += result.net
+        assert stats.net == net
+
+
+def test_run_batch_chunk():
+
+    stats = run_batch_chunk(2500, np.random.SeedSequence(3), lanes=1000)
+    assert stats.rounds == 2500
+    assert stats.hands == stats.wins + stats.pushes + stats.losses
+    assert sum(stats.upcards) == 2500
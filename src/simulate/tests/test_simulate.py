@@ -0,0 +1,43 @@
+from src.simulate import SimulationStats, replay_chunk, simulate
+from src.simulate.runner import split_rounds
+
+
+def test_split_rounds():
+
+    assert split_rounds(250, 100) == [100, 100, 50]
+    assert split_rounds(200, 100) == [100, 100]
+
+
+def test_simulation_is_reproducible():
+
+    stats_1 = simulate(3000, workers=1, seed=42, chunk_size=1000)
+    stats_2 = simulate(3000, workers=2, seed=42, chunk_size=1000)
+    assert stats_1 == stats_2
+    assert stats_1.rounds == 3000
+    assert stats_1.hands == stats_1.wins + stats_1.pushes + stats_1.losses
+    assert sum(stats_1.upcards) == 3000
+    assert -1 < stats_1.ev < 1
+
+
+def test_merge_stats():
+
+    stats_1 = simulate(500, workers=1, seed=1, chunk_size=500)
+    stats_2 = simulate(500, workers=1, seed=2, chunk_size=500)
+    merged = SimulationStats().merge(stats_1).merge(stats_2)
+    assert merged.rounds == 1000
+    assert merged.net == stats_1.net + stats_2.net
+    assert merged.dealer_busts[6] == (
+        stats_1.dealer_busts[6] + stats_2.dealer_busts[6]
+    )
+
+
+def test_replay_chunk():
+
+    stats = simulate(2500, workers=1, seed=7, chunk_size=1000)
+    chunks = [replay_chunk(7, chunk_id, 2500, chunk_size=1000)
+              for chunk_id in range(3)]
+    assert chunks[2].rounds == 500
+    merged = SimulationStats()
+    for chunk in chunks:
+        merged.merge(chunk)
+    assert merged == stats